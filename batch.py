@@ -0,0 +1,157 @@
+import click
+import concurrent.futures
+import json
+import os
+
+import main as g2c
+import src.scoring.build_index as build_index
+
+# build list shared by all inventories processed in a worker process (see init_worker)
+worker_build_list = None
+
+
+@click.command()
+@click.option('-i', '--input-path', required=True, type=str,
+              help='Specify directory with GOOD files or manifest file (one GOOD file path per line).')
+@click.option('-O', '--output-dir', required=True, type=str, help='Specify directory for output files.')
+@click.option('-o', '--output-format', default='g2c', show_default=True,
+              type=click.Choice(['g2c', 'count', 'good', 'columnar', 'summary'], case_sensitive=False),
+              help='Specify output format.')
+@click.option('-k', '--keep', 'list_mode', flag_value='keep', default=True, help='Show artifacts that will be kept.')
+@click.option('-d', '--discard', 'list_mode', flag_value='discard', help='Show artifacts that will be discarded.')
+@click.option('-a', '--all', 'list_mode', flag_value='all', help='Show all artifacts.')
+@click.option('-w', '--weak', is_flag=True, help='Keep artifact in non maximum rarity.')
+@click.option('-f', '--filters', multiple=True, type=str, help='Filter artifacts according to defined rules.')
+@click.option('-g', '--groups', multiple=True, type=str, help='Keep only the best artifacts in each group.')
+@click.option('-s', '--sort', type=str, help='Sort artifacts according to defined rules.')
+@click.option('-l', '--limit', type=click.IntRange(min=0), help='Show only the first artifacts (after sorting).')
+@click.option('-e', '--engine', default='python', show_default=True,
+              type=click.Choice(['python', 'numpy'], case_sensitive=False),
+              help='Specify scoring engine.')
+@click.option('-c', '--build-cache', default='.cache/build-index.json', show_default=True, type=str,
+              help='Specify compiled build index cache file (empty to disable).')
+@click.option('--strict', is_flag=True, help='Reject GOOD files with invalid artifacts (see validator.py).')
+@click.option('--potential', is_flag=True, help='Estimate expected and percentile scores of artifacts at maximum level.')
+@click.option('--prune-dominated', is_flag=True,
+              help='Discard artifacts dominated by another one with the same set, slot and main stat without scoring them.')
+@click.option('--loadouts', type=click.IntRange(min=1),
+              help='Keep only artifacts in the best loadouts (one artifact per slot) of some build [amount per build].')
+@click.option('-j', '--jobs', type=click.IntRange(min=1), help='Specify amount of worker processes [default: cores].')
+def main(input_path, output_dir, output_format, list_mode, weak, filters, groups, sort, limit, engine, build_cache,
+         strict, potential, prune_dominated, loadouts, jobs):
+    if engine == 'numpy' and g2c.vectorized_scoring is None:
+        raise click.UsageError('The numpy engine requires NumPy (pip install numpy).')
+    if potential and g2c.upgrade_potential is None:
+        raise click.UsageError('The upgrade potential (--potential) requires NumPy (pip install numpy).')
+
+    good_file_name_list = find_good_files(input_path)
+    output_file_names = {
+        good_file_name: get_output_file_name(good_file_name, output_dir, output_format)
+        for good_file_name in good_file_name_list
+    }
+    if len(set(output_file_names.values())) != len(output_file_names):
+        raise click.UsageError('GOOD files must have distinct names.')
+    if not good_file_name_list:
+        return
+
+    build_file_name_list = g2c.find_files_by_extension('builds/', '.json')
+    build_list = build_index.load_build_list(build_file_name_list, build_cache or None)
+
+    os.makedirs(output_dir, exist_ok=True)
+    options = dict(output_format=output_format, list_mode=list_mode, weak=weak, filters=filters, groups=groups,
+                   sort=sort, engine=engine, limit=limit, strict=strict, potential=potential,
+                   prune_dominated=prune_dominated, loadouts=loadouts)
+
+    max_workers = min(jobs or count_available_cores(), len(good_file_name_list))
+    failures = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(build_list,)) as executor:
+        futures = {
+            executor.submit(process_good_file, good_file_name, output_file_name, options): good_file_name
+            for good_file_name, output_file_name in output_file_names.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            good_file_name = futures[future]
+            try:
+                click.echo(f'{good_file_name} -> {future.result()}')
+            except Exception as error:
+                failures += 1
+                click.echo(f'{good_file_name}: {error!r}', err=True)
+
+    if failures:
+        raise click.ClickException(f'{failures} of {len(good_file_name_list)} GOOD files failed.')
+
+
+def find_good_files(input_path):
+    """Return GOOD file paths from directory or manifest file
+
+    Manifest paths are relative to the manifest directory. Blank lines and lines starting with # are ignored.
+
+    :param input_path: directory or manifest file path
+    :return: list of GOOD file paths
+    """
+    if os.path.isdir(input_path):
+        return sorted(g2c.find_files_by_extension(input_path, '.json'))
+
+    manifest_dir = os.path.dirname(input_path)
+    with open(input_path) as manifest_file:
+        lines = [line.strip() for line in manifest_file]
+
+    return [os.path.join(manifest_dir, line) for line in lines if line and not line.startswith('#')]
+
+
+def get_output_file_name(good_file_name, output_dir, output_format):
+    """Return output file path for GOOD file
+
+    :param good_file_name: GOOD (Genshin Open Object Description) file path
+    :param output_dir: directory for output files
+    :param output_format: g2c, count, good, columnar or summary
+    :return: output file path
+    """
+    good_name = os.path.splitext(os.path.basename(good_file_name))[0]
+    extension = 'bin' if output_format == 'columnar' else 'json'
+    return os.path.join(output_dir, f'{good_name}.{output_format}.{extension}')
+
+
+def count_available_cores():
+    """Return amount of cores available to this process
+
+    :return: amount of cores
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def init_worker(build_list):
+    """Keep build list in the worker process (sent once per worker, not once per inventory)
+
+    :param build_list: compiled build list
+    """
+    global worker_build_list
+    worker_build_list = build_list
+
+
+def process_good_file(good_file_name, output_file_name, options):
+    """Run the pipeline for a GOOD file and write the output
+
+    :param good_file_name: GOOD (Genshin Open Object Description) file path
+    :param output_file_name: output file path
+    :param options: process_good options
+    :return: output file path
+    """
+    with open(good_file_name) as good_file:
+        good = json.load(good_file)
+
+    output, _ = g2c.process_good(good, worker_build_list, **options)
+    if isinstance(output, bytes):
+        with open(output_file_name, 'wb') as output_file:
+            output_file.write(output)
+    else:
+        with open(output_file_name, 'w') as output_file:
+            print(output, file=output_file)
+
+    return output_file_name
+
+
+if __name__ == '__main__':
+    main()
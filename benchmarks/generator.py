@@ -0,0 +1,109 @@
+import math
+import random
+
+import src.database.artifacts as artifact_database
+import src.database.stats as stat_database
+
+from src.scoring.build_index import slot_main_stats
+
+roll_tiers = [0.7, 0.8, 0.9, 1.0]
+
+# amount of initial sub stats per rarity (min, max)
+initial_sub_stats = {
+    3: (1, 2),
+    4: (2, 3),
+    5: (3, 4),
+}
+
+
+def generate_good(artifact_amount, artifact_stats_constants, seed=0):
+    """Generate GOOD structure with valid random artifacts
+
+    :param artifact_amount: amount of artifacts
+    :param artifact_stats_constants: maximum roll value of each sub stat per rarity (artifact-max-stats.json)
+    :param seed: random seed (same seed generates the same inventory)
+    :return: GOOD (Genshin Open Object Description)
+    """
+    generator = random.Random(seed)
+    return {
+        'format': 'GOOD',
+        'version': 2,
+        'source': 'g2c-benchmark',
+        'artifacts': [
+            generate_good_artifact(generator, artifact_stats_constants, index) for index in range(artifact_amount)
+        ],
+    }
+
+
+def generate_good_artifact(generator, artifact_stats_constants, index):
+    """Generate GOOD artifact with sub stats rolled like in the game
+
+    :param generator: random generator
+    :param artifact_stats_constants: maximum roll value of each sub stat per rarity
+    :param index: artifact identifier
+    :return: GOOD (Genshin Open Object Description) artifact structure
+    """
+    set_key, rarity = generator.choice([
+        *[(set_key, 5) for set_key in artifact_database.rarity_five] * 4,
+        *[(set_key, 4) for set_key in artifact_database.rarity_five],
+        *[(set_key, 4) for set_key in artifact_database.rarity_four],
+        *[(set_key, 3) for set_key in artifact_database.rarity_three],
+    ])
+    slot_key = generator.choice(artifact_database.slot_key_order)
+    main_stat_key = generator.choice(slot_main_stats[slot_key])
+    level = generator.randint(0, rarity * 4)
+
+    sub_stat_amount = generator.randint(*initial_sub_stats[rarity])
+    roll_amount = sub_stat_amount + math.floor(level / 4)
+    sub_stat_keys = [key for key in stat_database.sub_stats if key != main_stat_key]
+    sub_stat_keys = generator.sample(sub_stat_keys, 4)[0:min(roll_amount, 4)]
+
+    sub_stat_values = {sub_stat_key: 0 for sub_stat_key in sub_stat_keys}
+    for roll in range(roll_amount):
+        sub_stat_key = sub_stat_keys[roll] if roll < len(sub_stat_keys) else generator.choice(sub_stat_keys)
+        sub_stat_values[sub_stat_key] += artifact_stats_constants[sub_stat_key][str(rarity)] * generator.choice(roll_tiers)
+
+    sub_stats = [{'key': key, 'value': round(value, 1)} for key, value in sub_stat_values.items()]
+    sub_stats.extend({'key': None, 'value': 0} for _ in range(4 - len(sub_stats)))
+
+    return {
+        'setKey': set_key,
+        'slotKey': slot_key,
+        'mainStatKey': main_stat_key,
+        'rarity': rarity,
+        'level': level,
+        'substats': sub_stats,
+        'location': generator.choice(['', '', '', 'HuTao', 'Xingqiu', 'Bennett']),
+        'lock': generator.random() < 0.3,
+        'id': index,
+    }
+
+
+def generate_build_list(build_amount, seed=0):
+    """Generate builds with random filters and sub stat weights (same format as builds/*.json)
+
+    :param build_amount: amount of builds
+    :param seed: random seed
+    :return: list of builds
+    """
+    generator = random.Random(seed)
+
+    build_list = []
+    for index in range(build_amount):
+        sub_stat_keys = generator.sample(stat_database.sub_stats, generator.randint(3, 7))
+        build_list.append({
+            'character': f'Synthetic {index // 3}',
+            'name': f'Build {index % 3}',
+            'filter': {
+                'set': generator.sample(artifact_database.set_key_order, generator.randint(1, 7)),
+                'sands': generator.sample(stat_database.sands_main_stats, generator.randint(1, 2)),
+                'goblet': generator.sample(stat_database.goblet_main_stats, generator.randint(1, 2)),
+                'circlet': generator.sample(stat_database.circlet_main_stats, generator.randint(1, 3)),
+            },
+            'sub_stats': {
+                sub_stat_key: generator.choice([0.2, 0.4, 0.5, 0.6, 0.8, 1])
+                for sub_stat_key in sub_stat_keys
+            },
+        })
+
+    return build_list
@@ -0,0 +1,168 @@
+import click
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import main as g2c
+import benchmarks.generator as generator
+import src.scoring.build_index as build_index
+
+
+@click.command()
+@click.option('-n', '--artifacts', 'artifact_amounts', multiple=True, type=click.IntRange(min=1),
+              default=[500, 2000, 10000], show_default=True, help='Specify inventory sizes.')
+@click.option('-b', '--builds', 'build_amounts', multiple=True, type=click.IntRange(min=1),
+              default=[10, 100, 500], show_default=True, help='Specify build library sizes.')
+@click.option('--seed', default=0, show_default=True, type=int, help='Specify random seed.')
+@click.option('-m', '--memory', is_flag=True, help='Measure peak memory of each stage (runs each stage twice).')
+@click.option('-o', '--output-file', default='benchmark-report.json', show_default=True, type=str,
+              help='Specify JSON report file.')
+@click.option('-c', '--compare', 'baseline_file', type=str, help='Compare results with previous JSON report.')
+def main(artifact_amounts, build_amounts, seed, memory, output_file, baseline_file):
+    artifact_stats_constants = g2c.load_artifact_stats_constants()
+
+    cases = []
+    for artifact_amount in artifact_amounts:
+        good = generator.generate_good(artifact_amount, artifact_stats_constants, seed)
+        for build_amount in build_amounts:
+            build_list = generator.generate_build_list(build_amount, seed)
+            stages = benchmark_pipeline(good, build_list, memory)
+            cases.append({'artifacts': artifact_amount, 'builds': build_amount, 'stages': stages})
+            click.echo(format_case(cases[-1]), err=True)
+
+    report = {
+        'commit': get_git_commit(),
+        'python': platform.python_version(),
+        'seed': seed,
+        'cases': cases,
+    }
+    with open(output_file, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
+
+    if baseline_file:
+        with open(baseline_file) as baseline:
+            click.echo(compare_reports(json.load(baseline), report))
+
+
+def benchmark_pipeline(good, build_list, memory=False):
+    """Run each pipeline stage measuring time (and optionally peak memory)
+
+    :param good: GOOD (Genshin Open Object Description)
+    :param build_list: list of builds (not compiled)
+    :param memory: measure peak memory with tracemalloc
+    :return: dict {stage: measures}
+    """
+    stages = dict()
+
+    def run_stage(name, function, *args):
+        result, stages[name] = measure_stage(function, args, memory)
+        stages[name]['items_in'] = len(args[0])
+        stages[name]['items_out'] = result if isinstance(result, int) else len(result)
+        return result
+
+    good_text = json.dumps(good)
+    good = run_stage('json_load', json.loads, good_text)
+    build_list = run_stage('compile_builds', lambda builds: list(map(build_index.compile_build, builds)), build_list)
+
+    artifact_list = run_stage('generate_g2c', g2c.generate_g2c_artifact_list_from_good, good['artifacts'])
+    artifact_list = run_stage('hydrate_efficiency', g2c.hydrate_sub_stats_efficiency, artifact_list)
+    artifact_list = run_stage('remove_non_maximum_rarity', g2c.remove_artifacts_in_non_maximum_rarity, artifact_list)
+
+    artifact_list_to_keep = run_stage('score_python', g2c.get_artifacts_with_build_scores, artifact_list, build_list)
+    if g2c.vectorized_scoring is not None:
+        run_stage('score_numpy', g2c.vectorized_scoring.get_artifacts_with_build_scores, artifact_list, build_list)
+
+    filter_rule_list = g2c.parse_cli_filter_string([
+        'rank:0=t:0.2', 'rank:[1;2]=t:0.3', 'set_key:GladiatorsFinale;WanderersTroupe=b:20', 'slot_key:flower=b:50'
+    ])
+    artifact_list_to_keep = run_stage('filter', g2c.filter_artifacts, artifact_list_to_keep, filter_rule_list)
+    artifact_list_to_discard = run_stage(
+        'complementary', g2c.get_complementary_artifacts, artifact_list, artifact_list_to_keep
+    )
+    artifact_list_to_keep = run_stage('lock', g2c.lock_unlock_artifacts, artifact_list_to_keep, True)
+    artifact_list_to_discard = run_stage('unlock', g2c.lock_unlock_artifacts, artifact_list_to_discard, False)
+
+    sort_rule_list = g2c.parse_cli_sort_string('rarity:desc,level:desc,set_key,slot_key,best_score:desc')
+    output_list = artifact_list_to_keep + artifact_list_to_discard
+    output_list = run_stage('sort', g2c.sort_artifacts, output_list, sort_rule_list)
+
+    run_stage('json_dumps', json.dumps, output_list)
+    return stages
+
+
+def measure_stage(function, args, memory=False):
+    """Measure wall time, CPU time and peak memory of a function call
+
+    :param function: stage function
+    :param args: stage arguments
+    :param memory: measure peak memory (tracemalloc) in a second call
+    :return: tuple (result, measures)
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = function(*args)
+    measures = {
+        'wall_seconds': time.perf_counter() - wall_start,
+        'cpu_seconds': time.process_time() - cpu_start,
+    }
+
+    if memory:
+        tracemalloc.start()
+        function(*args)
+        measures['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result, measures
+
+
+def format_case(case):
+    """Return human readable summary of a benchmark case
+
+    :param case: benchmark case
+    :return: summary string
+    """
+    stages = ', '.join(f"{name}={measures['wall_seconds']:.3f}s" for name, measures in case['stages'].items())
+    return f"{case['artifacts']} artifacts x {case['builds']} builds: {stages}"
+
+
+def compare_reports(baseline_report, report):
+    """Return wall time ratio (current / baseline) for stages present in both reports
+
+    :param baseline_report: previous benchmark report
+    :param report: current benchmark report
+    :return: comparison string
+    """
+    baseline_cases = {(case['artifacts'], case['builds']): case for case in baseline_report['cases']}
+
+    lines = [f"{baseline_report['commit']} -> {report['commit']}"]
+    for case in report['cases']:
+        baseline_case = baseline_cases.get((case['artifacts'], case['builds']))
+        if not baseline_case:
+            continue
+
+        for name, measures in case['stages'].items():
+            if name not in baseline_case['stages']:
+                continue
+            ratio = measures['wall_seconds'] / max(baseline_case['stages'][name]['wall_seconds'], 1e-9)
+            lines.append(f"{case['artifacts']:>8} x {case['builds']:>5} {name:<28} {ratio:6.2f}x")
+
+    return '\n'.join(lines)
+
+
+def get_git_commit():
+    """Return current git commit (None outside a git repository)
+
+    :return: commit hash
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import click
+import json
+
+import main as g2c
+import src.scoring.build_index as build_index
+
+
+@click.command()
+@click.option('-o', '--output-format', default='table', show_default=True, type=click.Choice(['table', 'json']),
+              help='Specify report format.')
+@click.option('-r', '--redundant', is_flag=True, help='Show only redundant builds (same scores and same filter).')
+@click.option('-c', '--build-cache', default='.cache/build-index.json', show_default=True, type=str,
+              help='Specify compiled build index cache file (empty to disable).')
+def main(output_format, redundant, build_cache):
+    build_file_name_list = g2c.find_files_by_extension('builds/', '.json')
+    build_list = build_index.load_build_list(build_file_name_list, build_cache or None)
+
+    equivalent_builds = build_index.find_equivalent_builds(build_list)
+    if redundant:
+        equivalent_builds = [
+            {'builds': build_names, 'redundant': [build_names]}
+            for equivalent_build_group in equivalent_builds for build_names in equivalent_build_group['redundant']
+        ]
+
+    if output_format == 'json':
+        print(json.dumps(equivalent_builds))
+        return
+
+    if not equivalent_builds:
+        click.echo('No redundant builds.' if redundant else 'No builds sharing scores.', err=True)
+    for line in build_index.format_equivalent_builds(equivalent_builds):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
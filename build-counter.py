@@ -3,19 +3,32 @@ import json
 
 from collections import defaultdict
 
+import src.output.columnar as columnar
+
 
 @click.command()
-@click.option('-i', '--input-file', required=True, type=str, help='Specify input file with artifact builds.')
+@click.option('-i', '--input-file', required=True, type=str,
+              help='Specify input file with artifact builds (G2C JSON, columnar or summary output).')
 def main(input_file):
     builds = defaultdict(int)
 
-    with open(input_file) as artifact_file:
-        artifacts = json.load(artifact_file)
+    with open(input_file, 'rb') as artifact_file:
+        is_columnar = artifact_file.read(len(columnar.columnar_magic)) == columnar.columnar_magic
+
+    if is_columnar:
+        with columnar.ColumnarReader(input_file) as reader:
+            builds.update(reader.count_builds())
+    else:
+        with open(input_file) as artifact_file:
+            artifacts = json.load(artifact_file)
 
-    for artifact in artifacts:
-        for build in artifact['build_score']:
-            build_name = f"{build['character']} - {build['name']}"
-            builds[build_name] += 1
+        if isinstance(artifacts, dict):  # summary output already counts artifacts per build
+            builds.update({build_name: build['count'] for build_name, build in artifacts['build'].items()})
+        else:
+            for artifact in artifacts:
+                for build in artifact['build_score']:
+                    build_name = f"{build['character']} - {build['name']}"
+                    builds[build_name] += 1
 
     sorted_builds = dict(sorted(builds.items(), key=lambda x: x[1], reverse=True))
     for build_name, build_count in sorted_builds.items():
@@ -24,4 +37,3 @@ def main(input_file):
 
 if __name__ == '__main__':
     main()
-
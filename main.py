@@ -1,49 +1,212 @@
 import click
-import copy
 import functools
+import heapq
 import json
 import math
+import operator
 import os
-import uuid
+import time
 
 from collections import defaultdict
+import src.artifact.identity as artifact_identity
+import src.artifact.rolls as rolls
+import src.artifact.validation as validation
 import src.database.artifacts as artifact_database
 import src.database.stats as stat_database
+import src.scoring.build_index as build_index
+import src.instrumentation.profiler as profiling
+import src.output.columnar as columnar
+import src.output.summary as summary
+import src.scoring.incremental as incremental
+import src.scoring.loadouts as loadout_optimizer
+import src.scoring.skyline as skyline
+import src.stream.good as good_stream
+
+from src.scoring.build_index import calculate_normalization_factor
+
+try:
+    import src.scoring.potential as upgrade_potential
+    import src.scoring.vectorized as vectorized_scoring
+except ImportError:  # NumPy is optional and only required by the numpy engine and the upgrade potential
+    upgrade_potential = None
+    vectorized_scoring = None
 
 
 @click.command()
 @click.option('-i', '--input-file', required=True, type=str, help='Specify input file in GOOD format.')
 @click.option('-o', '--output-format', default='g2c', show_default=True,
-              type=click.Choice(['g2c', 'count', 'good'], case_sensitive=False),
-              help='Specify output format.')
+              type=click.Choice(['g2c', 'count', 'good', 'columnar', 'summary'], case_sensitive=False),
+              help='Specify output format (columnar: binary file, summary: statistics per build, set, slot and rank).')
 @click.option('-k', '--keep', 'list_mode', flag_value='keep', default=True, help='Show artifacts that will be kept.')
 @click.option('-d', '--discard', 'list_mode', flag_value='discard', help='Show artifacts that will be discarded.')
 @click.option('-a', '--all', 'list_mode', flag_value='all', help='Show all artifacts.')
 @click.option('-w', '--weak', is_flag=True, help='Keep artifact in non maximum rarity.')
 @click.option('-f', '--filters', multiple=True, type=str, help='Filter artifacts according to defined rules.')
+@click.option('-g', '--groups', multiple=True, type=str, help='Keep only the best artifacts in each group.')
 @click.option('-s', '--sort', type=str, help='Sort artifacts according to defined rules.')
-def main(input_file, output_format, list_mode, weak, filters, sort):
+@click.option('-l', '--limit', type=click.IntRange(min=0), help='Show only the first artifacts (after sorting).')
+@click.option('-e', '--engine', default='python', show_default=True,
+              type=click.Choice(['python', 'numpy'], case_sensitive=False),
+              help='Specify scoring engine.')
+@click.option('-c', '--build-cache', default='.cache/build-index.json', show_default=True, type=str,
+              help='Specify compiled build index cache file (empty to disable).')
+@click.option('-r', '--result-cache', type=str,
+              help='Enable incremental mode reusing scores from result cache file (flipped artifacts go to stderr).')
+@click.option('--stream', is_flag=True, help='Read and write GOOD file incrementally, scoring artifacts in batches.')
+@click.option('--batch-size', default=1000, show_default=True, type=click.IntRange(min=1),
+              help='Specify amount of artifacts scored at once in stream mode.')
+@click.option('--strict', is_flag=True, help='Reject GOOD files with invalid artifacts (see validator.py).')
+@click.option('--potential', is_flag=True, help='Estimate expected and percentile scores of artifacts at maximum level.')
+@click.option('--prune-dominated', is_flag=True,
+              help='Discard artifacts dominated by another one with the same set, slot and main stat without scoring them.')
+@click.option('--loadouts', type=click.IntRange(min=1),
+              help='Keep only artifacts in the best loadouts (one artifact per slot) of some build [amount per build].')
+@click.option('--profile', is_flag=True, help='Record time and item counts of each pipeline stage.')
+@click.option('--profile-format', default='table', show_default=True, type=click.Choice(['table', 'json', 'chrome']),
+              help='Specify profile report format (chrome: trace event format).')
+@click.option('--profile-file', type=str, help='Write profile report to file instead of stderr.')
+@click.option('--profile-memory', is_flag=True, help='Also record peak memory of each stage (slower).')
+def main(input_file, output_format, list_mode, weak, filters, groups, sort, limit, engine, build_cache, result_cache,
+         stream, batch_size, strict, potential, prune_dominated, loadouts, profile, profile_format, profile_file,
+         profile_memory):
+    if engine == 'numpy' and vectorized_scoring is None:
+        raise click.UsageError('The numpy engine requires NumPy (pip install numpy).')
+    if potential and upgrade_potential is None:
+        raise click.UsageError('The upgrade potential (--potential) requires NumPy (pip install numpy).')
+    if engine == 'numpy' and result_cache:
+        raise click.UsageError('The incremental mode (-r/--result-cache) is only supported by the python engine.')
+    if stream and (filters or groups or sort or limit is not None or result_cache or potential or prune_dominated
+                   or loadouts or profile):
+        raise click.UsageError('The stream mode does not support filters, groups, sort, limit, incremental mode, potential, '
+                               'dominated artifact pruning, loadouts or profile.')
+    if stream and output_format == 'columnar':
+        raise click.UsageError('The stream mode does not support the columnar output format.')
+
+    profiler = profiling.StageProfiler(profile_memory) if profile or profile_memory else profiling.null_profiler
+
+    build_file_name_list = profiler.measure('find_build_files', find_files_by_extension, 'builds/', '.json')
+    build_list = profiler.measure('load_builds', build_index.load_build_list, build_file_name_list, build_cache or None)
+
+    if stream:
+        try:
+            stream_good_artifacts(input_file, output_format, list_mode, weak, engine, build_list, batch_size, strict)
+        except validation.InvalidArtifactError as error:
+            raise click.ClickException(str(error))
+        return
+
     with open(input_file) as good_file:
-        good = json.load(good_file)
+        good = profiler.measure('json_load', json.load, good_file)
+
+    try:
+        output, flipped_artifact_list = process_good(good, build_list, output_format, list_mode, weak, filters, sort, engine,
+                                                     result_cache, limit, groups, profiler, strict, potential,
+                                                     prune_dominated, loadouts)
+    except validation.InvalidArtifactError as error:
+        raise click.ClickException(str(error))
+    if isinstance(output, bytes):
+        click.get_binary_stream('stdout').write(output)
+    else:
+        print(output)
+    if flipped_artifact_list is not None:
+        click.echo(json.dumps(flipped_artifact_list), err=True)
+
+    if profiler is not profiling.null_profiler:
+        report = profiler.report(profile_format)
+        if profile_file:
+            with open(profile_file, 'w') as report_file:
+                print(report, file=report_file)
+        else:
+            click.echo(report, err=True)
 
-    artifact_list = generate_g2c_artifact_list_from_good(good['artifacts'])
-    artifact_list = hydrate_sub_stats_efficiency(artifact_list)
 
-    build_file_name_list = find_files_by_extension('builds/', '.json')
+def process_good(good, build_list, output_format='g2c', list_mode='keep', weak=False, filters=(), sort=None,
+                 engine='python', result_cache=None, limit=None, groups=(), profiler=profiling.null_profiler, strict=False,
+                 potential=False, prune_dominated=False, loadouts=None):
+    """Run the whole pipeline for a GOOD structure and return the output (and the flipped artifacts in incremental mode)
+
+    :param good: GOOD (Genshin Open Object Description)
+    :param build_list: compiled build list
+    :param output_format: g2c, count, good, columnar or summary
+    :param list_mode: keep, discard or all
+    :param weak: keep artifact in non maximum rarity
+    :param filters: filter strings (-f/--filters)
+    :param sort: sort string (-s/--sort)
+    :param engine: python or numpy
+    :param result_cache: result cache path (incremental mode)
+    :param limit: amount of artifacts in the output (the first ones after sorting)
+    :param groups: group strings (-g/--groups)
+    :param profiler: records each stage (see profiling.StageProfiler)
+    :param strict: reject artifacts failing validation rules (raises validation.InvalidArtifactError)
+    :param potential: add final score estimates to the scored artifacts (see upgrade_potential.hydrate_upgrade_potential)
+    :param prune_dominated: discard dominated artifacts without scoring them (see mark_dominated_artifacts)
+    :param loadouts: keep only artifacts in the top loadouts of some build (see loadout_optimizer.keep_loadout_artifacts)
+    :return: tuple (output: JSON string, count or columnar file content; flipped artifacts: None without result cache)
+    """
+    artifact_list = profiler.measure('generate_g2c', generate_g2c_artifact_list_from_good, good['artifacts'], 0, strict)
+    artifact_list = profiler.measure('hydrate_efficiency', hydrate_sub_stats_efficiency, artifact_list)
 
     if not weak:
-        artifact_list = remove_artifacts_in_non_maximum_rarity(artifact_list)
+        artifact_list = profiler.measure('remove_non_maximum_rarity', remove_artifacts_in_non_maximum_rarity, artifact_list)
+
+    # only the non-dominated artifacts are scored, the others go to the complementary artifacts
+    artifact_list_to_score = artifact_list
+    if prune_dominated:
+        artifact_list = profiler.measure('mark_dominated', mark_dominated_artifacts, artifact_list, build_list)
+        artifact_list_to_score = [g2c_artifact for g2c_artifact in artifact_list if 'dominated_by' not in g2c_artifact]
+
+    if engine == 'numpy':
+        # the numpy engine scores every build at once, so there is no cost per build
+        build_costs = None
+        artifact_list_to_keep = profiler.measure(
+            'score_numpy', vectorized_scoring.get_artifacts_with_build_scores, artifact_list_to_score, build_list
+        )
+    else:
+        cached_results = None
+        if result_cache:
+            cached_results = profiler.measure(
+                'read_result_cache', incremental.read_result_cache, result_cache, 'artifact-max-stats.json'
+            )
+        build_costs = profiler.create_build_costs()
+        artifact_list_to_keep = profiler.measure(
+            'score_python', get_artifacts_with_build_scores, artifact_list_to_score, build_list, cached_results, None,
+            build_costs
+        )
+    profiler.record_build_costs(build_costs, build_list)
+
+    if potential:
+        artifact_list_to_keep = profiler.measure(
+            'potential', upgrade_potential.hydrate_upgrade_potential, artifact_list_to_keep, build_list
+        )
 
-    artifact_list_to_keep = get_artifacts_with_build_scores(artifact_list, build_file_name_list)
-    artifact_list_to_keep = lock_unlock_artifacts(artifact_list_to_keep, True)
+    if loadouts:
+        artifact_list_to_keep = profiler.measure(
+            'loadouts', loadout_optimizer.keep_loadout_artifacts, artifact_list_to_keep, build_list, loadouts
+        )
 
     # DEPRECATED
     if filters:
         filter_rule_list = parse_cli_filter_string(filters)
-        artifact_list_to_keep = filter_artifacts(artifact_list_to_keep, filter_rule_list)
+        artifact_list_to_keep = profiler.measure('filter', filter_artifacts, artifact_list_to_keep, filter_rule_list)
+
+    if groups:
+        group_rule_list = parse_cli_group_string(groups)
+        artifact_list_to_keep = profiler.measure('group', group_artifacts, artifact_list_to_keep, group_rule_list)
+
+    artifact_list_to_discard = profiler.measure(
+        'complementary', get_complementary_artifacts, artifact_list, artifact_list_to_keep
+    )
 
-    artifact_list_to_discard = get_complementary_artifacts(artifact_list, artifact_list_to_keep)
-    artifact_list_to_discard = lock_unlock_artifacts(artifact_list_to_discard, False)
+    flipped_artifact_list = None
+    if result_cache:
+        flipped_artifact_list = profiler.measure(
+            'update_result_cache', incremental.update_result_cache,
+            cached_results, artifact_list_to_keep, artifact_list_to_discard, build_list
+        )
+        profiler.measure('write_result_cache', incremental.write_result_cache, result_cache, cached_results)
+
+    # lock state is only applied when building the output (stages above share the same artifact dicts)
+    artifact_list_to_keep = profiler.measure('lock', lock_unlock_artifacts, artifact_list_to_keep, True)
+    artifact_list_to_discard = profiler.measure('unlock', lock_unlock_artifacts, artifact_list_to_discard, False)
 
     output_lists = {
         'keep': artifact_list_to_keep,
@@ -55,18 +218,116 @@ def main(input_file, output_format, list_mode, weak, filters, sort):
     # DEPRECATED
     if sort:
         sort_rule_list = parse_cli_sort_string(sort)
-        output_list = sort_artifacts(output_list, sort_rule_list)
+        output_list = profiler.measure('sort', sort_artifacts, output_list, sort_rule_list, limit)
+    elif limit is not None:
+        output_list = output_list[:limit]
 
     output = None
     if output_format == 'g2c':
-        output = json.dumps(output_list)
+        output = profiler.measure('json_dumps', json.dumps, output_list)
     if output_format == 'count':
         output = len(output_list)
     if output_format == 'good':
         return_good = update_good_artifacts(good, output_list)
-        output = json.dumps(return_good)
+        output = profiler.measure('json_dumps', json.dumps, return_good)
+    if output_format == 'columnar':
+        output = profiler.measure('columnar', columnar.encode_artifacts, output_list, build_list)
+    if output_format == 'summary':
+        artifact_summary = profiler.measure('summary', summary.summarize_artifacts, output_list)
+        output = profiler.measure('json_dumps', json.dumps, artifact_summary)
+
+    return output, flipped_artifact_list
+
+
+def stream_good_artifacts(input_file, output_format, list_mode, weak, engine, build_list, batch_size, strict=False):
+    """Read, score and write artifacts incrementally (memory doesn't grow with the GOOD file size)
+
+    Artifacts are written in the inventory order and non-artifact sections of the GOOD file are written as is.
+
+    :param input_file: GOOD (Genshin Open Object Description) file path
+    :param output_format: g2c, count, good or summary
+    :param list_mode: keep, discard or all
+    :param weak: keep artifact in non maximum rarity
+    :param engine: python or numpy
+    :param build_list: compiled build list
+    :param batch_size: amount of artifacts scored at once
+    :param strict: reject artifacts failing validation rules (raises validation.InvalidArtifactError)
+    """
+    count = 0
+    separator = ''
+    good_artifact_batch = []
+    artifact_index = 0
+    artifact_summary = summary.ArtifactSummary()
+
+    def write_batch():
+        nonlocal count, separator, artifact_index
+        g2c_artifact_list = score_good_artifact_batch(good_artifact_batch, artifact_index, weak, engine, build_list, strict)
+        artifact_index += len(good_artifact_batch)
+        good_artifact_batch.clear()
+
+        for g2c_artifact in g2c_artifact_list:
+            if list_mode != 'all' and g2c_artifact['lock'] != (list_mode == 'keep'):
+                continue
+
+            count += 1
+            if output_format == 'summary':
+                artifact_summary.add(g2c_artifact)
+            if output_format == 'g2c':
+                click.echo(separator + json.dumps(g2c_artifact), nl=False)
+            if output_format == 'good':
+                click.echo(separator + json.dumps(g2c_artifact['artifact_data']), nl=False)
+            separator = ', '
+
+    with open(input_file) as good_file:
+        for event, value in good_stream.iterate_good(good_file):
+            if event == 'raw' and output_format == 'good':
+                click.echo(value, nl=False)
+            elif event == 'artifacts_start' and output_format in ('g2c', 'good'):
+                click.echo('[', nl=False)
+            elif event == 'artifact':
+                good_artifact_batch.append(value)
+                if len(good_artifact_batch) >= batch_size:
+                    write_batch()
+            elif event == 'artifacts_end':
+                write_batch()
+                if output_format in ('g2c', 'good'):
+                    click.echo(']', nl=False)
+
+    if output_format == 'summary':
+        click.echo(json.dumps(artifact_summary.to_dict()), nl=False)
+    click.echo(count if output_format == 'count' else '')
+
+
+def score_good_artifact_batch(good_artifact_list, first_index, weak, engine, build_list, strict=False):
+    """Score GOOD artifact list and return G2C artifact list in the same order with lock state applied
+
+    :param good_artifact_list: GOOD (Genshin Open Object Description) artifact list
+    :param first_index: index of the first artifact in the GOOD file
+    :param weak: keep artifact in non maximum rarity
+    :param engine: python or numpy
+    :param build_list: compiled build list
+    :param strict: reject artifacts failing validation rules (raises validation.InvalidArtifactError)
+    :return: G2C (Genshin Garbage Collector) artifact list
+    """
+    artifact_list = generate_g2c_artifact_list_from_good(good_artifact_list, first_index, strict)
+    artifact_list = hydrate_sub_stats_efficiency(artifact_list)
 
-    print(output)
+    if not weak:
+        artifact_list = remove_artifacts_in_non_maximum_rarity(artifact_list)
+
+    if engine == 'numpy':
+        scored_artifact_list = vectorized_scoring.get_artifacts_with_build_scores(artifact_list, build_list)
+    else:
+        scored_artifact_list = get_artifacts_with_build_scores(artifact_list, build_list)
+    g2c_artifact_id_format = convert_g2c_list_to_g2c_id_format(scored_artifact_list)
+
+    g2c_artifact_list = []
+    for g2c_artifact in artifact_list:
+        lock = g2c_artifact['id'] in g2c_artifact_id_format
+        g2c_artifact = g2c_artifact_id_format.get(g2c_artifact['id'], g2c_artifact)
+        g2c_artifact_list.extend(lock_unlock_artifacts([g2c_artifact], lock))
+
+    return g2c_artifact_list
 
 
 def find_files_by_extension(path, extension):
@@ -87,8 +348,6 @@ def find_files_by_extension(path, extension):
 
 
 def remove_artifacts_in_non_maximum_rarity(good_artifact_list):
-    good_artifact_list = copy.deepcopy(good_artifact_list)
-
     maximum_rarity_artifacts = []
     for good_artifact in good_artifact_list:
         if good_artifact['set_key'] in artifact_database.rarity_five and good_artifact['rarity'] == 5:
@@ -110,7 +369,7 @@ def parse_cli_filter_string(filter_str_list):
     :param filter_str_list: string list in 'selector_list=action' format
     :return: filter rules format
     """
-    allowed_selector_keys = ['*', 'set_key', 'slot_key', 'main_stat_key', 'rarity', 'level', 'rank']
+    allowed_selector_keys = ['*', 'set_key', 'slot_key', 'main_stat_key', 'rarity', 'level', 'rank', 'initial_sub_stats']
 
     filter_rule_list = list()
     for filter_str in filter_str_list:
@@ -145,6 +404,30 @@ def parse_cli_filter_string(filter_str_list):
     return filter_rule_list
 
 
+def parse_cli_group_string(group_str_list):
+    """Parse -g/--group CLI argument
+
+    Group rules format:
+    [{'keys': ['set_key', 'slot_key'], 'amount': 5}]
+
+    :param group_str_list: string list in 'group_key_list=amount' format
+    :return: group rules format
+    """
+    allowed_group_keys = ['set_key', 'slot_key', 'main_stat_key', 'rarity', 'level', 'rank', 'build']
+
+    group_rule_list = []
+    for group_str in group_str_list:
+        group_keys_str, amount_str = group_str.split('=')
+        group_keys = [group_key for group_key in group_keys_str.split(',') if group_key in allowed_group_keys]
+
+        if not group_keys:
+            continue
+
+        group_rule_list.append({'keys': group_keys, 'amount': int(amount_str)})
+
+    return group_rule_list
+
+
 def parse_cli_sort_string(sort_str_list):
     """Parse -s/--sort CLI argument
 
@@ -176,108 +459,229 @@ def parse_cli_sort_string(sort_str_list):
 def generate_g2c_artifact_from_good(good_artifact, index=None):
     """Generate G2C artifact structure from GOOD artifact structure
 
+    The GOOD artifact is referenced (not copied) and must not be changed while the G2C artifact is in use.
+
     :param good_artifact: GOOD (Genshin Open Object Description) artifact structure
-    :param index: artifact unique identifier
+    :param index: artifact index (used as identifier when the GOOD artifact has no id)
     :return: G2C (Genshin Garbage Collector) artifact structure
     """
+    refer_id = good_artifact.get('id', index)
     return {
-        'id': str(uuid.uuid4()),
-        'refer_id': good_artifact.get('id', index),
+        'id': artifact_identity.generate_artifact_id(good_artifact, refer_id),
+        'refer_id': refer_id,
         'set_key': good_artifact['setKey'],
         'slot_key': good_artifact['slotKey'],
         'main_stat_key': good_artifact['mainStatKey'],
         'rarity': good_artifact['rarity'],
         'level': good_artifact['level'],
         'rank': math.floor(good_artifact['level'] / 4),
-        'sub_stats': copy.deepcopy(good_artifact['substats']),
+        'sub_stats': good_artifact['substats'],
         'best_score': 0,
         'best_build': '',
         'build_score': [],
         'lock': None,
         'location': good_artifact['location'],
-        'artifact_data': copy.deepcopy(good_artifact)
+        'artifact_data': good_artifact
     }
 
 
-def generate_g2c_artifact_list_from_good(good_artifact_list):
+def generate_g2c_artifact_list_from_good(good_artifact_list, first_index=0, strict=False):
     """Generate G2C artifact list from GOOD artifact list
 
+    In strict mode every artifact is checked against the validation rules while it is generated (see validator.py).
+
     :param good_artifact_list: GOOD (Genshin Open Object Description) artifact list
+    :param first_index: index of the first artifact in the GOOD file
+    :param strict: raise validation.InvalidArtifactError when some artifact fails a validation rule
     :return: G2C (Genshin Garbage Collector) artifact list
     """
-    return [generate_g2c_artifact_from_good(artifact, index) for index, artifact in enumerate(good_artifact_list)]
+    if not strict:
+        return [
+            generate_g2c_artifact_from_good(artifact, first_index + index) for index, artifact in enumerate(good_artifact_list)
+        ]
+
+    artifact_stats_constants = load_artifact_stats_constants()
+
+    g2c_artifact_list = []
+    invalid_artifact_list = []
+    for index, good_artifact in enumerate(good_artifact_list, first_index):
+        rule_names = validation.validate_good_artifact(good_artifact, artifact_stats_constants)
+        if rule_names:
+            invalid_artifact_list.append((good_artifact.get('id', index), rule_names))
+        g2c_artifact_list.append(generate_g2c_artifact_from_good(good_artifact, index))
+
+    if invalid_artifact_list:
+        raise validation.InvalidArtifactError(invalid_artifact_list)
+    return g2c_artifact_list
 
 
 def hydrate_sub_stats_efficiency(g2c_artifact_list):
-    """Calculate average efficiency for each sub stat
+    """Calculate average efficiency and roll decomposition for each sub stat
 
     The greatest efficiency is achieved when the artifact contains:
     - 9 rolls (only in rarity equal 5 stars begin with 4 sub stats)
     - Each roll in max value for specific sub stat (others possible values are 70%, 80% and 90%)
 
+    Each sub stat also gets its amount of rolls and the tier combinations (in tenths of the max value) that reach its
+    value, looked up in the memoized roll tables (see rolls.get_roll_table). The amount of rolls is None when the value
+    can't be rolled or when it's ambiguous with the amount of rolls of the artifact, and so is the initial amount of sub
+    stats of the artifact.
+
     :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list (without efficiency)
-    :return: G2C (Genshin Garbage Collector) artifact list (with efficiency)
+    :return: G2C (Genshin Garbage Collector) artifact list (with efficiency, rolls, roll_tiers and initial_sub_stats)
     """
-    g2c_artifact_list = copy.deepcopy(g2c_artifact_list)
-
     max_artifact_rolls = 9
 
-    with open('artifact-max-stats.json') as artifact_stats_file:
-        artifact_stats_constants = json.load(artifact_stats_file)
+    artifact_stats_constants = load_artifact_stats_constants()
 
+    hydrated_artifact_list = []
     for g2c_artifact in g2c_artifact_list:
         artifact_rarity = str(g2c_artifact['rarity'])
 
+        sub_stats = []
+        roll_decompositions = []
         for sub_stat in g2c_artifact['sub_stats']:
             sub_stat_key = sub_stat['key']
 
             if sub_stat_key is None:  # its condition is for artifacts with less than 4 sub stats
-                sub_stat['efficiency'] = 0
+                sub_stats.append({**sub_stat, 'efficiency': 0, 'rolls': 0, 'roll_tiers': ()})
             else:
                 max_roll_value = artifact_stats_constants[sub_stat_key][artifact_rarity]
                 current_value = sub_stat['value']
                 average_efficiency = (current_value / max_roll_value) / max_artifact_rolls
-                sub_stat['efficiency'] = average_efficiency
+                sub_stats.append({**sub_stat, 'efficiency': average_efficiency})
+                roll_decompositions.append(
+                    rolls.get_roll_table(sub_stat_key, max_roll_value).get(current_value, rolls.unreachable_value)
+                )
+
+        roll_amounts, initial_sub_stats = rolls.resolve_roll_amounts(
+            tuple(roll_decomposition[0] for roll_decomposition in roll_decompositions),
+            g2c_artifact['rarity'], g2c_artifact['rank']
+        )
+        rolled_sub_stats = [sub_stat for sub_stat in sub_stats if sub_stat['key'] is not None]
+        for sub_stat, roll_amount, roll_decomposition in zip(rolled_sub_stats, roll_amounts, roll_decompositions):
+            sub_stat['rolls'] = roll_amount
+            sub_stat['roll_tiers'] = roll_decomposition[1].get(roll_amount, ())
 
-    return g2c_artifact_list
+        hydrated_artifact_list.append({**g2c_artifact, 'sub_stats': sub_stats, 'initial_sub_stats': initial_sub_stats})
 
+    return hydrated_artifact_list
 
-def get_artifacts_with_build_scores(g2c_artifact_list, build_file_name_list):
-    """Get artifacts with build scores
 
-    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
-    :param build_file_name_list: build file path list
-    :return: G2C (Genshin Garbage Collector) artifact list
+@functools.lru_cache
+def load_artifact_stats_constants(artifact_stats_file_name='artifact-max-stats.json'):
+    """Load maximum roll value of each sub stat per rarity (loaded once per process)
+
+    :param artifact_stats_file_name: artifact stats constants path
+    :return: dict {sub_stat_key: {rarity: max_roll_value}}
     """
-    g2c_artifact_set_slot_format = convert_g2c_list_to_g2c_set_slot_format(g2c_artifact_list)
+    with open(artifact_stats_file_name) as artifact_stats_file:
+        return json.load(artifact_stats_file)
 
-    g2c_artifact_id_format = dict()
-    for build_file_name in build_file_name_list:
-        with open(build_file_name) as build_file:
-            build = json.load(build_file)
 
-        matched_artifact_list = get_artifacts_that_match_build(g2c_artifact_set_slot_format, build)
+def get_artifacts_with_build_scores(g2c_artifact_list, build_list, result_cache=None, inverted_build_index=None,
+                                    build_costs=None):
+    """Get artifacts with build scores
 
-        for matched_artifact in matched_artifact_list:
-            artifact_id = matched_artifact['id']
-            if artifact_id not in g2c_artifact_id_format.keys():
-                g2c_artifact_id_format[artifact_id] = copy.deepcopy(matched_artifact)
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
+    :param build_list: compiled build list (see build_index.load_build_list)
+    :param result_cache: reuse and store scores in result cache (see incremental.read_result_cache)
+    :param inverted_build_index: inverted index of the build list (created when not given)
+    :param build_costs: receives the scoring cost of each score class (see score_artifact_measured)
+    :return: G2C (Genshin Garbage Collector) artifact list
+    """
+    if inverted_build_index is None:
+        inverted_build_index = build_index.create_inverted_build_index(build_list)
+    score = score_artifact if build_costs is None else functools.partial(score_artifact_measured, build_costs=build_costs)
+
+    # builds sharing a score class are scored once per artifact (see build_index.get_score_class),
+    # builds matched by each (set_key, slot_key, main_stat_key) are grouped by score class once
+    score_plans = dict()
+
+    scored_artifact_list = []
+    for artifact_index, g2c_artifact in enumerate(g2c_artifact_list):
+        build_indexes = build_index.get_builds_for_artifact(inverted_build_index, g2c_artifact)
+        if not build_indexes:
+            continue
 
-        artifacts_score = score_artifacts(matched_artifact_list, build)
+        artifact_key = (g2c_artifact['set_key'], g2c_artifact['slot_key'], g2c_artifact['main_stat_key'])
+        if artifact_key not in score_plans:
+            score_plans[artifact_key] = build_index.group_builds_by_score_class([build_list[index] for index in build_indexes])
+        class_builds, class_positions = score_plans[artifact_key]
+
+        if result_cache:
+            cached_scores = incremental.get_cached_scores(result_cache, g2c_artifact)
+            class_scores = [None] * len(class_builds)
+            for build, class_position in class_positions:
+                if build['fingerprint'] not in cached_scores:
+                    if class_scores[class_position] is None:
+                        class_scores[class_position] = score(g2c_artifact, class_builds[class_position])
+                    cached_scores[build['fingerprint']] = class_scores[class_position]
+            build_scores = [cached_scores[build['fingerprint']] for build, _ in class_positions]
+        else:
+            class_scores = [score(g2c_artifact, class_build) for class_build in class_builds]
+            build_scores = [class_scores[class_position] for _, class_position in class_positions]
 
-        for artifact_id, artifact_score in artifacts_score.items():
-            g2c_artifact_id_format[artifact_id]['build_score'].append({
-                'character': build['character'],
-                'name': build['name'],
-                'score': artifact_score
-            })
+        g2c_artifact = {**g2c_artifact, 'build_score': [
+            {'character': build['character'], 'name': build['name'], 'score': score}
+            for (build, _), score in zip(class_positions, build_scores)
+        ]}
 
-    for g2c_artifact in g2c_artifact_id_format.values():
         best_score = max(g2c_artifact['build_score'], key=lambda artifact: artifact['score'])
         g2c_artifact['best_score'] = best_score['score']
         g2c_artifact['best_build'] = f"{best_score['character']} - {best_score['name']}"
 
-    return list(g2c_artifact_id_format.values())
+        # same order as matching build by build: first build, slot, set position in that build and inventory order
+        artifact_order = (
+            build_indexes[0],
+            artifact_database.slot_key_order.index(g2c_artifact['slot_key']),
+            build_list[build_indexes[0]]['set_keys'].index(g2c_artifact['set_key']),
+            artifact_index
+        )
+        scored_artifact_list.append((artifact_order, g2c_artifact))
+
+    return [g2c_artifact for _, g2c_artifact in sorted(scored_artifact_list, key=lambda item: item[0])]
+
+
+def mark_dominated_artifacts(g2c_artifact_list, build_list):
+    """Mark artifacts dominated by another artifact with the same set, slot and main stat
+
+    An artifact is dominated when another one has higher or equal efficiency in every weighted sub stat (lower or equal
+    for negative weights), so it can't get a higher score in any build. Sub stats with positive and negative weights
+    must have the same efficiency.
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list (with efficiency)
+    :param build_list: compiled build list
+    :return: G2C (Genshin Garbage Collector) artifact list (dominated_by: refer_id of a non-dominated artifact)
+    """
+    sub_stat_directions = skyline.get_sub_stat_directions(build_list)
+
+    dominated_by = dict()
+    for g2c_artifact_slot_format in convert_g2c_list_to_g2c_set_slot_format(g2c_artifact_list).values():
+        for slot_artifact_list in g2c_artifact_slot_format.values():
+            buckets = defaultdict(list)
+            for g2c_artifact in slot_artifact_list:
+                efficiencies = defaultdict(float)
+                for sub_stat in g2c_artifact['sub_stats']:
+                    efficiencies[sub_stat['key']] += sub_stat['efficiency']
+
+                vector = tuple(direction * efficiencies[key] for key, direction in sub_stat_directions.items() if direction)
+                mixed_efficiencies = tuple(
+                    efficiencies[key] for key, direction in sub_stat_directions.items() if not direction
+                )
+                buckets[(g2c_artifact['main_stat_key'], mixed_efficiencies)].append((g2c_artifact, vector))
+
+            for bucket in buckets.values():
+                dominators = skyline.find_dominators([vector for _, vector in bucket])
+                for (g2c_artifact, _), dominator in zip(bucket, dominators):
+                    if dominator is not None:
+                        dominated_by[g2c_artifact['id']] = bucket[dominator][0]['refer_id']
+
+    return [
+        {**g2c_artifact, 'dominated_by': dominated_by[g2c_artifact['id']]} if g2c_artifact['id'] in dominated_by
+        else g2c_artifact
+        for g2c_artifact in g2c_artifact_list
+    ]
 
 
 def convert_g2c_list_to_g2c_set_slot_format(g2c_artifact_list):
@@ -374,29 +778,83 @@ def score_artifacts(g2c_artifact_list, build):
     :param build: contains the definition of filter rules
     :return: dict {id: score} for each G2C (Genshin Garbage Collector) artifact
     """
-    normalization_factor = calculate_normalization_factor(build['sub_stats'].values())
+    normalization_factor = build.get('normalization_factor')
+    if normalization_factor is None:
+        normalization_factor = calculate_normalization_factor(build['sub_stats'].values())
 
     artifacts_score = dict()
     for g2c_artifact in g2c_artifact_list:
-        score = functools.reduce(
-            lambda acc, sub_stat: acc + sub_stat['efficiency'] * build['sub_stats'].get(sub_stat['key'], 0),
-            g2c_artifact['sub_stats'],
-            0
-        )
-        artifacts_score[g2c_artifact['id']] = round(score / normalization_factor, 2)
+        artifacts_score[g2c_artifact['id']] = score_artifact(g2c_artifact, build, normalization_factor)
 
     return artifacts_score
 
 
-def calculate_normalization_factor(sub_stats):
-    """Calculate the optimal sub stats to find the normalization factor
+def score_artifact(g2c_artifact, build, normalization_factor=None):
+    """Return score for a single artifact
+
+    :param g2c_artifact: G2C (Genshin Garbage Collector) artifact (with efficiency)
+    :param build: contains the sub stat weights
+    :param normalization_factor: build normalization factor (compiled build value when not informed)
+    :return: score rounded to 2 decimal places
+    """
+    if normalization_factor is None:
+        normalization_factor = build['normalization_factor']
+
+    score = functools.reduce(
+        lambda acc, sub_stat: acc + sub_stat['efficiency'] * build['sub_stats'].get(sub_stat['key'], 0),
+        g2c_artifact['sub_stats'],
+        0
+    )
+    return round(score / normalization_factor, 2)
+
+
+def score_artifact_measured(g2c_artifact, build, build_costs):
+    """Return score for a single artifact, adding the scoring time to the cost of the build score class
+
+    :param g2c_artifact: G2C (Genshin Garbage Collector) artifact (with efficiency)
+    :param build: compiled build
+    :param build_costs: dict {score class: [amount of scored artifacts, wall seconds]}
+    :return: score rounded to 2 decimal places
+    """
+    wall_start = time.perf_counter()
+    score = score_artifact(g2c_artifact, build)
+    build_cost = build_costs[build['score_class']]
+    build_cost[0] += 1
+    build_cost[1] += time.perf_counter() - wall_start
+    return score
+
+
+def compile_filter_rules(filter_rule_list):
+    """Compile filter rules into a predicate plan
+
+    Selector values become sets (integers for numeric keys) and wildcard selectors are dropped,
+    so matching an artifact is a set lookup per selector.
 
-    :param sub_stats: sub stat list with weight
-    :return: float representing the normalization factor
+    Filter plan format:
+    [{'selectors': [('rank', {0, 1})], 'action': ('t', 0.2)}]
+
+    :param filter_rule_list: filter rules (parse_cli_filter_string output)
+    :return: filter plan
     """
-    sorted_sub_status = sorted(sub_stats, reverse=True)[0:4]
-    sorted_sub_status[0] *= 6
-    return sum(sorted_sub_status) / 9
+    action_types = {'t': float, 'b': int}
+    numeric_selector_keys = ['rarity', 'level', 'rank', 'initial_sub_stats']
+
+    filter_plan = []
+    for filter_rule in filter_rule_list:
+        selectors = []
+        for selector in filter_rule['selectors']:
+            if selector['key'] == '*':
+                continue
+            if selector['key'] in numeric_selector_keys:
+                values = {int(value) for value in selector['value'] if value.isdigit() and value == str(int(value))}
+            else:
+                values = set(selector['value'])
+            selectors.append((selector['key'], values))
+
+        action_key, action_value = filter_rule['action'].values()
+        filter_plan.append({'selectors': selectors, 'action': (action_key, action_types[action_key](action_value))})
+
+    return filter_plan
 
 
 def filter_artifacts(g2c_artifact_list, filter_rule_list):
@@ -405,33 +863,112 @@ def filter_artifacts(g2c_artifact_list, filter_rule_list):
     Only artifacts matched by the selector will be filtered
     Any artifact that don't match the selector will be preserved
 
+    Rules are applied in order, each one to the artifacts preserved by the previous rules.
+    Selectors are matched in a single pass (once per distinct combination of selected values)
+    and best score actions (b) use a heap instead of sorting.
+
     :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
     :param filter_rule_list: list with selector and action to filter artifacts
     :return: G2C (Genshin Garbage Collector) artifact list
     """
-    g2c_artifact_id_format = convert_g2c_list_to_g2c_id_format(g2c_artifact_list)
+    filter_plan = compile_filter_rules(filter_rule_list)
+
+    # artifacts with the same values for the selector keys match the same rules
+    selector_keys = sorted({key for filter_rule in filter_plan for key, _ in filter_rule['selectors']})
+    get_selected_values = operator.itemgetter(*selector_keys) if selector_keys else lambda artifact: None
+    matched_rules_by_values = dict()
+
+    matched_indexes = [[] for _ in filter_plan]
+    for index, artifact in enumerate(g2c_artifact_list):
+        artifact_values = get_selected_values(artifact)
+        matched_rules = matched_rules_by_values.get(artifact_values)
+        if matched_rules is None:
+            matched_rules = matched_rules_by_values[artifact_values] = [
+                rule_indexes for rule_indexes, filter_rule in zip(matched_indexes, filter_plan)
+                if all(artifact[key] in values for key, values in filter_rule['selectors'])
+            ]
+        for rule_indexes in matched_rules:
+            rule_indexes.append(index)
+
+    removed = [False] * len(g2c_artifact_list)
+    for rule_indexes, filter_rule in zip(matched_indexes, filter_plan):
+        rule_indexes = [index for index in rule_indexes if not removed[index]]
+        action_key, action_value = filter_rule['action']
+
+        if action_key == 't':
+            excluded_indexes = [index for index in rule_indexes if g2c_artifact_list[index]['best_score'] < action_value]
+        else:
+            best_amount = action_value if action_value >= 0 else max(len(rule_indexes) + action_value, 0)
+            best_indexes = set(heapq.nlargest(
+                best_amount, rule_indexes, key=lambda index: g2c_artifact_list[index]['best_score']
+            ))
+            excluded_indexes = [index for index in rule_indexes if index not in best_indexes]
 
-    actions_functions = {
-        't': lambda artifacts, threshold: [artifact for artifact in artifacts if artifact['best_score'] < float(threshold)],
-        'b': lambda artifacts, threshold: sorted(artifacts, key=lambda item: item['best_score'], reverse=True)[int(threshold):]
-    }
+        for index in excluded_indexes:
+            removed[index] = True
 
-    for filter_rule in filter_rule_list:
-        exclusion_artifact_list = g2c_artifact_id_format.values()
-        for selector in filter_rule['selectors']:
-            if selector['key'] != '*':
-                exclusion_artifact_list = [
-                    artifact for artifact in exclusion_artifact_list
-                    if str(artifact[selector['key']]) in selector['value']
-                ]
+    return [artifact for artifact, is_removed in zip(g2c_artifact_list, removed) if not is_removed]
 
-        action_key, action_value = filter_rule['action'].values()
-        exclusion_artifact_list = actions_functions[action_key](exclusion_artifact_list, action_value)
 
-        filtered_artifact_ids = [artifact['id'] for artifact in exclusion_artifact_list]
-        [g2c_artifact_id_format.pop(identifier) for identifier in filtered_artifact_ids]
+def get_artifact_groups(g2c_artifact, group_keys):
+    """Return the groups of an artifact and its score in each group
+
+    The build key puts the artifact in one group per matching build (with the score for that build),
+    otherwise the artifact is in a single group with its best score.
+
+    :param g2c_artifact: G2C (Genshin Garbage Collector) artifact
+    :param group_keys: group rule keys
+    :return: list of tuples (group, score)
+    """
+    group = tuple(g2c_artifact[group_key] for group_key in group_keys if group_key != 'build')
+    if 'build' not in group_keys:
+        return [(group, g2c_artifact['best_score'])]
+
+    return [
+        ((*group, f"{build_score['character']} - {build_score['name']}"), build_score['score'])
+        for build_score in g2c_artifact['build_score']
+    ]
+
+
+def select_best_artifacts_per_group(indexed_g2c_artifacts, group_rule):
+    """Select the best artifacts of each group
+
+    Artifacts are consumed one by one keeping a bounded heap per group, so memory is proportional to
+    groups x amount and not to the inventory. Ties keep the first artifacts (like the b filter action).
+
+    :param indexed_g2c_artifacts: iterable of tuples (index, G2C artifact)
+    :param group_rule: group rule ({'keys': [...], 'amount': N})
+    :return: set with the indexes of the selected artifacts
+    """
+    group_heaps = defaultdict(list)
+    for index, g2c_artifact in indexed_g2c_artifacts:
+        for group, score in get_artifact_groups(g2c_artifact, group_rule['keys']):
+            group_heap = group_heaps[group]
+            if len(group_heap) < group_rule['amount']:
+                heapq.heappush(group_heap, (score, -index))
+            elif group_heap and (score, -index) > group_heap[0]:
+                heapq.heapreplace(group_heap, (score, -index))
+
+    return {-negative_index for group_heap in group_heaps.values() for _, negative_index in group_heap}
+
+
+def group_artifacts(g2c_artifact_list, group_rule_list):
+    """Keep only the best artifacts in each group
+
+    Rules are applied in order, each one to the artifacts kept by the previous rules.
+    An artifact grouped by build is kept when it is among the best of any of its builds.
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
+    :param group_rule_list: list with keys and amount to group artifacts
+    :return: G2C (Genshin Garbage Collector) artifact list
+    """
+    for group_rule in group_rule_list:
+        selected_indexes = select_best_artifacts_per_group(enumerate(g2c_artifact_list), group_rule)
+        g2c_artifact_list = [
+            g2c_artifact for index, g2c_artifact in enumerate(g2c_artifact_list) if index in selected_indexes
+        ]
 
-    return list(g2c_artifact_id_format.values())
+    return g2c_artifact_list
 
 
 def sort_artifacts_by_order_list(g2c_artifact_list, sort_key, order_list, reverse=False):
@@ -443,8 +980,6 @@ def sort_artifacts_by_order_list(g2c_artifact_list, sort_key, order_list, revers
     :param reverse: defines whether to use original or reverse order
     :return: G2C (Genshin Garbage Collector) artifact list
     """
-    g2c_artifact_list = copy.deepcopy(g2c_artifact_list)
-
     artifact_set_format = defaultdict(list)
     for g2c_artifact in g2c_artifact_list:
         artifact_set_format[g2c_artifact[sort_key]].append(g2c_artifact)
@@ -479,27 +1014,59 @@ def sort_artifacts_by_slot_key(g2c_artifact_list, reverse=False):
     return sort_artifacts_by_order_list(g2c_artifact_list, 'slot_key', artifact_database.slot_key_order, reverse)
 
 
-def sort_artifacts(g2c_artifact_list, sort_rule_list):
+def plan_sort_passes(sort_rule_list):
+    """Merge sort rules into the fewest sort passes
+
+    Consecutive rules with the same order are sorted together with a tuple key, which gives the same result
+    as stable sorts one by one. set_key and slot_key rules keep their own pass (Genshin's internal order).
+
+    Sort passes format (in the application order, i.e. the most significant pass last):
+    [{'keys': ['rarity', 'level'], 'reverse': True}]
+
+    :param sort_rule_list: list with key/order rules to sort artifacts (parse_cli_sort_string output)
+    :return: sort passes
+    """
+    order_list_keys = ['set_key', 'slot_key']
+
+    sort_passes = []
+    for sort_rule in sort_rule_list:
+        previous_pass = sort_passes[-1] if sort_passes else None
+        if (
+            previous_pass and previous_pass['reverse'] == sort_rule['reverse']
+            and sort_rule['key'] not in order_list_keys and previous_pass['keys'][0] not in order_list_keys
+        ):
+            previous_pass['keys'].insert(0, sort_rule['key'])
+        else:
+            sort_passes.append({'keys': [sort_rule['key']], 'reverse': sort_rule['reverse']})
+
+    return sort_passes
+
+
+def sort_artifacts(g2c_artifact_list, sort_rule_list, limit=None):
     """Sort artifacts according to defined rules
 
     :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
     :param sort_rule_list: list with key/order rules to sort artifacts
+    :param limit: return only the first artifacts (the last pass selects them with a heap instead of sorting)
     :return: G2C (Genshin Garbage Collector) artifact list
     """
-    g2c_artifact_list = copy.deepcopy(g2c_artifact_list)
+    sort_passes = plan_sort_passes(sort_rule_list)
 
-    for sort_rule in sort_rule_list:
-        sort_key = sort_rule['key']
-        reverse = sort_rule['reverse']
+    for pass_index, sort_pass in enumerate(sort_passes):
+        sort_keys = sort_pass['keys']
+        reverse = sort_pass['reverse']
 
-        if sort_key == 'set_key':
+        if sort_keys[0] == 'set_key':
             g2c_artifact_list = sort_artifacts_by_set_key(g2c_artifact_list, reverse)
-        elif sort_key == 'slot_key':
+        elif sort_keys[0] == 'slot_key':
             g2c_artifact_list = sort_artifacts_by_slot_key(g2c_artifact_list, reverse)
+        elif limit is not None and pass_index == len(sort_passes) - 1:
+            select_function = heapq.nlargest if reverse else heapq.nsmallest
+            g2c_artifact_list = select_function(limit, g2c_artifact_list, key=operator.itemgetter(*sort_keys))
         else:
-            g2c_artifact_list = sorted(g2c_artifact_list, key=lambda item: item[sort_key], reverse=reverse)
+            g2c_artifact_list = sorted(g2c_artifact_list, key=operator.itemgetter(*sort_keys), reverse=reverse)
 
-    return g2c_artifact_list
+    return g2c_artifact_list[:limit] if limit is not None else g2c_artifact_list
 
 
 def lock_unlock_artifacts(g2c_artifact_list, lock):
@@ -509,11 +1076,10 @@ def lock_unlock_artifacts(g2c_artifact_list, lock):
     :param lock: boolean to indicate whether artifacts should be locked or unlocked
     :return: locked/unlocked G2C (Genshin Garbage Collector) artifact list
     """
-    g2c_artifact_list = copy.deepcopy(g2c_artifact_list)
-    for g2c_artifact in g2c_artifact_list:
-        g2c_artifact['lock'] = lock
-        g2c_artifact['artifact_data']['lock'] = lock
-    return g2c_artifact_list
+    return [
+        {**g2c_artifact, 'lock': lock, 'artifact_data': {**g2c_artifact['artifact_data'], 'lock': lock}}
+        for g2c_artifact in g2c_artifact_list
+    ]
 
 
 def get_complementary_artifacts(g2c_artifact_full_list, g2c_artifact_partial_list):
@@ -523,7 +1089,6 @@ def get_complementary_artifacts(g2c_artifact_full_list, g2c_artifact_partial_lis
     :param g2c_artifact_partial_list: G2C (Genshin Garbage Collector) artifact list
     :return: complementary G2C (Genshin Garbage Collector) artifact list
     """
-    g2c_artifact_full_list = copy.deepcopy(g2c_artifact_full_list)
     keys = {artifact['id'] for artifact in g2c_artifact_partial_list}
     return [artifact for artifact in g2c_artifact_full_list if artifact['id'] not in keys]
 
@@ -535,10 +1100,8 @@ def update_good_artifacts(good, g2c_artifact_list):
     :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
     :return: GOOD (Genshin Open Object Description)
     """
-    good = copy.deepcopy(good)
     good_artifacts = [artifact['artifact_data'] for artifact in g2c_artifact_list]
-    good['artifacts'] = good_artifacts
-    return good
+    return {**good, 'artifacts': good_artifacts}
 
 
 if __name__ == '__main__':
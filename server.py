@@ -0,0 +1,440 @@
+import click
+import collections
+import http.server
+import json
+import os
+import socketserver
+import stat
+import threading
+import time
+import traceback
+import urllib.parse
+
+import main as g2c
+import src.scoring.build_index as build_index
+import src.scoring.what_if as what_if
+
+# recent latencies kept per endpoint for percentiles
+latency_window = 1000
+# what-if sessions kept in memory (the least recently used one is dropped)
+max_what_if_sessions = 8
+# accepted values of the /good query parameters (same choices as main.py)
+output_formats = ['g2c', 'count', 'good', 'columnar', 'summary']
+list_modes = ['keep', 'discard', 'all']
+engines = ['python', 'numpy']
+
+
+class BuildLibrary:
+    """Compiled builds kept in memory, reloaded when a build file is added, removed or changed"""
+
+    def __init__(self, build_dir, cache_file_name=None, reload_interval=1.0):
+        self.build_dir = build_dir
+        self.cache_file_name = cache_file_name
+        self.reload_interval = reload_interval
+        self.lock = threading.Lock()
+        self.signature = None
+        self.checked_at = 0
+        self.reloads = 0
+        # build list and its inverted index are replaced together, so requests never mix two reloads
+        self.builds = ([], dict())
+        self.reload()
+
+    def get_signature(self):
+        """Return name, modification time and size of each build file
+
+        :return: tuple (build file path list, signature)
+        """
+        build_file_name_list = g2c.find_files_by_extension(self.build_dir, '.json')
+        signature = []
+        for build_file_name in build_file_name_list:
+            file_stat = os.stat(build_file_name)
+            signature.append((build_file_name, file_stat.st_mtime_ns, file_stat.st_size))
+        return build_file_name_list, signature
+
+    def reload(self):
+        """Load builds when the build files changed since the last load"""
+        build_file_name_list, signature = self.get_signature()
+        self.checked_at = time.monotonic()
+        if signature == self.signature:
+            return
+
+        build_list = build_index.load_build_list(build_file_name_list, self.cache_file_name)
+        self.builds = (build_list, build_index.create_inverted_build_index(build_list))
+        self.signature = signature
+        self.reloads += 1
+
+    def get(self):
+        """Return current builds (checking build files at most once per reload interval)
+
+        :return: tuple (compiled build list, inverted build index)
+        """
+        if time.monotonic() - self.checked_at >= self.reload_interval:
+            with self.lock:
+                if time.monotonic() - self.checked_at >= self.reload_interval:
+                    self.reload()
+        return self.builds
+
+
+class LatencyMetrics:
+    """Request count and latency per endpoint"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = collections.defaultdict(lambda: {
+            'requests': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+            'recent_seconds': collections.deque(maxlen=latency_window)
+        })
+
+    def record(self, endpoint, seconds, error=False):
+        with self.lock:
+            metrics = self.endpoints[endpoint]
+            metrics['requests'] += 1
+            metrics['errors'] += int(error)
+            metrics['total_seconds'] += seconds
+            metrics['max_seconds'] = max(metrics['max_seconds'], seconds)
+            metrics['recent_seconds'].append(seconds)
+
+    def summary(self):
+        """Return metrics with mean and percentiles (over the recent requests) of each endpoint
+
+        :return: dict {endpoint: metrics}
+        """
+        with self.lock:
+            summary = dict()
+            for endpoint, metrics in self.endpoints.items():
+                recent_seconds = sorted(metrics['recent_seconds'])
+                summary[endpoint] = {
+                    'requests': metrics['requests'],
+                    'errors': metrics['errors'],
+                    'mean_seconds': metrics['total_seconds'] / metrics['requests'],
+                    'max_seconds': metrics['max_seconds'],
+                    **{
+                        f'p{percentile}_seconds': recent_seconds[min(len(recent_seconds) * percentile // 100,
+                                                                     len(recent_seconds) - 1)]
+                        for percentile in (50, 95, 99)
+                    }
+                }
+            return summary
+
+
+class WhatIfSessions:
+    """What-if sessions kept in memory by id (see what_if.WhatIfSession)"""
+
+    def __init__(self, max_sessions=max_what_if_sessions):
+        self.max_sessions = max_sessions
+        self.lock = threading.Lock()
+        self.sessions = collections.OrderedDict()
+        self.created = 0
+
+    def add(self, session):
+        """Keep session, dropping the least recently used one when there are too many
+
+        :param session: what-if session
+        :return: session id
+        """
+        with self.lock:
+            self.created += 1
+            session_id = str(self.created)
+            self.sessions[session_id] = session
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return session_id
+
+    def rescore_build(self, session_id, build, commit=False):
+        """Re-score build in a session (sessions are not thread safe, so calls are serialized)
+
+        :param session_id: session id
+        :param build: build structure (as in builds/*.json)
+        :param commit: keep the edited build for the next calls
+        :return: what_if.WhatIfSession.rescore_build output
+        """
+        with self.lock:
+            if session_id not in self.sessions:
+                raise KeyError(f'Unknown what-if session: {session_id}')
+            self.sessions.move_to_end(session_id)
+            return self.sessions[session_id].rescore_build(build, commit)
+
+
+def create_what_if_session(good, build_list, weak=False):
+    """Score GOOD artifacts for build tuning
+
+    :param good: GOOD (Genshin Open Object Description) structure
+    :param build_list: compiled build list
+    :param weak: keep artifact in non maximum rarity
+    :return: what-if session
+    """
+    artifact_list = g2c.generate_g2c_artifact_list_from_good(good['artifacts'])
+    artifact_list = g2c.hydrate_sub_stats_efficiency(artifact_list)
+
+    if not weak:
+        artifact_list = g2c.remove_artifacts_in_non_maximum_rarity(artifact_list)
+
+    return what_if.WhatIfSession(artifact_list, build_list)
+
+
+def score_good_artifact(good_artifact, build_list, inverted_build_index, weak=False):
+    """Score a single GOOD artifact
+
+    :param good_artifact: GOOD (Genshin Open Object Description) artifact structure
+    :param build_list: compiled build list
+    :param inverted_build_index: inverted index of the build list
+    :param weak: keep artifact in non maximum rarity
+    :return: dict with keep decision, best score, best build and build scores
+    """
+    if not isinstance(good_artifact, dict):
+        raise TypeError('GOOD artifact must be a JSON object')
+    artifact_list = g2c.generate_g2c_artifact_list_from_good([good_artifact])
+    artifact_list = g2c.hydrate_sub_stats_efficiency(artifact_list)
+
+    if not weak:
+        artifact_list = g2c.remove_artifacts_in_non_maximum_rarity(artifact_list)
+
+    scored_artifact_list = g2c.get_artifacts_with_build_scores(artifact_list, build_list, None, inverted_build_index)
+    if not scored_artifact_list:
+        return {'keep': False, 'best_score': 0, 'best_build': '', 'build_score': []}
+
+    g2c_artifact = scored_artifact_list[0]
+    return {
+        'keep': True,
+        'best_score': g2c_artifact['best_score'],
+        'best_build': g2c_artifact['best_build'],
+        'build_score': g2c_artifact['build_score']
+    }
+
+
+def get_query_choice(query, name, choices):
+    """Return value of a query parameter among its choices (the first choice when missing)
+
+    :param query: parsed query string
+    :param name: query parameter name
+    :param choices: accepted values
+    :return: value
+    """
+    value = query.get(name, choices[:1])[-1].lower()
+    if value not in choices:
+        raise ValueError(f"Invalid {name}: {value!r} is not one of {', '.join(map(repr, choices))}")
+    return value
+
+
+def get_query_int(query, name, minimum):
+    """Return integer value of a query parameter (None when missing)
+
+    :param query: parsed query string
+    :param name: query parameter name
+    :param minimum: minimum accepted value
+    :return: value or None
+    """
+    if name not in query:
+        return None
+    value = int(query[name][-1])
+    if value < minimum:
+        raise ValueError(f'Invalid {name}: {value} is less than {minimum}')
+    return value
+
+
+class ScoringRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Scoring API
+
+    - POST /artifact: GOOD artifact -> keep decision and scores
+    - POST /artifacts: list of GOOD artifacts -> list of keep decisions and scores
+    - POST /good?output=g2c&mode=keep&weak=1&filter=...&group=...&sort=...&limit=...&strict=1&potential=1&prune=1&loadouts=...:
+      GOOD -> main.py output
+    - POST /what-if?weak=1: GOOD -> what-if session id
+    - POST /what-if/build?session=...&commit=1: edited build -> artifacts whose keep decision or best score changes
+    - GET /metrics: request latency metrics and build library status
+    """
+
+    server_version = 'G2C'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.handle_request({'/metrics': self.get_metrics})
+
+    def do_POST(self):
+        self.handle_request({
+            '/artifact': self.post_artifact,
+            '/artifacts': self.post_artifacts,
+            '/good': self.post_good,
+            '/what-if': self.post_what_if,
+            '/what-if/build': self.post_what_if_build
+        })
+
+    def handle_request(self, routes):
+        started_at = time.perf_counter()
+        url = urllib.parse.urlsplit(self.path)
+        route = routes.get(url.path)
+
+        status, body = 404, {'error': f'Unknown endpoint: {self.command} {url.path}'}
+        if route:
+            try:
+                status, body = 200, route(urllib.parse.parse_qs(url.query))
+            except (ValueError, KeyError, TypeError) as error:
+                status, body = 400, {'error': repr(error)}
+            except Exception as error:
+                # the connection would be dropped without response, the request is answered and logged instead
+                click.echo(traceback.format_exc(), err=True, nl=False)
+                status, body = 500, {'error': repr(error)}
+
+        self.send_body(status, body)
+        endpoint = f'{self.command} {url.path}' if route else 'unknown'
+        self.server.metrics.record(endpoint, time.perf_counter() - started_at, status != 200)
+
+    def read_json(self, body_type=dict):
+        content_length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(content_length))
+        if not isinstance(body, body_type):
+            raise TypeError(f'Request body must be a JSON {"object" if body_type is dict else "array"}')
+        return body
+
+    def send_body(self, status, body):
+        if isinstance(body, bytes):
+            content, content_type = body, 'application/octet-stream'
+        else:
+            content, content_type = (body if isinstance(body, str) else json.dumps(body)).encode(), 'application/json'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        if status != 200:
+            # the request body may not have been read yet, so the connection cannot be kept alive
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def get_metrics(self, query):
+        build_list, _ = self.server.build_library.get()
+        return {
+            'builds': len(build_list),
+            'build_reloads': self.server.build_library.reloads,
+            'endpoints': self.server.metrics.summary()
+        }
+
+    def post_artifact(self, query):
+        build_list, inverted_build_index = self.server.build_library.get()
+        weak = query.get('weak', ['0'])[-1] == '1'
+        return score_good_artifact(self.read_json(), build_list, inverted_build_index, weak)
+
+    def post_artifacts(self, query):
+        build_list, inverted_build_index = self.server.build_library.get()
+        weak = query.get('weak', ['0'])[-1] == '1'
+        return [
+            score_good_artifact(good_artifact, build_list, inverted_build_index, weak)
+            for good_artifact in self.read_json(list)
+        ]
+
+    def post_good(self, query):
+        build_list, _ = self.server.build_library.get()
+        output_format = get_query_choice(query, 'output', output_formats)
+        list_mode = get_query_choice(query, 'mode', list_modes)
+        engine = get_query_choice(query, 'engine', engines)
+        limit = get_query_int(query, 'limit', 0)
+        loadouts = get_query_int(query, 'loadouts', 1)
+        if engine == 'numpy' and g2c.vectorized_scoring is None:
+            raise ValueError('The numpy engine requires NumPy (pip install numpy).')
+        potential = query.get('potential', ['0'])[-1] == '1'
+        if potential and g2c.upgrade_potential is None:
+            raise ValueError('The upgrade potential requires NumPy (pip install numpy).')
+
+        output, _ = g2c.process_good(
+            self.read_json(), build_list,
+            output_format=output_format,
+            list_mode=list_mode,
+            weak=query.get('weak', ['0'])[-1] == '1',
+            filters=query.get('filter', []),
+            sort=query.get('sort', [None])[-1],
+            engine=engine,
+            limit=limit,
+            groups=query.get('group', []),
+            strict=query.get('strict', ['0'])[-1] == '1',
+            potential=potential,
+            prune_dominated=query.get('prune', ['0'])[-1] == '1',
+            loadouts=loadouts
+        )
+        return output if isinstance(output, (str, bytes)) else {'count': output}
+
+    def post_what_if(self, query):
+        build_list, _ = self.server.build_library.get()
+        session = create_what_if_session(self.read_json(), build_list, query.get('weak', ['0'])[-1] == '1')
+        return {
+            'session': self.server.what_if_sessions.add(session),
+            'artifacts': len(session.artifact_list),
+            'builds': len(session.build_list)
+        }
+
+    def post_what_if_build(self, query):
+        return self.server.what_if_sessions.rescore_build(
+            query['session'][-1], self.read_json(), query.get('commit', ['0'])[-1] == '1'
+        )
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScoringServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class UnixScoringServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def is_socket(path):
+    """Return True when path is a socket (not following symbolic links)
+
+    :param path: file path
+    :return: True when socket
+    """
+    return stat.S_ISSOCK(os.lstat(path).st_mode)
+
+
+def remove_socket(path):
+    """Remove socket left by a previous server, files of any other type are never removed
+
+    :param path: Unix socket path
+    """
+    if os.path.lexists(path) and is_socket(path):
+        os.remove(path)
+
+
+@click.command()
+@click.option('-H', '--host', default='127.0.0.1', show_default=True, type=str, help='Specify address to listen on.')
+@click.option('-p', '--port', default=8080, show_default=True, type=int, help='Specify port to listen on.')
+@click.option('-u', '--unix-socket', type=str, help='Listen on Unix socket instead of TCP.')
+@click.option('-c', '--build-cache', default='.cache/build-index.json', show_default=True, type=str,
+              help='Specify compiled build index cache file (empty to disable).')
+@click.option('--reload-interval', default=1.0, show_default=True, type=float,
+              help='Specify minimum seconds between checks for build file changes.')
+@click.option('-v', '--verbose', is_flag=True, help='Log every request.')
+def main(host, port, unix_socket, build_cache, reload_interval, verbose):
+    g2c.load_artifact_stats_constants()
+
+    if unix_socket:
+        if os.path.exists(unix_socket) and not is_socket(unix_socket):
+            raise click.UsageError(f'{unix_socket} exists and is not a socket.')
+        remove_socket(unix_socket)
+        server = UnixScoringServer(unix_socket, ScoringRequestHandler)
+    else:
+        server = ScoringServer((host, port), ScoringRequestHandler)
+
+    server.build_library = BuildLibrary('builds/', build_cache or None, reload_interval)
+    server.metrics = LatencyMetrics()
+    server.what_if_sessions = WhatIfSessions()
+    server.verbose = verbose
+
+    click.echo(f'Listening on {unix_socket or f"http://{host}:{port}"} ({len(server.build_library.builds[0])} builds)',
+               err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix_socket:
+            remove_socket(unix_socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+import math
+import threading
+
+from array import array
+
+import src.database.artifacts as artifact_database
+import src.database.stats as stat_database
+
+# Keys are interned as small integer codes shared by every inventory loaded in the process.
+# Unknown keys (e.g. sets released after the database) are appended at the end of each table, under intern_lock as
+# the server packs inventories from several threads.
+set_keys = list(artifact_database.set_key_order)
+slot_keys = list(artifact_database.slot_key_order)
+main_stat_keys = list(dict.fromkeys([
+    *stat_database.flower_main_stats,
+    *stat_database.plume_main_stats,
+    *stat_database.sands_main_stats,
+    *stat_database.goblet_main_stats,
+    *stat_database.circlet_main_stats,
+]))
+sub_stat_keys = list(stat_database.sub_stats)
+
+set_key_codes = {key: code for code, key in enumerate(set_keys)}
+slot_key_codes = {key: code for code, key in enumerate(slot_keys)}
+main_stat_key_codes = {key: code for code, key in enumerate(main_stat_keys)}
+sub_stat_key_codes = {key: code for code, key in enumerate(sub_stat_keys)}
+
+intern_lock = threading.Lock()
+
+empty_sub_stat_code = -1
+
+# keys stored in slots, other keys (e.g. initial_sub_stats, dominated_by, loadouts) are kept as extra fields
+g2c_artifact_keys = ('id', 'refer_id', 'set_key', 'slot_key', 'main_stat_key', 'rarity', 'level', 'rank', 'sub_stats',
+                     'best_score', 'best_build', 'build_score', 'lock', 'location', 'artifact_data')
+
+
+class CompactArtifact:
+    """Memory efficient G2C (Genshin Garbage Collector) artifact
+
+    Keys are stored as integer codes and sub stats as fixed-width arrays, the dict (JSON) shape is only
+    rebuilt by to_g2c_artifact. The GOOD artifact (artifact_data) is referenced, never copied. The round trip is
+    lossless: fields added by later stages are kept in order after the G2C fields.
+    """
+
+    __slots__ = (
+        'id', 'refer_id', 'set_code', 'slot_code', 'main_stat_code', 'rarity', 'level',
+        'sub_stat_codes', 'sub_stat_values', 'sub_stat_efficiency', 'sub_stat_int_mask', 'sub_stat_rolls',
+        'sub_stat_roll_tiers', 'best_score', 'best_build', 'build_score', 'lock', 'location', 'artifact_data',
+        'extra_fields',
+    )
+
+    @classmethod
+    def from_g2c_artifact(cls, g2c_artifact):
+        """Create compact artifact from G2C artifact structure
+
+        :param g2c_artifact: G2C (Genshin Garbage Collector) artifact structure
+        :return: compact artifact
+        """
+        compact_artifact = cls()
+        compact_artifact.id = g2c_artifact['id']
+        compact_artifact.refer_id = g2c_artifact['refer_id']
+        compact_artifact.set_code = intern_key(set_keys, set_key_codes, g2c_artifact['set_key'])
+        compact_artifact.slot_code = intern_key(slot_keys, slot_key_codes, g2c_artifact['slot_key'])
+        compact_artifact.main_stat_code = intern_key(main_stat_keys, main_stat_key_codes, g2c_artifact['main_stat_key'])
+        compact_artifact.rarity = g2c_artifact['rarity']
+        compact_artifact.level = g2c_artifact['level']
+
+        sub_stats = g2c_artifact['sub_stats']
+        compact_artifact.sub_stat_codes = array('b', [
+            empty_sub_stat_code if sub_stat['key'] is None
+            else intern_key(sub_stat_keys, sub_stat_key_codes, sub_stat['key'])
+            for sub_stat in sub_stats
+        ])
+        compact_artifact.sub_stat_values = array('d', [sub_stat['value'] for sub_stat in sub_stats])
+        compact_artifact.sub_stat_int_mask = sum(
+            1 << index for index, sub_stat in enumerate(sub_stats) if isinstance(sub_stat['value'], int)
+        )
+        compact_artifact.sub_stat_efficiency = None
+        if sub_stats and all('efficiency' in sub_stat for sub_stat in sub_stats):
+            compact_artifact.sub_stat_efficiency = array('d', [sub_stat['efficiency'] for sub_stat in sub_stats])
+        compact_artifact.sub_stat_rolls = None
+        compact_artifact.sub_stat_roll_tiers = None
+        if sub_stats and all('rolls' in sub_stat for sub_stat in sub_stats):
+            compact_artifact.sub_stat_rolls = tuple(sub_stat['rolls'] for sub_stat in sub_stats)
+            compact_artifact.sub_stat_roll_tiers = tuple(sub_stat['roll_tiers'] for sub_stat in sub_stats)
+
+        compact_artifact.best_score = g2c_artifact['best_score']
+        compact_artifact.best_build = g2c_artifact['best_build']
+        compact_artifact.build_score = tuple(
+            (build_score['character'], build_score['name'], build_score['score'])
+            for build_score in g2c_artifact['build_score']
+        )
+        compact_artifact.lock = g2c_artifact['lock']
+        compact_artifact.location = g2c_artifact['location']
+        compact_artifact.artifact_data = g2c_artifact['artifact_data']
+        compact_artifact.extra_fields = tuple(
+            (key, value) for key, value in g2c_artifact.items() if key not in g2c_artifact_keys
+        )
+        return compact_artifact
+
+    @property
+    def set_key(self):
+        return set_keys[self.set_code]
+
+    @property
+    def slot_key(self):
+        return slot_keys[self.slot_code]
+
+    @property
+    def main_stat_key(self):
+        return main_stat_keys[self.main_stat_code]
+
+    @property
+    def rank(self):
+        return math.floor(self.level / 4)
+
+    def to_g2c_artifact(self):
+        """Rebuild G2C artifact structure (same shape and JSON output as generate_g2c_artifact_from_good)
+
+        :return: G2C (Genshin Garbage Collector) artifact structure
+        """
+        sub_stats = []
+        for index, sub_stat_code in enumerate(self.sub_stat_codes):
+            value = self.sub_stat_values[index]
+            sub_stat = {
+                'key': None if sub_stat_code == empty_sub_stat_code else sub_stat_keys[sub_stat_code],
+                'value': int(value) if self.sub_stat_int_mask & (1 << index) else value,
+            }
+            if self.sub_stat_efficiency is not None:
+                # empty sub stats receive an integer efficiency on hydration
+                sub_stat['efficiency'] = 0 if sub_stat['key'] is None else self.sub_stat_efficiency[index]
+            if self.sub_stat_rolls is not None:
+                sub_stat['rolls'] = self.sub_stat_rolls[index]
+                sub_stat['roll_tiers'] = self.sub_stat_roll_tiers[index]
+            sub_stats.append(sub_stat)
+
+        return {
+            'id': self.id,
+            'refer_id': self.refer_id,
+            'set_key': self.set_key,
+            'slot_key': self.slot_key,
+            'main_stat_key': self.main_stat_key,
+            'rarity': self.rarity,
+            'level': self.level,
+            'rank': self.rank,
+            'sub_stats': sub_stats,
+            'best_score': self.best_score,
+            'best_build': self.best_build,
+            'build_score': [
+                {'character': character, 'name': name, 'score': score}
+                for character, name, score in self.build_score
+            ],
+            'lock': self.lock,
+            'location': self.location,
+            'artifact_data': self.artifact_data,
+            **dict(self.extra_fields),
+        }
+
+
+def intern_key(key_table, key_codes, key):
+    """Return integer code of key, appending unknown keys to the table
+
+    :param key_table: list of known keys (the position is the code)
+    :param key_codes: dict {key: code} for the same table
+    :param key: key to intern
+    :return: integer code
+    """
+    if key not in key_codes:
+        with intern_lock:
+            # another thread may have interned the key while waiting for the lock
+            if key not in key_codes:
+                # the key is in the table before its code is visible
+                key_table.append(key)
+                key_codes[key] = len(key_table) - 1
+    return key_codes[key]
+
+
+def pack_artifact_list(g2c_artifact_list):
+    """Convert G2C artifact list to compact artifact list
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
+    :return: compact artifact list
+    """
+    return [CompactArtifact.from_g2c_artifact(g2c_artifact) for g2c_artifact in g2c_artifact_list]
+
+
+def unpack_artifact_list(compact_artifact_list):
+    """Convert compact artifact list back to G2C artifact list
+
+    :param compact_artifact_list: compact artifact list
+    :return: G2C (Genshin Garbage Collector) artifact list
+    """
+    return [compact_artifact.to_g2c_artifact() for compact_artifact in compact_artifact_list]
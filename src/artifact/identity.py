@@ -0,0 +1,35 @@
+import hashlib
+import json
+import uuid
+
+artifact_id_namespace = uuid.uuid5(uuid.NAMESPACE_URL, 'https://github.com/drigos/genshin-garbage-collector')
+
+
+def calculate_artifact_hash(good_artifact):
+    """Return content hash of GOOD artifact (location, lock and id are ignored)
+
+    :param good_artifact: GOOD (Genshin Open Object Description) artifact structure
+    :return: hex digest
+    """
+    content = [
+        good_artifact['setKey'],
+        good_artifact['slotKey'],
+        good_artifact['mainStatKey'],
+        good_artifact['rarity'],
+        good_artifact['level'],
+        [[sub_stat['key'], sub_stat['value']] for sub_stat in good_artifact['substats']],
+    ]
+    return hashlib.sha1(json.dumps(content).encode()).hexdigest()
+
+
+def generate_artifact_id(good_artifact, refer_id):
+    """Return deterministic artifact identifier
+
+    The same artifact (GOOD id or index plus content) always gets the same identifier, so repeated runs
+    over the same input produce the same output.
+
+    :param good_artifact: GOOD (Genshin Open Object Description) artifact structure
+    :param refer_id: GOOD id or artifact index
+    :return: UUID string
+    """
+    return str(uuid.uuid5(artifact_id_namespace, f'{refer_id}:{calculate_artifact_hash(good_artifact)}'))
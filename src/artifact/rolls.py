@@ -0,0 +1,106 @@
+import functools
+import itertools
+
+import src.artifact.validation as validation
+
+# value of each roll tier in tenths of the maximum roll value (artifact-max-stats.json)
+roll_tiers = (10, 9, 8, 7)
+# 1 initial roll and 5 upgrades (5 stars)
+max_sub_stat_rolls = 6
+
+# roll table entry of values that can't be rolled (see get_roll_table)
+unreachable_value = ((), dict())
+
+
+@functools.lru_cache(maxsize=None)
+def get_tier_combinations(rolls):
+    """Return tier combinations of each tier sum after the rolls (built from the combinations of one roll less)
+
+    :param rolls: amount of rolls
+    :return: dict {tier sum: tuple of tier combinations (tiers in decreasing order)}
+    """
+    if rolls == 0:
+        return {0: ((),)}
+
+    tier_combinations = dict()
+    for tier_sum, combinations in get_tier_combinations(rolls - 1).items():
+        for combination in combinations:
+            # tiers are added in decreasing order, so each combination is built once
+            for tier in roll_tiers:
+                if combination and tier > combination[-1]:
+                    continue
+                tier_combinations.setdefault(tier_sum + tier, []).append(combination + (tier,))
+
+    return {tier_sum: tuple(combinations) for tier_sum, combinations in sorted(tier_combinations.items())}
+
+
+def get_displayed_values(sub_stat_key, value):
+    """Return how a sub stat value may be displayed (GOOD files have values rounded to 1 decimal place, flat stats
+    from scanners are rounded to integers)
+
+    :param sub_stat_key: sub stat key
+    :param value: exact sub stat value
+    :return: set of displayed values
+    """
+    # values at a rounding boundary may be displayed both ways depending on float errors
+    displayed_values = {round(value + error, 1) for error in (-1e-6, 1e-6)}
+    if not sub_stat_key.endswith('_'):
+        displayed_values.update(round(value + error) for error in (-1e-6, 1e-6))
+    return displayed_values
+
+
+@functools.lru_cache(maxsize=None)
+def get_roll_table(sub_stat_key, max_roll_value):
+    """Return roll decompositions of every displayed value reachable by the sub stat (memoized per sub stat and maximum
+    roll value, i.e. per sub stat and rarity)
+
+    Roll table format (critDMG_, 5 stars):
+    {21.8: ((3, 4), {3: ((10, 9, 9), (10, 10, 8)), 4: ((7, 7, 7, 7),)}), ...}
+
+    :param sub_stat_key: sub stat key
+    :param max_roll_value: maximum roll value of the artifact rarity (artifact-max-stats.json)
+    :return: dict {displayed value: (possible amounts of rolls, {amount of rolls: tier combinations})}
+    """
+    roll_table = dict()
+    for rolls in range(1, max_sub_stat_rolls + 1):
+        for tier_sum, combinations in get_tier_combinations(rolls).items():
+            for displayed_value in get_displayed_values(sub_stat_key, max_roll_value * tier_sum / 10):
+                roll_table.setdefault(displayed_value, dict()).setdefault(rolls, []).extend(combinations)
+
+    return {
+        displayed_value: (tuple(decomposition), {rolls: tuple(combinations) for rolls, combinations in decomposition.items()})
+        for displayed_value, decomposition in roll_table.items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_roll_amounts(candidate_rolls, rarity, rank):
+    """Return amount of rolls of each sub stat consistent with the amount of rolls of the artifact
+
+    An artifact starts with rarity - 2 or rarity - 1 sub stats (1 roll each) and each upgrade (rank) adds 1 roll.
+
+    :param candidate_rolls: tuple (per sub stat) of tuples of possible amounts of rolls (see get_roll_table)
+    :param rarity: artifact rarity
+    :param rank: amount of upgrades
+    :return: tuple (amount of rolls of each sub stat or None when ambiguous, initial sub stats or None when ambiguous)
+    """
+    initial_sub_stats_list = [
+        initial_sub_stats
+        for initial_sub_stats in range(validation.count_initial_sub_stats(rarity), rarity)
+        if min(initial_sub_stats + rank, 4) == len(candidate_rolls)
+    ]
+
+    solutions = [
+        (roll_amounts, initial_sub_stats)
+        for initial_sub_stats in initial_sub_stats_list
+        for roll_amounts in itertools.product(*candidate_rolls)
+        if sum(roll_amounts) == initial_sub_stats + rank
+    ]
+    if not solutions:
+        return (None,) * len(candidate_rolls), None
+
+    roll_amounts = tuple(
+        amounts[0] if len(set(amounts)) == 1 else None for amounts in zip(*[roll_amounts for roll_amounts, _ in solutions])
+    )
+    initial_sub_stats = {initial_sub_stats for _, initial_sub_stats in solutions}
+    return roll_amounts, initial_sub_stats.pop() if len(initial_sub_stats) == 1 else None
@@ -0,0 +1,125 @@
+import math
+
+import src.database.artifacts as artifact_database
+
+# rules evaluated for each artifact, in registration order (see validation_rule)
+validation_rules = []
+
+known_set_keys = frozenset(artifact_database.set_key_order)
+set_max_rarity = {
+    **{set_key: 3 for set_key in artifact_database.rarity_three},
+    **{set_key: 4 for set_key in artifact_database.rarity_four},
+    **{set_key: 5 for set_key in artifact_database.rarity_five},
+}
+
+# displayed sub stat values are rounded (flat stats to integers), so a sub stat may slightly exceed its maximum rolls
+sub_stat_value_tolerance = 0.5
+
+
+class InvalidArtifactError(ValueError):
+    """Raised in strict mode when GOOD artifacts fail validation rules"""
+
+    def __init__(self, invalid_artifact_list):
+        self.invalid_artifact_list = invalid_artifact_list
+        details = ', '.join(
+            f"{refer_id} ({', '.join(rule_names)})" for refer_id, rule_names in invalid_artifact_list[:10]
+        )
+        more = f' and {len(invalid_artifact_list) - 10} more' if len(invalid_artifact_list) > 10 else ''
+        super().__init__(f'{len(invalid_artifact_list)} invalid artifacts: {details}{more}')
+
+    def __reduce__(self):
+        # rebuilt from the invalid artifact list (not from the message), so it can be sent back by batch.py workers
+        return type(self), (self.invalid_artifact_list,)
+
+
+def validation_rule(message):
+    """Register function as validation rule
+
+    The rule receives the GOOD artifact and the artifact stats constants, and returns True when the artifact is invalid.
+
+    :param message: rule description
+    :return: decorator
+    """
+    def register(check):
+        validation_rules.append({'name': check.__name__, 'message': message, 'check': check})
+        return check
+    return register
+
+
+def count_initial_sub_stats(rarity):
+    """Return minimum amount of sub stats of a new artifact (5 stars: 3, 4 stars: 2, 3 stars: 1)
+
+    :param rarity: artifact rarity
+    :return: amount of sub stats
+    """
+    return max(rarity - 2, 0)
+
+
+def get_sub_stat_keys(good_artifact):
+    return [sub_stat['key'] for sub_stat in good_artifact['substats']]
+
+
+@validation_rule('Check for null on the initial sub stats (first three for 5 stars)')
+def check_null_initial_sub_stats(good_artifact, artifact_stats_constants):
+    initial_sub_stats = count_initial_sub_stats(good_artifact['rarity'])
+    sub_stat_keys = get_sub_stat_keys(good_artifact)
+    return len(sub_stat_keys) < initial_sub_stats or None in sub_stat_keys[:initial_sub_stats]
+
+
+@validation_rule('Check for null on sub stats added by upgrades (forth for 5 stars)')
+def check_null_upgraded_sub_stats(good_artifact, artifact_stats_constants):
+    rank = math.floor(good_artifact['level'] / 4)
+    if rank <= 1:
+        return False
+
+    initial_sub_stats = count_initial_sub_stats(good_artifact['rarity'])
+    upgraded_sub_stats = min(initial_sub_stats + rank - 1, 4)
+    sub_stat_keys = get_sub_stat_keys(good_artifact)
+    return len(sub_stat_keys) < upgraded_sub_stats or None in sub_stat_keys[initial_sub_stats:upgraded_sub_stats]
+
+
+@validation_rule('Check max rarity for artifact sets')
+def check_max_rarity(good_artifact, artifact_stats_constants):
+    return good_artifact['rarity'] > set_max_rarity.get(good_artifact['setKey'], 5)
+
+
+@validation_rule('Check invalid artifact sets')
+def check_invalid_set(good_artifact, artifact_stats_constants):
+    return good_artifact['setKey'] not in known_set_keys
+
+
+@validation_rule('Check sub stat values against maximum rolls')
+def check_sub_stat_values(good_artifact, artifact_stats_constants):
+    rarity = str(good_artifact['rarity'])
+    max_rolls = math.floor(good_artifact['level'] / 4) + 1
+    for sub_stat in good_artifact['substats']:
+        if sub_stat['key'] is None:
+            continue
+        max_roll_value = artifact_stats_constants.get(sub_stat['key'], {}).get(rarity)
+        if max_roll_value is None or not 0 < sub_stat['value'] <= max_roll_value * max_rolls + sub_stat_value_tolerance:
+            return True
+    return False
+
+
+def validate_good_artifact(good_artifact, artifact_stats_constants):
+    """Return names of the rules failed by the artifact
+
+    :param good_artifact: GOOD (Genshin Open Object Description) artifact structure
+    :param artifact_stats_constants: dict {sub_stat_key: {rarity: max_roll_value}}
+    :return: list of rule names (empty when valid)
+    """
+    return [rule['name'] for rule in validation_rules if rule['check'](good_artifact, artifact_stats_constants)]
+
+
+def validate_good_artifacts(good_artifact_list, artifact_stats_constants):
+    """Evaluate every rule over the artifact list in a single pass
+
+    :param good_artifact_list: GOOD (Genshin Open Object Description) artifact list
+    :param artifact_stats_constants: dict {sub_stat_key: {rarity: max_roll_value}}
+    :return: dict {rule name: list of invalid GOOD artifacts} (every registered rule, in registration order)
+    """
+    invalid_artifacts = {rule['name']: [] for rule in validation_rules}
+    for good_artifact in good_artifact_list:
+        for rule_name in validate_good_artifact(good_artifact, artifact_stats_constants):
+            invalid_artifacts[rule_name].append(good_artifact)
+    return invalid_artifacts
@@ -0,0 +1,188 @@
+import json
+import os
+import time
+import tracemalloc
+
+from collections import defaultdict
+
+import src.scoring.build_index as build_index
+
+
+class StageProfiler:
+    """Record wall time, CPU time, peak memory and item counts of pipeline stages"""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stages = []
+        self.build_costs = []
+        self.equivalent_builds = []
+        self.started_at = time.perf_counter()
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def measure(self, name, function, *args, **kwargs):
+        """Call function recording it as a stage
+
+        The first argument is counted as the items in (when it has a length) and the result as the items out.
+
+        :param name: stage name
+        :param function: stage function
+        :return: function result
+        """
+        if self.memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        result = function(*args, **kwargs)
+        wall_end = time.perf_counter()
+
+        stage = {
+            'name': name,
+            'start_seconds': wall_start - self.started_at,
+            'wall_seconds': wall_end - wall_start,
+            'cpu_seconds': time.process_time() - cpu_start,
+            'items_in': count_items(args[0]) if args else None,
+            'items_out': count_items(result),
+        }
+        if self.memory:
+            stage['peak_bytes'] = tracemalloc.get_traced_memory()[1] - memory_before
+
+        self.stages.append(stage)
+        return result
+
+    @staticmethod
+    def create_build_costs():
+        """Return dict filled by the python scoring stage with the cost of each score class
+
+        :return: defaultdict {score class: [amount of scored artifacts, wall seconds]}
+        """
+        return defaultdict(lambda: [0, 0.0])
+
+    def record_build_costs(self, build_costs, build_list):
+        """Record the scoring cost of each score class and the builds sharing a score class
+
+        Builds sharing a score class are scored once per artifact, so they are recorded together.
+
+        :param build_costs: costs measured by the scoring stage (None when the engine doesn't measure them)
+        :param build_list: compiled build list
+        """
+        if build_costs is not None:
+            class_builds = defaultdict(list)
+            for build in build_list:
+                class_builds[build['score_class']].append(f"{build['character']} - {build['name']}")
+            self.build_costs = [
+                {'builds': class_builds[score_class], 'artifacts': artifacts, 'wall_seconds': wall_seconds}
+                for score_class, (artifacts, wall_seconds) in build_costs.items()
+            ]
+
+        self.equivalent_builds = build_index.find_equivalent_builds(build_list)
+
+    def format_table(self, build_amount=10):
+        """Return stages (and the most expensive score classes) as a text table
+
+        :param build_amount: amount of score classes shown
+        :return: table string
+        """
+        memory_header = f" {'peak MiB':>9}" if self.memory else ''
+        lines = [f"{'stage':<28} {'wall ms':>10} {'cpu ms':>10} {'in':>8} {'out':>8}{memory_header}"]
+        for stage in self.stages:
+            memory_column = f" {stage['peak_bytes'] / 2 ** 20:>9.2f}" if self.memory else ''
+            lines.append(
+                f"{stage['name']:<28} {stage['wall_seconds'] * 1000:>10.2f} {stage['cpu_seconds'] * 1000:>10.2f} "
+                f"{format_count(stage['items_in']):>8} {format_count(stage['items_out']):>8}{memory_column}"
+            )
+        lines.append(f"{'total':<28} {sum(stage['wall_seconds'] for stage in self.stages) * 1000:>10.2f}")
+
+        if self.build_costs:
+            lines.append('')
+            lines.append(f"{'builds':<50} {'artifacts':>10} {'wall ms':>10}")
+            build_costs = sorted(self.build_costs, key=lambda build_cost: build_cost['wall_seconds'], reverse=True)
+            for build_cost in build_costs[:build_amount]:
+                build_names = ', '.join(build_cost['builds'])
+                lines.append(
+                    f"{build_names[:50]:<50} {build_cost['artifacts']:>10} {build_cost['wall_seconds'] * 1000:>10.2f}"
+                )
+
+        if self.equivalent_builds:
+            lines.append('')
+            lines.append('builds sharing scores (redundant builds also match the same artifacts)')
+            lines.extend(build_index.format_equivalent_builds(self.equivalent_builds))
+
+        return '\n'.join(lines)
+
+    def to_json(self):
+        """Return stages, build costs and equivalent builds as JSON
+
+        :return: JSON string
+        """
+        return json.dumps(
+            {'stages': self.stages, 'builds': self.build_costs, 'equivalent_builds': self.equivalent_builds}, indent=2
+        )
+
+    def to_chrome_trace(self):
+        """Return stages in Chrome trace event format (chrome://tracing, Perfetto)
+
+        :return: JSON string
+        """
+        trace_events = [
+            {
+                'name': stage['name'],
+                'ph': 'X',
+                'ts': stage['start_seconds'] * 1e6,
+                'dur': stage['wall_seconds'] * 1e6,
+                'pid': os.getpid(),
+                'tid': 0,
+                'args': {key: value for key, value in stage.items() if key not in ('name', 'start_seconds')}
+            }
+            for stage in self.stages
+        ]
+        return json.dumps({'traceEvents': trace_events, 'displayTimeUnit': 'ms'})
+
+    def report(self, report_format='table'):
+        """Return report in the given format
+
+        :param report_format: table, json or chrome
+        :return: report string
+        """
+        report_functions = {'table': self.format_table, 'json': self.to_json, 'chrome': self.to_chrome_trace}
+        return report_functions[report_format]()
+
+
+class NullProfiler:
+    """Profiler used when profiling is disabled (only calls the stage functions)"""
+
+    @staticmethod
+    def measure(name, function, *args, **kwargs):
+        return function(*args, **kwargs)
+
+    @staticmethod
+    def create_build_costs():
+        return None
+
+    @staticmethod
+    def record_build_costs(build_costs, build_list):
+        pass
+
+
+def count_items(value):
+    """Return amount of items of a collection (None for other values, e.g. JSON strings)
+
+    :param value: stage argument or result
+    :return: item count
+    """
+    return len(value) if isinstance(value, (list, tuple, dict, set)) else None
+
+
+def format_count(count):
+    """Return item count or empty string when unknown
+
+    :param count: item count
+    :return: count string
+    """
+    return '' if count is None else str(count)
+
+
+null_profiler = NullProfiler()
@@ -0,0 +1,224 @@
+import json
+import math
+import mmap
+import struct
+
+from array import array
+from collections import Counter
+
+import src.database.artifacts as artifact_database
+
+columnar_magic = b'G2CC'
+columnar_version = 1
+
+# file layout: magic, version (uint32), header size (uint32), JSON header, then 8-byte aligned columns
+columnar_prefix = struct.Struct('<4sII')
+column_alignment = 8
+
+# code stored in dictionary-encoded columns for missing values (e.g. best_build of discarded artifacts)
+missing_code = 0xFFFF
+
+numeric_columns = {'rarity': 'B', 'level': 'B', 'rank': 'B', 'lock': 'B', 'best_score': 'd'}
+dictionary_columns = ['set_key', 'slot_key', 'main_stat_key', 'best_build']
+
+
+def encode_artifacts(g2c_artifact_list, build_list):
+    """Encode G2C artifacts as a columnar binary file
+
+    Columns:
+    - rarity, level, rank, lock: uint8
+    - best_score: float64
+    - set_key, slot_key, main_stat_key, best_build: uint16 codes into the header dictionaries
+    - refer_id: int64 (or uint32 codes into a dictionary when ids aren't integers)
+    - build_scores: float64 matrix stored build by build (NaN when the artifact doesn't match the build)
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
+    :param build_list: compiled build list
+    :return: columnar file content
+    """
+    build_names = [f"{build['character']} - {build['name']}" for build in build_list]
+    build_positions = {build_name: position for position, build_name in enumerate(build_names)}
+
+    dictionaries = {
+        'set_key': artifact_database.set_key_order + sorted(
+            {g2c_artifact['set_key'] for g2c_artifact in g2c_artifact_list} - set(artifact_database.set_key_order)
+        ),
+        'slot_key': artifact_database.slot_key_order,
+        'main_stat_key': sorted({g2c_artifact['main_stat_key'] for g2c_artifact in g2c_artifact_list}),
+        'best_build': build_names,
+    }
+
+    columns = dict()
+    for column_name, type_code in numeric_columns.items():
+        columns[column_name] = array(type_code, [g2c_artifact[column_name] or 0 for g2c_artifact in g2c_artifact_list])
+
+    for column_name in dictionary_columns:
+        codes = {value: code for code, value in enumerate(dictionaries[column_name])}
+        columns[column_name] = array(
+            'H', [codes.get(g2c_artifact[column_name], missing_code) for g2c_artifact in g2c_artifact_list]
+        )
+
+    refer_ids = [g2c_artifact['refer_id'] for g2c_artifact in g2c_artifact_list]
+    if all(isinstance(refer_id, int) for refer_id in refer_ids):
+        columns['refer_id'] = array('q', refer_ids)
+    else:
+        dictionaries['refer_id'] = sorted({str(refer_id) for refer_id in refer_ids})
+        codes = {value: code for code, value in enumerate(dictionaries['refer_id'])}
+        columns['refer_id'] = array('I', [codes[str(refer_id)] for refer_id in refer_ids])
+
+    build_scores = array('d', [math.nan]) * (len(build_names) * len(g2c_artifact_list))
+    for artifact_position, g2c_artifact in enumerate(g2c_artifact_list):
+        for build_score in g2c_artifact['build_score']:
+            build_position = build_positions[f"{build_score['character']} - {build_score['name']}"]
+            build_scores[build_position * len(g2c_artifact_list) + artifact_position] = build_score['score']
+    columns['build_scores'] = build_scores
+
+    header = {
+        'artifacts': len(g2c_artifact_list),
+        'builds': build_names,
+        'dictionaries': dictionaries,
+        'columns': dict(),
+    }
+
+    # column offsets depend on the header size, so the header is encoded until its size is stable
+    header_size = 0
+    while True:
+        offset = align(columnar_prefix.size + header_size)
+        for column_name, column in columns.items():
+            header['columns'][column_name] = {'type': column.typecode, 'offset': offset, 'size': column.itemsize * len(column)}
+            offset = align(offset + column.itemsize * len(column))
+
+        header_content = json.dumps(header).encode()
+        if len(header_content) == header_size:
+            break
+        header_size = len(header_content)
+
+    content = bytearray(columnar_prefix.pack(columnar_magic, columnar_version, header_size) + header_content)
+    for column_name, column in columns.items():
+        content.extend(bytes(header['columns'][column_name]['offset'] - len(content)))
+        content.extend(column.tobytes())
+
+    return bytes(content)
+
+
+def align(offset):
+    """Return next offset aligned to the column alignment
+
+    :param offset: offset in bytes
+    :return: aligned offset
+    """
+    return -(-offset // column_alignment) * column_alignment
+
+
+class ColumnarReader:
+    """Memory-mapped reader for columnar G2C files
+
+    Columns are memoryview objects over the mapped file (no copy and no JSON parsing of the artifacts).
+    """
+
+    def __init__(self, file_name):
+        with open(file_name, 'rb') as columnar_file:
+            self.mapped_file = mmap.mmap(columnar_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_size = columnar_prefix.unpack_from(self.mapped_file)
+        if magic != columnar_magic or version != columnar_version:
+            raise ValueError(f'Invalid columnar G2C file: {file_name}')
+
+        self.header = json.loads(self.mapped_file[columnar_prefix.size:columnar_prefix.size + header_size])
+        self.builds = self.header['builds']
+        self.dictionaries = self.header['dictionaries']
+
+    def __len__(self):
+        return self.header['artifacts']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.mapped_file.close()
+
+    def column(self, column_name):
+        """Return column values (codes for dictionary-encoded columns)
+
+        :param column_name: column name
+        :return: memoryview over the mapped file
+        """
+        column = self.header['columns'][column_name]
+        return memoryview(self.mapped_file)[column['offset']:column['offset'] + column['size']].cast(column['type'])
+
+    def values(self, column_name):
+        """Return decoded column values
+
+        :param column_name: column name
+        :return: list of values (None for missing values)
+        """
+        return [self.decode(column_name, value) for value in self.column(column_name)]
+
+    def decode(self, column_name, value):
+        """Decode value of a dictionary-encoded column (other values are returned as is)
+
+        :param column_name: column name
+        :param value: column value
+        :return: decoded value
+        """
+        dictionary = self.dictionaries.get(column_name)
+        if dictionary is None:
+            return value
+        if column_name in dictionary_columns and value == missing_code:
+            return None
+        return dictionary[value]
+
+    def build_scores(self, build_name):
+        """Return scores of every artifact for a build (NaN when the artifact doesn't match the build)
+
+        :param build_name: 'character - name'
+        :return: memoryview over the mapped file
+        """
+        build_position = self.builds.index(build_name)
+        return self.column('build_scores')[build_position * len(self):(build_position + 1) * len(self)]
+
+    def count_by(self, column_name):
+        """Count artifacts by column value
+
+        :param column_name: column name
+        :return: Counter {value: amount}
+        """
+        counter = Counter(self.column(column_name))
+        return Counter({self.decode(column_name, value): amount for value, amount in counter.items()})
+
+    def count_builds(self):
+        """Count artifacts matching each build
+
+        Builds are in the order they first appear when reading the build scores artifact by artifact.
+
+        :return: dict {build name: amount} (only builds matching some artifact)
+        """
+        build_counts = []
+        for build_position, build_name in enumerate(self.builds):
+            build_scores = self.build_scores(build_name)
+            matched_positions = [position for position, score in enumerate(build_scores) if score == score]  # NaN != NaN
+            if matched_positions:
+                build_counts.append(((matched_positions[0], build_position), build_name, len(matched_positions)))
+
+        return {build_name: amount for _, build_name, amount in sorted(build_counts)}
+
+    def row(self, index):
+        """Return artifact at index as dict
+
+        :param index: artifact position
+        :return: dict with decoded values of every column and the build scores
+        """
+        artifact = {
+            column_name: self.decode(column_name, self.column(column_name)[index])
+            for column_name in self.header['columns'] if column_name != 'build_scores'
+        }
+        artifact['lock'] = bool(artifact['lock'])
+
+        build_scores = self.column('build_scores')[index::len(self)]
+        artifact['build_score'] = {
+            build_name: score for build_name, score in zip(self.builds, build_scores) if score == score  # NaN != NaN
+        }
+        return artifact
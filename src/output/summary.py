@@ -0,0 +1,109 @@
+from collections import Counter, defaultdict
+
+# artifact keys used to group best scores (build scores are grouped by build)
+summary_keys = ['set_key', 'slot_key', 'rank', 'best_build']
+summary_percentiles = (50, 90, 99)
+histogram_bin_width = 10  # in hundredths of score
+
+
+class ArtifactSummary:
+    """Counts, score histograms and percentiles of artifacts per build, set, slot, rank and best build
+
+    Scores have two decimal places, so each group keeps a counter of scores in hundredths: artifacts are added one by one
+    (e.g. in stream mode) and memory doesn't grow with the amount of artifacts.
+    """
+
+    def __init__(self):
+        self.artifacts = 0
+        self.kept = 0
+        self.groups = {
+            group_key: defaultdict(lambda: {'kept': 0, 'scores': Counter()})
+            for group_key in ['build'] + summary_keys
+        }
+
+    def add(self, g2c_artifact):
+        """Add artifact to the summary
+
+        :param g2c_artifact: G2C (Genshin Garbage Collector) artifact with build scores and lock state
+        """
+        self.artifacts += 1
+        self.kept += g2c_artifact['lock']
+
+        best_score = round(g2c_artifact['best_score'] * 100)
+        for group_key in summary_keys:
+            group = self.groups[group_key][g2c_artifact[group_key]]
+            group['kept'] += g2c_artifact['lock']
+            group['scores'][best_score] += 1
+
+        for build_score in g2c_artifact['build_score']:
+            group = self.groups['build'][f"{build_score['character']} - {build_score['name']}"]
+            group['kept'] += g2c_artifact['lock']
+            group['scores'][round(build_score['score'] * 100)] += 1
+
+    def add_all(self, g2c_artifact_list):
+        """Add every artifact of the list to the summary
+
+        :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
+        :return: self
+        """
+        for g2c_artifact in g2c_artifact_list:
+            self.add(g2c_artifact)
+        return self
+
+    def to_dict(self):
+        """Return summary (groups with most artifacts first)
+
+        Summary format:
+        {'artifacts': 919, 'kept': 919, 'set_key': {'WanderersTroupe': {'count': 40, 'kept': 40, 'min': 0.12, 'max': 0.91,
+         'mean': 0.48, 'p50': 0.47, 'p90': 0.8, 'p99': 0.91, 'histogram': {'0.1': 2, '0.2': 5, ...}}}, ...}
+
+        :return: dict
+        """
+        summary = {'artifacts': self.artifacts, 'kept': self.kept}
+        for group_key, groups in self.groups.items():
+            group_summaries = {group_value: summarize_scores(group) for group_value, group in groups.items()}
+            summary[group_key] = dict(sorted(group_summaries.items(), key=lambda item: item[1]['count'], reverse=True))
+        return summary
+
+
+def summarize_scores(group):
+    """Return count, minimum, maximum, mean, percentiles and histogram of a group
+
+    Percentiles are the nearest rank (the score of the artifact at count * percentile / 100).
+
+    :param group: dict with kept amount and score counter (in hundredths)
+    :return: dict
+    """
+    scores = sorted(group['scores'].items())
+    count = sum(group['scores'].values())
+
+    group_summary = {
+        'count': count,
+        'kept': group['kept'],
+        'min': scores[0][0] / 100,
+        'max': scores[-1][0] / 100,
+        'mean': round(sum(score * amount for score, amount in scores) / count / 100, 4),
+    }
+
+    percentile_ranks = [(min(count * percentile // 100, count - 1), percentile) for percentile in summary_percentiles]
+    position = 0
+    for score, amount in scores:
+        while percentile_ranks and percentile_ranks[0][0] < position + amount:
+            group_summary[f'p{percentile_ranks.pop(0)[1]}'] = score / 100
+        position += amount
+
+    histogram = Counter()
+    for score, amount in scores:
+        histogram[score // histogram_bin_width * histogram_bin_width / 100] += amount
+    group_summary['histogram'] = {str(lower_bound): amount for lower_bound, amount in sorted(histogram.items())}
+
+    return group_summary
+
+
+def summarize_artifacts(g2c_artifact_list):
+    """Return summary of the artifact list (see ArtifactSummary.to_dict)
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with build scores and lock state
+    :return: dict
+    """
+    return ArtifactSummary().add_all(g2c_artifact_list).to_dict()
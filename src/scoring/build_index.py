@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from collections import defaultdict
+
+import src.database.artifacts as artifact_database
+import src.database.stats as stat_database
+
+build_index_version = 3
+
+slot_main_stats = {
+    'flower': stat_database.flower_main_stats,
+    'plume': stat_database.plume_main_stats,
+    'sands': stat_database.sands_main_stats,
+    'goblet': stat_database.goblet_main_stats,
+    'circlet': stat_database.circlet_main_stats,
+}
+
+
+def load_build_list(build_file_name_list, cache_file_name=None):
+    """Return compiled build list, using the build index cache when it is still valid
+
+    The cache is invalidated per build file: unchanged mtime and size are trusted, otherwise the content
+    hash is compared and only changed files are compiled again.
+
+    :param build_file_name_list: build file path list
+    :param cache_file_name: build index cache path (None disables the cache)
+    :return: compiled build list (same order as build_file_name_list)
+    """
+    build_index = read_build_index(cache_file_name) if cache_file_name else None
+    cached_entries = build_index['builds'] if build_index else dict()
+
+    entries = dict()
+    changed = build_index is None or set(cached_entries.keys()) != set(build_file_name_list)
+    for build_file_name in build_file_name_list:
+        entry = cached_entries.get(build_file_name)
+        file_stat = os.stat(build_file_name)
+
+        if entry and entry['mtime_ns'] == file_stat.st_mtime_ns and entry['size'] == file_stat.st_size:
+            entries[build_file_name] = entry
+            continue
+
+        with open(build_file_name, 'rb') as build_file:
+            content = build_file.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        if not entry or entry['sha256'] != content_hash:
+            entry = {'sha256': content_hash, 'build': compile_build(json.loads(content))}
+        entries[build_file_name] = {**entry, 'mtime_ns': file_stat.st_mtime_ns, 'size': file_stat.st_size}
+        changed = True
+
+    if cache_file_name and changed:
+        write_build_index(cache_file_name, entries)
+
+    return [entries[build_file_name]['build'] for build_file_name in build_file_name_list]
+
+
+def compile_build(build):
+    """Compile build with filter defaults resolved, weight vector and normalization factor
+
+    The fingerprint only covers what changes the scores (filter and sub stat weights). The score class only covers
+    what changes the score of an artifact matched by the build (see get_score_class).
+
+    :param build: build structure (as in builds/*.json)
+    :return: compiled build (the original keys are preserved)
+    """
+    fingerprint = json.dumps([build['filter'], build['sub_stats']], sort_keys=True)
+    normalization_factor = calculate_normalization_factor(build['sub_stats'].values())
+    return {
+        **build,
+        'set_keys': build['filter'].get('set', artifact_database.set_key_order),
+        'main_stats': {
+            slot_key: build['filter'].get(slot_key, slot_main_stats[slot_key])
+            for slot_key in artifact_database.slot_key_order
+        },
+        'weights': [build['sub_stats'].get(sub_stat_key, 0) for sub_stat_key in stat_database.sub_stats],
+        'normalization_factor': normalization_factor,
+        'fingerprint': hashlib.sha1(fingerprint.encode()).hexdigest(),
+        'score_class': get_score_class(build['sub_stats'], normalization_factor),
+    }
+
+
+def get_score_class(sub_stats, normalization_factor):
+    """Return key shared by builds giving the same score to every artifact
+
+    Scores only depend on the non-zero weights and the normalization factor (zero weights are part of the normalization
+    factor when the build has negative weights, so it's compared too).
+
+    :param sub_stats: sub stat weights
+    :param normalization_factor: build normalization factor
+    :return: hex digest
+    """
+    weights = sorted((sub_stat_key, weight) for sub_stat_key, weight in sub_stats.items() if weight != 0)
+    return hashlib.sha1(json.dumps([weights, normalization_factor]).encode()).hexdigest()
+
+
+def group_builds_by_score_class(build_list):
+    """Group builds by score class (see get_score_class)
+
+    :param build_list: compiled build list
+    :return: tuple (first build of each score class, list of (build, position of its score class))
+    """
+    class_positions = dict()
+    for build in build_list:
+        class_positions.setdefault(build['score_class'], (len(class_positions), build))
+
+    class_builds = [build for _, build in class_positions.values()]
+    return class_builds, [(build, class_positions[build['score_class']][0]) for build in build_list]
+
+
+def find_equivalent_builds(build_list):
+    """Group builds sharing the same score class (scored once per artifact)
+
+    Builds with the same score class and the same filter (sets and main stats, in any order) are redundant:
+    they match the same artifacts with the same scores.
+
+    Equivalent builds format:
+    [{'builds': ['Amber - DPS', 'Amber - Sub DPS'], 'redundant': [['Amber - DPS', 'Amber - Sub DPS']]}]
+
+    :param build_list: compiled build list
+    :return: list of groups with more than one build (build list order)
+    """
+    score_classes = defaultdict(list)
+    for build in build_list:
+        score_classes[build['score_class']].append(build)
+
+    equivalent_builds = []
+    for builds in score_classes.values():
+        if len(builds) == 1:
+            continue
+
+        filters = defaultdict(list)
+        for build in builds:
+            build_filter = (
+                frozenset(build['set_keys']),
+                tuple(frozenset(main_stats) for main_stats in build['main_stats'].values())
+            )
+            filters[build_filter].append(f"{build['character']} - {build['name']}")
+
+        equivalent_builds.append({
+            'builds': [f"{build['character']} - {build['name']}" for build in builds],
+            'redundant': [build_names for build_names in filters.values() if len(build_names) > 1],
+        })
+
+    return equivalent_builds
+
+
+def format_equivalent_builds(equivalent_builds):
+    """Return one line per group of builds sharing scores, with its redundant builds
+
+    :param equivalent_builds: find_equivalent_builds output
+    :return: list of lines
+    """
+    lines = []
+    for equivalent_build_group in equivalent_builds:
+        redundant_builds = ' | '.join(', '.join(build_names) for build_names in equivalent_build_group['redundant'])
+        lines.append(f"{', '.join(equivalent_build_group['builds'])}" + (f' (redundant: {redundant_builds})'
+                                                                          if redundant_builds else ''))
+    return lines
+
+
+def create_inverted_build_index(build_list):
+    """Create inverted index from (set_key, slot_key, main_stat_key) to the builds that accept it
+
+    :param build_list: compiled build list
+    :return: dict {(set_key, slot_key, main_stat_key): [build index]} (build indexes in build list order)
+    """
+    inverted_build_index = defaultdict(list)
+    for build_index, build in enumerate(build_list):
+        for set_key in dict.fromkeys(build['set_keys']):
+            for slot_key, main_stats in build['main_stats'].items():
+                for main_stat_key in dict.fromkeys(main_stats):
+                    inverted_build_index[(set_key, slot_key, main_stat_key)].append(build_index)
+
+    return dict(inverted_build_index)
+
+
+def get_builds_for_artifact(inverted_build_index, g2c_artifact):
+    """Return indexes of builds that accept the artifact
+
+    :param inverted_build_index: inverted build index (see create_inverted_build_index)
+    :param g2c_artifact: G2C (Genshin Garbage Collector) artifact
+    :return: list of build indexes (empty when no build accepts the artifact)
+    """
+    artifact_key = (g2c_artifact['set_key'], g2c_artifact['slot_key'], g2c_artifact['main_stat_key'])
+    return inverted_build_index.get(artifact_key, [])
+
+
+def calculate_normalization_factor(sub_stats):
+    """Calculate the optimal sub stats to find the normalization factor
+
+    :param sub_stats: sub stat list with weight
+    :return: float representing the normalization factor
+    """
+    sorted_sub_status = sorted(sub_stats, reverse=True)[0:4]
+    sorted_sub_status[0] *= 6
+    return sum(sorted_sub_status) / 9
+
+
+def calculate_database_hash():
+    """Return hash of the database values used by compiled builds
+
+    :return: hex digest
+    """
+    database = [artifact_database.set_key_order, artifact_database.slot_key_order, slot_main_stats,
+                stat_database.sub_stats]
+    return hashlib.sha256(json.dumps(database).encode()).hexdigest()
+
+
+def read_build_index(cache_file_name):
+    """Read build index cache, ignoring missing, unreadable or outdated files
+
+    :param cache_file_name: build index cache path
+    :return: build index or None
+    """
+    try:
+        with open(cache_file_name) as cache_file:
+            build_index = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    if build_index.get('version') != build_index_version or build_index.get('database') != calculate_database_hash():
+        return None
+
+    return build_index
+
+
+def write_build_index(cache_file_name, entries):
+    """Write build index cache (failures are ignored, the cache is only an optimization)
+
+    :param cache_file_name: build index cache path
+    :param entries: dict {build file path: entry}
+    """
+    build_index = {'version': build_index_version, 'database': calculate_database_hash(), 'builds': entries}
+    try:
+        cache_directory = os.path.dirname(cache_file_name) or '.'
+        os.makedirs(cache_directory, exist_ok=True)
+        # unique temporary file in the cache directory, so concurrent runs never write to the same file
+        cache_file = tempfile.NamedTemporaryFile(
+            'w', dir=cache_directory, prefix=f'{os.path.basename(cache_file_name)}.', suffix='.tmp', delete=False
+        )
+        try:
+            with cache_file:
+                json.dump(build_index, cache_file)
+            os.replace(cache_file.name, cache_file_name)
+        except BaseException:
+            os.remove(cache_file.name)
+            raise
+    except OSError:
+        pass
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from src.artifact.identity import calculate_artifact_hash
+
+result_cache_version = 2
+
+flipped_artifact_keys = ['refer_id', 'set_key', 'slot_key', 'main_stat_key', 'rarity', 'level', 'best_score',
+                         'best_build']
+
+
+def read_result_cache(cache_file_name, artifact_stats_file_name):
+    """Read result cache, starting an empty one when missing or outdated
+
+    Cached scores depend on the sub stat efficiency, so any change in the artifact stats constants
+    invalidates the whole cache. Build changes are handled by the build fingerprint of each score.
+
+    Scores are kept by artifact content (see calculate_artifact_hash) and keep/discard status by artifact id, as
+    artifacts with the same content may be kept and discarded in the same run.
+
+    :param cache_file_name: result cache path
+    :param artifact_stats_file_name: artifact stats constants path (artifact-max-stats.json)
+    :return: result cache
+    """
+    with open(artifact_stats_file_name, 'rb') as artifact_stats_file:
+        artifact_stats_hash = hashlib.sha256(artifact_stats_file.read()).hexdigest()
+
+    empty_result_cache = {
+        'version': result_cache_version, 'artifact_stats': artifact_stats_hash, 'artifacts': {}, 'locks': {}
+    }
+    try:
+        with open(cache_file_name) as cache_file:
+            result_cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return empty_result_cache
+
+    if result_cache.get('version') != result_cache_version or result_cache.get('artifact_stats') != artifact_stats_hash:
+        return empty_result_cache
+
+    return result_cache
+
+
+def get_cached_scores(result_cache, g2c_artifact):
+    """Return cached scores of the artifact (changes in the returned dict are stored in the cache)
+
+    :param result_cache: result cache
+    :param g2c_artifact: G2C (Genshin Garbage Collector) artifact
+    :return: dict {build fingerprint: score}
+    """
+    artifact_hash = calculate_artifact_hash(g2c_artifact['artifact_data'])
+    return result_cache['artifacts'].setdefault(artifact_hash, {'scores': {}})['scores']
+
+
+def update_result_cache(result_cache, g2c_artifact_list_to_keep, g2c_artifact_list_to_discard, build_list):
+    """Store keep/discard status and drop artifacts and builds that are no longer used
+
+    :param result_cache: result cache
+    :param g2c_artifact_list_to_keep: G2C (Genshin Garbage Collector) artifact list to keep
+    :param g2c_artifact_list_to_discard: G2C (Genshin Garbage Collector) artifact list to discard
+    :param build_list: compiled build list
+    :return: summary of artifacts whose keep/discard status flipped since the last run
+    """
+    build_fingerprints = {build['fingerprint'] for build in build_list}
+
+    cached_artifacts = dict()
+    cached_locks = dict()
+    flipped_artifact_list = []
+    for lock, g2c_artifact_list in ((True, g2c_artifact_list_to_keep), (False, g2c_artifact_list_to_discard)):
+        for g2c_artifact in g2c_artifact_list:
+            previous_lock = result_cache['locks'].get(g2c_artifact['id'])
+            if previous_lock is not None and previous_lock != lock:
+                flipped_artifact_list.append({
+                    **{key: g2c_artifact[key] for key in flipped_artifact_keys},
+                    'previous_lock': previous_lock,
+                    'lock': lock
+                })
+            cached_locks[g2c_artifact['id']] = lock
+
+            artifact_hash = calculate_artifact_hash(g2c_artifact['artifact_data'])
+            if artifact_hash not in cached_artifacts:
+                cached_scores = result_cache['artifacts'].get(artifact_hash, {'scores': {}})['scores']
+                cached_artifacts[artifact_hash] = {'scores': {
+                    fingerprint: score for fingerprint, score in cached_scores.items() if fingerprint in build_fingerprints
+                }}
+
+    result_cache['artifacts'] = cached_artifacts
+    result_cache['locks'] = cached_locks
+    return flipped_artifact_list
+
+
+def write_result_cache(cache_file_name, result_cache):
+    """Write result cache
+
+    :param cache_file_name: result cache path
+    :param result_cache: result cache
+    """
+    cache_directory = os.path.dirname(cache_file_name) or '.'
+    os.makedirs(cache_directory, exist_ok=True)
+    # unique temporary file in the cache directory, so concurrent runs never write to the same file
+    cache_file = tempfile.NamedTemporaryFile(
+        'w', dir=cache_directory, prefix=f'{os.path.basename(cache_file_name)}.', suffix='.tmp', delete=False
+    )
+    try:
+        with cache_file:
+            json.dump(result_cache, cache_file)
+        os.replace(cache_file.name, cache_file_name)
+    except BaseException:
+        os.remove(cache_file.name)
+        raise
@@ -0,0 +1,137 @@
+import heapq
+import itertools
+
+from collections import defaultdict
+
+import src.database.artifacts as artifact_database
+
+# pieces of the same set required by builds with a set filter (4 pieces set bonus)
+loadout_set_pieces = 4
+
+
+def get_slot_candidates(g2c_artifact_list, build_list):
+    """Return artifacts matching each build per slot, best score first
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with build scores
+    :param build_list: compiled build list
+    :return: list (per build) of lists (per slot, slot_key_order) of tuples (score, artifact position, set_key)
+    """
+    build_positions = {(build['character'], build['name']): position for position, build in enumerate(build_list)}
+    slot_positions = {slot_key: position for position, slot_key in enumerate(artifact_database.slot_key_order)}
+
+    slot_candidates = [[[] for _ in artifact_database.slot_key_order] for _ in build_list]
+    for artifact_position, g2c_artifact in enumerate(g2c_artifact_list):
+        for build_score in g2c_artifact['build_score']:
+            build_position = build_positions[(build_score['character'], build_score['name'])]
+            slot_candidates[build_position][slot_positions[g2c_artifact['slot_key']]].append(
+                (build_score['score'], artifact_position, g2c_artifact['set_key'])
+            )
+
+    for build_candidates in slot_candidates:
+        for candidates in build_candidates:
+            candidates.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+    return slot_candidates
+
+
+def find_top_loadouts(slot_candidates, top_k, set_pieces=0):
+    """Find the loadouts (one artifact per slot) with the highest score sums by branch and bound
+
+    Slots are filled in order trying the best artifacts first. A branch is cut when its score plus the best score of
+    each remaining slot can't beat the worst of the top loadouts found so far (the next artifacts of the slot score
+    even less), or when no set can reach the required pieces with the remaining slots having artifacts of that set.
+
+    :param slot_candidates: list (per slot) of tuples (score, artifact position, set_key), best score first
+    :param top_k: amount of loadouts
+    :param set_pieces: minimum pieces of the same set (0 for no set constraint)
+    :return: list of tuples (score sum, artifact positions per slot), best loadout first
+    """
+    if not all(slot_candidates):
+        return []
+
+    # best score sum of the slots after each slot
+    remaining_best = [0.0] * (len(slot_candidates) + 1)
+    for slot_index in reversed(range(len(slot_candidates))):
+        remaining_best[slot_index] = remaining_best[slot_index + 1] + slot_candidates[slot_index][0][0]
+
+    # amount of slots having artifacts of each set from each slot to the last one, and sets able to reach the pieces
+    remaining_set_slots = [defaultdict(int) for _ in range(len(slot_candidates) + 1)]
+    for slot_index in reversed(range(len(slot_candidates))):
+        remaining_set_slots[slot_index].update(remaining_set_slots[slot_index + 1])
+        for set_key in {set_key for _, _, set_key in slot_candidates[slot_index]}:
+            remaining_set_slots[slot_index][set_key] += 1
+    feasible_set_keys = [set_key for set_key, slots in remaining_set_slots[0].items() if slots >= set_pieces]
+    if set_pieces and not feasible_set_keys:
+        return []
+
+    # min heap of (score sum, -order found, artifact positions), the first loadout found wins ties
+    top_loadouts = []
+    found_order = itertools.count()
+    set_counts = defaultdict(int)
+    artifact_positions = []
+
+    def search(slot_index, score):
+        if slot_index == len(slot_candidates):
+            loadout = (score, -next(found_order), tuple(artifact_positions))
+            if len(top_loadouts) < top_k:
+                heapq.heappush(top_loadouts, loadout)
+            elif loadout > top_loadouts[0]:
+                heapq.heapreplace(top_loadouts, loadout)
+            return
+
+        set_slots = remaining_set_slots[slot_index + 1]
+        for candidate_score, artifact_position, set_key in slot_candidates[slot_index]:
+            if len(top_loadouts) == top_k and score + candidate_score + remaining_best[slot_index + 1] <= top_loadouts[0][0]:
+                break
+
+            set_counts[set_key] += 1
+            if not set_pieces or any(set_counts[key] + set_slots[key] >= set_pieces for key in feasible_set_keys):
+                artifact_positions.append(artifact_position)
+                search(slot_index + 1, score + candidate_score)
+                artifact_positions.pop()
+            set_counts[set_key] -= 1
+
+    search(0, 0.0)
+
+    return [(round(score, 2), positions) for score, _, positions in sorted(top_loadouts, reverse=True)]
+
+
+def find_build_loadouts(g2c_artifact_list, build_list, top_k):
+    """Find the top loadouts of each build
+
+    Builds with a set filter require 4 pieces of one of their sets (the other piece can be of any set of the filter),
+    and builds missing artifacts for some slot have no loadout.
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with build scores
+    :param build_list: compiled build list
+    :param top_k: amount of loadouts per build
+    :return: list (per build) of lists of tuples (score sum, artifact positions per slot), best loadout first
+    """
+    return [
+        find_top_loadouts(build_candidates, top_k, loadout_set_pieces if 'set' in build['filter'] else 0)
+        for build, build_candidates in zip(build_list, get_slot_candidates(g2c_artifact_list, build_list))
+    ]
+
+
+def keep_loadout_artifacts(g2c_artifact_list, build_list, top_k):
+    """Keep only artifacts in some top loadout of some build
+
+    Loadouts format (in each kept artifact):
+    [{'character': 'Amber', 'name': 'DPS', 'rank': 1, 'score': 3.12}]
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with build scores
+    :param build_list: compiled build list
+    :param top_k: amount of loadouts per build
+    :return: G2C (Genshin Garbage Collector) artifact list (with loadouts), same order
+    """
+    artifact_loadouts = defaultdict(list)
+    for build, loadouts in zip(build_list, find_build_loadouts(g2c_artifact_list, build_list, top_k)):
+        for rank, (score, artifact_positions) in enumerate(loadouts, start=1):
+            for artifact_position in artifact_positions:
+                artifact_loadouts[artifact_position].append(
+                    {'character': build['character'], 'name': build['name'], 'rank': rank, 'score': score}
+                )
+
+    return [
+        {**g2c_artifact, 'loadouts': artifact_loadouts[artifact_position]}
+        for artifact_position, g2c_artifact in enumerate(g2c_artifact_list) if artifact_position in artifact_loadouts
+    ]
@@ -0,0 +1,215 @@
+import functools
+import itertools
+
+from collections import Counter, defaultdict
+
+import numpy
+
+import src.database.stats as stat_database
+
+# value of each roll tier in tenths of the maximum roll value (artifact-max-stats.json), every tier equally likely
+roll_tiers = (7, 8, 9, 10)
+max_sub_stats = 4
+max_artifact_rolls = 9
+potential_percentiles = (10, 50, 90)
+
+# score gains are accumulated in bins of 0.001 (scores are rounded to 2 decimal places)
+gain_bins_per_score = 1000
+# maximum amount of (weight row, outcome) gains evaluated at once
+max_chunk_elements = 2 ** 22
+
+
+@functools.lru_cache(maxsize=None)
+def get_roll_distribution(sub_stat_amount, remaining_rolls):
+    """Return exact distribution of the roll tiers added to each sub stat by the remaining upgrades
+
+    While the artifact has less than 4 sub stats each upgrade adds a new sub stat (slots after the existing ones),
+    then each upgrade rolls one of the sub stats with equal probability.
+
+    :param sub_stat_amount: amount of sub stats of the artifact
+    :param remaining_rolls: amount of remaining upgrades
+    :return: tuple (outcomes x sub stat slots matrix of tier sums, probability of each outcome)
+    """
+    new_sub_stat_amount = min(max_sub_stats - sub_stat_amount, remaining_rolls)
+    slot_amount = sub_stat_amount + new_sub_stat_amount
+
+    distribution = {(0,) * slot_amount: 1.0}
+    for roll in range(remaining_rolls):
+        slots = [sub_stat_amount + roll] if roll < new_sub_stat_amount else range(slot_amount)
+        roll_probability = 1 / (len(slots) * len(roll_tiers))
+
+        next_distribution = defaultdict(float)
+        for tier_sums, probability in distribution.items():
+            for slot in slots:
+                for tier in roll_tiers:
+                    next_tier_sums = tier_sums[:slot] + (tier_sums[slot] + tier,) + tier_sums[slot + 1:]
+                    next_distribution[next_tier_sums] += probability * roll_probability
+        distribution = next_distribution
+
+    tier_sums = numpy.array(list(distribution.keys()), dtype=float).reshape(len(distribution), slot_amount)
+    return tier_sums, numpy.array(list(distribution.values()))
+
+
+def get_upgrade_weights(sub_stat_keys, candidate_keys, remaining_rolls, weights):
+    """Return build weights of the sub stats that the remaining upgrades can roll
+
+    Sub stats added by upgrades are drawn with equal probability among the candidates, so there is a weight tuple
+    for each combination of added sub stats. Weights are sorted (the existing sub stats are interchangeable, and so
+    are the added ones), so combinations with the same weights are counted together.
+
+    :param sub_stat_keys: keys of the artifact sub stats
+    :param candidate_keys: keys of the sub stats that can be added (not in the artifact and not the main stat)
+    :param remaining_rolls: amount of remaining upgrades
+    :param weights: build sub stat weights
+    :return: tuple of (weight tuple, amount of combinations)
+    """
+    sub_stat_weights = tuple(sorted([weights.get(sub_stat_key, 0) for sub_stat_key in sub_stat_keys]))
+    new_sub_stat_amount = min(max_sub_stats - len(sub_stat_keys), remaining_rolls)
+    if new_sub_stat_amount == 0:
+        return ((sub_stat_weights, 1),)
+
+    candidate_weights = sorted([weights.get(candidate_key, 0) for candidate_key in candidate_keys])
+    weight_counter = Counter(
+        sub_stat_weights + new_sub_stat_weights
+        for new_sub_stat_weights in itertools.combinations(candidate_weights, new_sub_stat_amount)
+    )
+    return tuple(sorted(weight_counter.items()))
+
+
+def estimate_gains(weight_rows, tier_sums, probabilities):
+    """Return expected value and percentiles of the score gain for each row of weights
+
+    :param weight_rows: list of (tuple of (weight tuple, amount of combinations), gain factor)
+    :param tier_sums: (outcomes x sub stat slots) tier sums matrix (get_roll_distribution)
+    :param probabilities: probability of each outcome
+    :return: (rows x 1 + percentiles) matrix of score gains
+    """
+    row_amount = len(weight_rows)
+    combination_rows = []
+    combination_weights = []
+    combination_probabilities = []
+    for row_index, (weight_counts, gain_factor) in enumerate(weight_rows):
+        combination_amount = sum(amount for _, amount in weight_counts)
+        for weights, amount in weight_counts:
+            combination_rows.append(row_index)
+            combination_weights.append([weight * gain_factor for weight in weights])
+            combination_probabilities.append(amount / combination_amount)
+
+    combination_rows = numpy.array(combination_rows)
+    combination_weights = numpy.array(combination_weights).reshape(len(combination_rows), tier_sums.shape[1])
+    combination_probabilities = numpy.array(combination_probabilities)
+
+    # the expected gain only needs the expected tier sum of each slot
+    expected_gains = numpy.bincount(
+        combination_rows, weights=combination_probabilities * (combination_weights @ (probabilities @ tier_sums)),
+        minlength=row_amount
+    )
+
+    # probability histogram of the (combinations x outcomes) gains of each row, in bins of 1 / gain_bins_per_score
+    gain_bins = numpy.rint(
+        combination_weights.astype(numpy.float32) * gain_bins_per_score @ tier_sums.T.astype(numpy.float32)
+    ).astype(numpy.intp)
+    # bins of each row start at its lowest gain (negative weights give negative gains)
+    row_minimums = numpy.full(row_amount, numpy.iinfo(numpy.intp).max)
+    numpy.minimum.at(row_minimums, combination_rows, gain_bins.min(axis=1))
+    gain_bins -= row_minimums[combination_rows][:, numpy.newaxis]
+    bin_amount = int(gain_bins.max()) + 1
+    gain_bins += combination_rows[:, numpy.newaxis] * bin_amount
+    outcome_probabilities = combination_probabilities[:, numpy.newaxis] * probabilities
+    histogram = numpy.bincount(gain_bins.ravel(), weights=outcome_probabilities.ravel(), minlength=row_amount * bin_amount)
+    cumulative_probabilities = histogram.reshape(row_amount, bin_amount).cumsum(axis=1)
+
+    estimates = [expected_gains]
+    for percentile in potential_percentiles:
+        # tolerance for the float sum of the probabilities
+        percentile_bins = (cumulative_probabilities < percentile / 100 - 1e-9).sum(axis=1)
+        estimates.append((numpy.minimum(percentile_bins, bin_amount - 1) + row_minimums) / gain_bins_per_score)
+
+    return numpy.column_stack(estimates)
+
+
+def estimate_final_scores(g2c_artifact_list, build_list):
+    """Return expected and percentile scores at maximum level for each build score of each artifact
+
+    Pairs of artifact and build with the same amount of sub stats and remaining upgrades share the memoized
+    roll distribution, and are evaluated together as matrices once per distinct weights and normalization factor.
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with build scores
+    :param build_list: compiled build list
+    :return: list (per artifact) of lists (per build score) of dicts {'expected_score': 0.61, 'p10_score': 0.48, ...}
+    """
+    builds = {(build['character'], build['name']): (position, build) for position, build in enumerate(build_list)}
+
+    # rows of weights of each (sub stat amount, remaining upgrades) group: {weight row: row index}
+    row_groups = defaultdict(dict)
+    pair_rows = dict()
+    pair_list = []
+    for g2c_artifact in g2c_artifact_list:
+        remaining_rolls = max(g2c_artifact['rarity'] - g2c_artifact['rank'], 0)
+        sub_stat_keys = tuple(sorted(
+            sub_stat['key'] for sub_stat in g2c_artifact['sub_stats'] if sub_stat['key'] is not None
+        ))
+        candidate_keys = [
+            sub_stat_key for sub_stat_key in stat_database.sub_stats
+            if sub_stat_key != g2c_artifact['main_stat_key'] and sub_stat_key not in sub_stat_keys
+        ]
+
+        artifact_pairs = []
+        for build_score in g2c_artifact['build_score']:
+            build_position, build = builds[(build_score['character'], build_score['name'])]
+            pair_key = (sub_stat_keys, g2c_artifact['main_stat_key'], remaining_rolls, build_position)
+            if pair_key not in pair_rows:
+                weight_counts = get_upgrade_weights(sub_stat_keys, candidate_keys, remaining_rolls, build['sub_stats'])
+                # efficiency of a roll is tier / max_artifact_rolls and tiers are in tenths (see hydrate_sub_stats_efficiency)
+                weight_row = (weight_counts, 1 / (10 * max_artifact_rolls * build['normalization_factor']))
+                row_group = row_groups[(len(sub_stat_keys), remaining_rolls)]
+                pair_rows[pair_key] = ((len(sub_stat_keys), remaining_rolls), row_group.setdefault(weight_row, len(row_group)))
+            artifact_pairs.append((build_score['score'], pair_rows[pair_key]))
+        pair_list.append(artifact_pairs)
+
+    group_gains = dict()
+    for (sub_stat_amount, remaining_rolls), row_group in row_groups.items():
+        tier_sums, probabilities = get_roll_distribution(sub_stat_amount, remaining_rolls)
+        weight_rows = list(row_group)
+        chunk_size = max(max_chunk_elements // len(probabilities), 1)
+        group_gains[(sub_stat_amount, remaining_rolls)] = numpy.concatenate([
+            estimate_gains(weight_rows[start:start + chunk_size], tier_sums, probabilities)
+            for start in range(0, len(weight_rows), chunk_size)
+        ]).tolist()
+
+    estimate_keys = ['expected_score'] + [f'p{percentile}_score' for percentile in potential_percentiles]
+    return [
+        [
+            {estimate_key: round(score + gain, 2) for estimate_key, gain in zip(estimate_keys, group_gains[group][row])}
+            for score, (group, row) in artifact_pairs
+        ]
+        for artifact_pairs in pair_list
+    ]
+
+
+def hydrate_upgrade_potential(g2c_artifact_list, build_list):
+    """Add final score estimates to each build score and the best expected score to each artifact
+
+    Artifacts at maximum level keep their current scores.
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with build scores
+    :param build_list: compiled build list
+    :return: G2C (Genshin Garbage Collector) artifact list (with expected_score and expected_build)
+    """
+    final_scores = estimate_final_scores(g2c_artifact_list, build_list)
+
+    hydrated_artifact_list = []
+    for g2c_artifact, build_final_scores in zip(g2c_artifact_list, final_scores):
+        build_score_list = [
+            {**build_score, **build_final_score}
+            for build_score, build_final_score in zip(g2c_artifact['build_score'], build_final_scores)
+        ]
+        best_expected = max(build_score_list, key=lambda build_score: build_score['expected_score'])
+        hydrated_artifact_list.append({
+            **g2c_artifact,
+            'build_score': build_score_list,
+            'expected_score': best_expected['expected_score'],
+            'expected_build': f"{best_expected['character']} - {best_expected['name']}",
+        })
+
+    return hydrated_artifact_list
@@ -0,0 +1,48 @@
+def get_sub_stat_directions(build_list):
+    """Return how a higher efficiency of each weighted sub stat changes the build scores
+
+    :param build_list: compiled build list
+    :return: dict {sub_stat_key: 1 (never lowers a score), -1 (never raises a score) or 0 (mixed weights)}
+    """
+    directions = dict()
+    for build in build_list:
+        for sub_stat_key, weight in build['sub_stats'].items():
+            if weight == 0:
+                continue
+            direction = 1 if weight > 0 else -1
+            directions[sub_stat_key] = direction if directions.get(sub_stat_key, direction) == direction else 0
+    return directions
+
+
+def dominates(vector, other_vector):
+    """Return whether the vector is higher or equal on every dimension and different from the other vector
+
+    :param vector: tuple of values
+    :param other_vector: tuple of values
+    :return: bool
+    """
+    return vector != other_vector and all(value >= other_value for value, other_value in zip(vector, other_vector))
+
+
+def find_dominators(vector_list):
+    """Find the skyline (vectors not dominated by any other) with the sort-filter-skyline algorithm
+
+    Vectors are visited by decreasing sum, so a vector can only be dominated by a vector visited before it,
+    and it is only compared with the skyline found so far (dominance is transitive).
+
+    :param vector_list: list of tuples of values
+    :return: list with the index of a skyline vector dominating each vector (None for skyline vectors)
+    """
+    order = sorted(range(len(vector_list)), key=lambda index: sum(vector_list[index]), reverse=True)
+
+    skyline = []
+    dominators = [None] * len(vector_list)
+    for index in order:
+        for skyline_index in skyline:
+            if dominates(vector_list[skyline_index], vector_list[index]):
+                dominators[index] = skyline_index
+                break
+        else:
+            skyline.append(index)
+
+    return dominators
@@ -0,0 +1,156 @@
+import bisect
+import math
+
+from collections import defaultdict
+
+max_rank = 5
+
+
+def group_scores_by_rank(g2c_artifact_list, group_key):
+    """Group best scores by group value and rank
+
+    Artifacts with best score 0 (not matching any build) are always discarded, so they are only counted.
+
+    Grouped scores format:
+    {'WanderersTroupe': {'total': 10, 'zero': 2, 'ranks': {0: [0.12, 0.3], 5: [0.5]}}}
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
+    :param group_key: set_key, slot_key, main_stat_key or best_build
+    :return: grouped scores (scores of each rank sorted)
+    """
+    grouped_scores = defaultdict(lambda: {'total': 0, 'zero': 0, 'ranks': defaultdict(list)})
+    for g2c_artifact in g2c_artifact_list:
+        group_scores = grouped_scores[g2c_artifact[group_key]]
+        group_scores['total'] += 1
+        if g2c_artifact['best_score'] == 0:
+            group_scores['zero'] += 1
+        else:
+            group_scores['ranks'][g2c_artifact['rank']].append(g2c_artifact['best_score'])
+
+    for group_scores in grouped_scores.values():
+        for scores in group_scores['ranks'].values():
+            scores.sort()
+
+    return grouped_scores
+
+
+def get_rank_thresholds(base_threshold, step):
+    """Return threshold of each rank (the threshold increases by step at each rank, starting at 0)
+
+    :param base_threshold: threshold of rank 0
+    :param step: threshold increase per rank
+    :return: dict {rank: threshold}
+    """
+    return {rank: max(round(base_threshold + step * rank, 2), 0.0) for rank in range(max_rank + 1)}
+
+
+def count_discarded_artifacts(group_scores, rank_thresholds):
+    """Count artifacts below the threshold of their rank
+
+    :param group_scores: scores of a group (group_scores_by_rank item)
+    :param rank_thresholds: dict {rank: threshold}
+    :return: amount of discarded artifacts
+    """
+    return group_scores['zero'] + sum(
+        bisect.bisect_left(scores, rank_thresholds[rank]) for rank, scores in group_scores['ranks'].items()
+    )
+
+
+def tune_group_thresholds(group_scores, target, step=0.05):
+    """Find the highest threshold curve that discards at most the target amount of artifacts
+
+    Scores have two decimal places, so the rank 0 threshold is binary searched in hundredths.
+    Artifacts with best score 0 are discarded even when they alone exceed the target.
+
+    :param group_scores: scores of a group (group_scores_by_rank item)
+    :param target: maximum amount of discarded artifacts
+    :param step: threshold increase per rank
+    :return: tuple (dict {rank: threshold}, amount of discarded artifacts)
+    """
+    max_score = max((scores[-1] for scores in group_scores['ranks'].values()), default=0)
+
+    # lowest curve only discards the artifacts with best score 0, highest curve discards everything
+    lowest = -math.ceil(step * max_rank * 100)
+    highest = math.ceil(max_score * 100) + 1
+    while lowest < highest:
+        middle = (lowest + highest + 1) // 2
+        if count_discarded_artifacts(group_scores, get_rank_thresholds(middle / 100, step)) <= target:
+            lowest = middle
+        else:
+            highest = middle - 1
+
+    rank_thresholds = get_rank_thresholds(lowest / 100, step)
+    return rank_thresholds, count_discarded_artifacts(group_scores, rank_thresholds)
+
+
+def parse_target(target_str, total):
+    """Parse discard target
+
+    :param target_str: amount (e.g. '20') or percentage of the group (e.g. '10%')
+    :param total: amount of artifacts in the group
+    :return: maximum amount of discarded artifacts
+    """
+    if target_str.endswith('%'):
+        return math.floor(total * float(target_str[:-1]) / 100)
+    return int(target_str)
+
+
+def tune_thresholds(g2c_artifact_list, group_key, target_str, step=0.05, group_values=None):
+    """Tune threshold curve of each group to reach the discard target
+
+    Tuned group format:
+    {'group_key': 'set_key', 'group_value': 'WanderersTroupe', 'total': 143, 'target': 20, 'discard': 19,
+     'thresholds': {0: 0.25, 1: 0.3, 2: 0.35, 3: 0.4, 4: 0.45, 5: 0.5}}
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with best scores
+    :param group_key: set_key, slot_key, main_stat_key or best_build
+    :param target_str: discard target per group, amount (e.g. '20') or percentage (e.g. '10%')
+    :param step: threshold increase per rank
+    :param group_values: tune only these groups (all when empty)
+    :return: list of tuned groups (largest groups first)
+    """
+    grouped_scores = group_scores_by_rank(g2c_artifact_list, group_key)
+
+    tuned_group_list = []
+    for group_value, group_scores in grouped_scores.items():
+        if group_values and group_value not in group_values:
+            continue
+
+        target = parse_target(target_str, group_scores['total'])
+        rank_thresholds, discard = tune_group_thresholds(group_scores, target, step)
+        tuned_group_list.append({
+            'group_key': group_key,
+            'group_value': group_value,
+            'total': group_scores['total'],
+            'target': target,
+            'discard': discard,
+            'thresholds': rank_thresholds
+        })
+
+    return sorted(tuned_group_list, key=lambda item: item['total'], reverse=True)
+
+
+def get_discarded_artifacts(g2c_artifact_list, tuned_group_list):
+    """Get artifacts below the tuned threshold of their group and rank (or with best score 0)
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list with best scores
+    :param tuned_group_list: tune_thresholds output
+    :return: G2C (Genshin Garbage Collector) artifact list
+    """
+    group_thresholds = {
+        (tuned_group['group_key'], tuned_group['group_value']): tuned_group['thresholds']
+        for tuned_group in tuned_group_list
+    }
+    group_keys = {group_key for group_key, _ in group_thresholds}
+
+    discarded_artifact_list = []
+    for g2c_artifact in g2c_artifact_list:
+        for group_key in group_keys:
+            rank_thresholds = group_thresholds.get((group_key, g2c_artifact[group_key]))
+            if rank_thresholds is None:
+                continue
+            if g2c_artifact['best_score'] == 0 or g2c_artifact['best_score'] < rank_thresholds[g2c_artifact['rank']]:
+                discarded_artifact_list.append(g2c_artifact)
+                break
+
+    return discarded_artifact_list
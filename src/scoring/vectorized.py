@@ -0,0 +1,231 @@
+import numpy
+
+import src.database.artifacts as artifact_database
+import src.database.stats as stat_database
+
+from src.scoring.build_index import slot_main_stats
+
+
+def get_artifacts_with_build_scores(g2c_artifact_list, build_list):
+    """Get artifacts with build scores using NumPy matrices
+
+    Produces exactly the same output (order, scores and rounding) as the pure Python engine.
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list
+    :param build_list: compiled build list (see build_index.load_build_list)
+    :return: G2C (Genshin Garbage Collector) artifact list
+    """
+    if not g2c_artifact_list or not build_list:
+        return []
+
+    main_stat_keys = get_main_stat_keys(build_list)
+    packed_artifacts = pack_artifacts(g2c_artifact_list, main_stat_keys)
+    packed_builds = pack_builds(build_list, main_stat_keys)
+
+    match_matrix = calculate_match_matrix(packed_artifacts, packed_builds)
+    rounded_score_matrix = round_scores(calculate_score_matrix(packed_artifacts, packed_builds))
+    rounded_score_matrix[~match_matrix] = -numpy.inf
+
+    artifact_indexes = get_artifact_index_order(packed_artifacts, packed_builds, match_matrix)
+    best_build_indexes = rounded_score_matrix.argmax(axis=0)[artifact_indexes]
+    best_scores = rounded_score_matrix[best_build_indexes, artifact_indexes]
+
+    # (artifact, build) pairs of the matched builds, grouped by artifact in scoring order then in build order
+    pair_artifact_positions, pair_build_indexes = numpy.nonzero(match_matrix[:, artifact_indexes].T)
+    pair_scores = rounded_score_matrix[pair_build_indexes, artifact_indexes[pair_artifact_positions]]
+    pair_ends = numpy.cumsum(numpy.bincount(pair_artifact_positions, minlength=len(artifact_indexes)))
+
+    build_names = [(build['character'], build['name']) for build in build_list]
+    build_scores = [
+        {'character': build_names[build_index][0], 'name': build_names[build_index][1], 'score': score}
+        for build_index, score in zip(pair_build_indexes.tolist(), pair_scores.tolist())
+    ]
+
+    scored_artifact_list = []
+    pair_start = 0
+    for artifact_index, pair_end, best_build_index, best_score in zip(
+        artifact_indexes.tolist(), pair_ends.tolist(), best_build_indexes.tolist(), best_scores.tolist()
+    ):
+        scored_artifact_list.append({
+            **g2c_artifact_list[artifact_index],
+            'build_score': build_scores[pair_start:pair_end],
+            'best_score': best_score,
+            'best_build': ' - '.join(build_names[best_build_index])
+        })
+        pair_start = pair_end
+
+    return scored_artifact_list
+
+
+def get_main_stat_keys(build_list):
+    """Return every main stat key known by the database or used in any build filter
+
+    :param build_list: compiled build list
+    :return: ordered list of main stat keys
+    """
+    main_stat_keys = list(dict.fromkeys(main_stat for main_stats in slot_main_stats.values() for main_stat in main_stats))
+    for build in build_list:
+        for slot_key in artifact_database.slot_key_order:
+            for main_stat_key in build['main_stats'][slot_key]:
+                if main_stat_key not in main_stat_keys:
+                    main_stat_keys.append(main_stat_key)
+
+    return main_stat_keys
+
+
+def pack_artifacts(g2c_artifact_list, main_stat_keys):
+    """Pack artifact attributes and sub stats efficiency into matrices
+
+    Unknown set keys, main stats or sub stats (and empty sub stats) point to an extra index that never matches.
+
+    :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list (with efficiency)
+    :param main_stat_keys: ordered list of main stat keys
+    :return: dict with artifact matrices
+    """
+    set_key_indexes = {set_key: index for index, set_key in enumerate(artifact_database.set_key_order)}
+    slot_key_indexes = {slot_key: index for index, slot_key in enumerate(artifact_database.slot_key_order)}
+    main_stat_indexes = {main_stat_key: index for index, main_stat_key in enumerate(main_stat_keys)}
+    sub_stat_indexes = {sub_stat_key: index for index, sub_stat_key in enumerate(stat_database.sub_stats)}
+
+    artifact_amount = len(g2c_artifact_list)
+    sub_stat_amount = max(len(g2c_artifact['sub_stats']) for g2c_artifact in g2c_artifact_list)
+
+    set_key = numpy.empty(artifact_amount, dtype=numpy.intp)
+    slot_key = numpy.empty(artifact_amount, dtype=numpy.intp)
+    main_stat_key = numpy.empty(artifact_amount, dtype=numpy.intp)
+    sub_stat_key = numpy.full((artifact_amount, sub_stat_amount), len(stat_database.sub_stats), dtype=numpy.intp)
+    efficiency = numpy.zeros((artifact_amount, sub_stat_amount))
+
+    for artifact_index, g2c_artifact in enumerate(g2c_artifact_list):
+        set_key[artifact_index] = set_key_indexes.get(g2c_artifact['set_key'], len(set_key_indexes))
+        slot_key[artifact_index] = slot_key_indexes[g2c_artifact['slot_key']]
+        main_stat_key[artifact_index] = main_stat_indexes.get(g2c_artifact['main_stat_key'], len(main_stat_indexes))
+
+        for sub_stat_index, sub_stat in enumerate(g2c_artifact['sub_stats']):
+            sub_stat_key[artifact_index, sub_stat_index] = sub_stat_indexes.get(sub_stat['key'], len(sub_stat_indexes))
+            efficiency[artifact_index, sub_stat_index] = sub_stat['efficiency']
+
+    return {
+        'set_key': set_key,
+        'slot_key': slot_key,
+        'main_stat_key': main_stat_key,
+        'sub_stat_key': sub_stat_key,
+        'efficiency': efficiency,
+    }
+
+
+def pack_builds(build_list, main_stat_keys):
+    """Pack build filters and sub stat weights into matrices
+
+    :param build_list: compiled build list
+    :param main_stat_keys: ordered list of main stat keys
+    :return: dict with build matrices
+    """
+    build_amount = len(build_list)
+
+    set_mask = numpy.zeros((build_amount, len(artifact_database.set_key_order) + 1), dtype=bool)
+    set_position = numpy.zeros((build_amount, len(artifact_database.set_key_order) + 1), dtype=numpy.intp)
+    main_stat_mask = numpy.zeros((build_amount, len(artifact_database.slot_key_order), len(main_stat_keys) + 1), dtype=bool)
+    # builds in the same score class share a row of the score matrix (see build_index.get_score_class)
+    score_classes = {score_class: index for index, score_class in enumerate(dict.fromkeys(
+        build['score_class'] for build in build_list
+    ))}
+    weights = numpy.zeros((len(score_classes), len(stat_database.sub_stats) + 1))
+    normalization_factor = numpy.zeros(len(score_classes))
+
+    for build_index, build in enumerate(build_list):
+        # the set position reproduces the order in which the Python engine visits the matched artifacts
+        for position, set_key in reversed(list(enumerate(build['set_keys']))):
+            if set_key in artifact_database.set_key_order:
+                set_index = artifact_database.set_key_order.index(set_key)
+                set_mask[build_index, set_index] = True
+                set_position[build_index, set_index] = position
+
+        for slot_index, slot_key in enumerate(artifact_database.slot_key_order):
+            for main_stat_key in build['main_stats'][slot_key]:
+                main_stat_mask[build_index, slot_index, main_stat_keys.index(main_stat_key)] = True
+
+        weights[score_classes[build['score_class']], :len(stat_database.sub_stats)] = build['weights']
+        normalization_factor[score_classes[build['score_class']]] = build['normalization_factor']
+
+    return {
+        'set_mask': set_mask,
+        'set_position': set_position,
+        'main_stat_mask': main_stat_mask,
+        'weights': weights,
+        'normalization_factor': normalization_factor,
+        'score_class': numpy.array([score_classes[build['score_class']] for build in build_list]),
+    }
+
+
+def calculate_match_matrix(packed_artifacts, packed_builds):
+    """Return (builds x artifacts) boolean matrix indicating which artifacts match each build
+
+    :param packed_artifacts: artifact matrices
+    :param packed_builds: build matrices
+    :return: boolean matrix
+    """
+    set_match = packed_builds['set_mask'][:, packed_artifacts['set_key']]
+    main_stat_match = packed_builds['main_stat_mask'][:, packed_artifacts['slot_key'], packed_artifacts['main_stat_key']]
+    return set_match & main_stat_match
+
+
+def calculate_score_matrix(packed_artifacts, packed_builds):
+    """Return (builds x artifacts) normalized score matrix
+
+    Sub stats are accumulated in the artifact order, like the Python engine, to get the same float results.
+    Scores are calculated once per score class and shared by the builds of the class.
+
+    :param packed_artifacts: artifact matrices
+    :param packed_builds: build matrices
+    :return: float matrix
+    """
+    weights = packed_builds['weights']
+    sub_stat_key = packed_artifacts['sub_stat_key']
+    efficiency = packed_artifacts['efficiency']
+
+    score_matrix = numpy.zeros((weights.shape[0], efficiency.shape[0]))
+    for sub_stat_index in range(efficiency.shape[1]):
+        score_matrix += efficiency[:, sub_stat_index] * weights[:, sub_stat_key[:, sub_stat_index]]
+
+    score_matrix /= packed_builds['normalization_factor'][:, numpy.newaxis]
+    return score_matrix[packed_builds['score_class']]
+
+
+def round_scores(score_matrix):
+    """Round scores to 2 decimal places like Python round (correctly rounded)
+
+    NumPy rounds the scaled value (score * 100), which differs from Python round only when the scaled value is close
+    to a halfway point, so those scores are rounded again with Python round.
+
+    :param score_matrix: float matrix
+    :return: rounded float matrix
+    """
+    scaled_score_matrix = score_matrix * 100
+    rounded_score_matrix = numpy.round(scaled_score_matrix) / 100
+
+    halfway_distance = numpy.abs(numpy.abs(scaled_score_matrix - numpy.trunc(scaled_score_matrix)) - 0.5)
+    for index in zip(*numpy.nonzero(halfway_distance < 1e-6)):
+        rounded_score_matrix[index] = round(float(score_matrix[index]), 2)
+
+    return rounded_score_matrix
+
+
+def get_artifact_index_order(packed_artifacts, packed_builds, match_matrix):
+    """Return indexes of matched artifacts in the order the Python engine scores them first
+
+    Artifacts are sorted by the first build matching them, then (within the build) by slot, build set order and
+    original order.
+
+    :param packed_artifacts: artifact matrices
+    :param packed_builds: build matrices
+    :param match_matrix: (builds x artifacts) boolean matrix
+    :return: array of artifact indexes
+    """
+    artifact_indexes = numpy.flatnonzero(match_matrix.any(axis=0))
+    first_build_indexes = match_matrix[:, artifact_indexes].argmax(axis=0)
+    set_position = packed_builds['set_position'][first_build_indexes, packed_artifacts['set_key'][artifact_indexes]]
+    slot_key = packed_artifacts['slot_key'][artifact_indexes]
+    order = numpy.lexsort((artifact_indexes, set_position, slot_key, first_build_indexes))
+    return artifact_indexes[order]
+
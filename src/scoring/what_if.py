@@ -0,0 +1,168 @@
+import bisect
+import functools
+
+from collections import defaultdict
+
+import src.artifact.compact as compact
+import src.scoring.build_index as build_index
+from src.scoring.incremental import flipped_artifact_keys
+
+
+class WhatIfSession:
+    """Artifacts scored once against the build list, then re-scored one edited build at a time
+
+    The hydrated efficiencies, the artifacts of each (set_key, slot_key, main_stat_key) and the score column of each build
+    are kept in memory, so an edited build only scores the artifacts it matches (match sets are cached per filter when
+    only the weights change) and updates best_score/best_build of the artifacts it matches before or after the edit.
+    Artifacts (and their efficiencies) are held as compact artifacts (see src/artifact/compact.py), as the server keeps
+    several sessions.
+    """
+
+    def __init__(self, g2c_artifact_list, build_list):
+        """
+        :param g2c_artifact_list: G2C (Genshin Garbage Collector) artifact list (with efficiency)
+        :param build_list: compiled build list
+        """
+        self.artifact_list = compact.pack_artifact_list(g2c_artifact_list)
+
+        self.artifact_positions = defaultdict(list)
+        for position, g2c_artifact in enumerate(g2c_artifact_list):
+            artifact_key = (g2c_artifact['set_key'], g2c_artifact['slot_key'], g2c_artifact['main_stat_key'])
+            self.artifact_positions[artifact_key].append(position)
+
+        self.match_cache = dict()
+        self.build_list = []
+        self.build_positions = dict()
+        self.score_columns = []
+        self.artifact_builds = [[] for _ in g2c_artifact_list]
+        for build in build_list:
+            self.commit_build(build, self.score_build(build))
+
+        self.best_scores = [self.get_best_score(position) for position in range(len(g2c_artifact_list))]
+
+    def get_matched_positions(self, build):
+        """Return positions of the artifacts matched by the build (cached per build filter)
+
+        :param build: compiled build
+        :return: sorted list of artifact positions
+        """
+        filter_key = (tuple(build['set_keys']), tuple(tuple(main_stats) for main_stats in build['main_stats'].values()))
+        if filter_key not in self.match_cache:
+            matched_positions = set()
+            for set_key in build['set_keys']:
+                for slot_key, main_stats in build['main_stats'].items():
+                    for main_stat_key in main_stats:
+                        matched_positions.update(self.artifact_positions.get((set_key, slot_key, main_stat_key), ()))
+            self.match_cache[filter_key] = sorted(matched_positions)
+        return self.match_cache[filter_key]
+
+    def score_build(self, build):
+        """Return score of each artifact matched by the build (same value as main.score_artifact)
+
+        :param build: compiled build
+        :return: dict {artifact position: score}
+        """
+        # weight of each sub stat code, the trailing 0 is the weight of empty sub stats (code -1)
+        code_weights = [build['sub_stats'].get(sub_stat_key, 0) for sub_stat_key in compact.sub_stat_keys] + [0]
+        normalization_factor = build['normalization_factor']
+        # same left fold as main.score_artifact (sum() may round differently, e.g. compensated summation in Python 3.12)
+        return {
+            position: round(functools.reduce(
+                lambda acc, sub_stat: acc + sub_stat[0] * code_weights[sub_stat[1]],
+                zip(self.artifact_list[position].sub_stat_efficiency, self.artifact_list[position].sub_stat_codes), 0
+            ) / normalization_factor, 2)
+            for position in self.get_matched_positions(build)
+        }
+
+    def commit_build(self, build, score_column):
+        """Store build and its score column (replacing the build with the same character and name)
+
+        :param build: compiled build
+        :param score_column: dict {artifact position: score}
+        :return: build position
+        """
+        build_key = (build['character'], build['name'])
+        build_position = self.build_positions.setdefault(build_key, len(self.build_list))
+        if build_position == len(self.build_list):
+            self.build_list.append(build)
+            self.score_columns.append(score_column)
+        else:
+            for position in self.score_columns[build_position]:
+                self.artifact_builds[position].remove(build_position)
+            self.build_list[build_position] = build
+            self.score_columns[build_position] = score_column
+
+        for position in score_column:
+            bisect.insort(self.artifact_builds[position], build_position)
+        return build_position
+
+    def get_best_score(self, position, build_position=None, score_column=None):
+        """Return best score and build of an artifact (first build in build list order on ties)
+
+        :param position: artifact position
+        :param build_position: position of an edited build (its score column is replaced by score_column)
+        :param score_column: score column of the edited build
+        :return: tuple (best score, best build position) or None when no build matches the artifact
+        """
+        build_scores = [
+            (self.score_columns[other_position][position], other_position)
+            for other_position in self.artifact_builds[position] if other_position != build_position
+        ]
+        if score_column is not None and position in score_column:
+            build_scores.append((score_column[position], build_position))
+        if not build_scores:
+            return None
+        return max(build_scores, key=lambda build_score: (build_score[0], -build_score[1]))
+
+    @staticmethod
+    def format_best_score(best_score, build_list):
+        """Return keep decision, best score and best build as in the main.py output (unmatched artifacts are discarded)
+
+        :param best_score: tuple (best score, best build position) or None (see get_best_score)
+        :param build_list: compiled build list
+        :return: dict {'lock': True, 'best_score': 0.61, 'best_build': 'Amber - DPS'}
+        """
+        if best_score is None:
+            return {'lock': False, 'best_score': 0, 'best_build': ''}
+        build = build_list[best_score[1]]
+        return {'lock': True, 'best_score': best_score[0], 'best_build': f"{build['character']} - {build['name']}"}
+
+    def rescore_build(self, build, commit=False):
+        """Score the artifacts with an edited (or new) build and return the artifacts whose result changes
+
+        Flipped artifacts format:
+        [{'refer_id': 12, 'set_key': 'WanderersTroupe', ..., 'previous_lock': True, 'lock': True,
+          'previous_best_score': 0.61, 'best_score': 0.58, 'previous_best_build': 'Amber - DPS', 'best_build': ...}]
+
+        :param build: build structure (as in builds/*.json), replaces the build with the same character and name
+        :param commit: keep the edited build for the next calls
+        :return: dict with amount of matched artifacts and flipped artifacts (lock, best_score or best_build changed)
+        """
+        compiled_build = build_index.compile_build(build)
+        build_key = (compiled_build['character'], compiled_build['name'])
+        build_position = self.build_positions.get(build_key, len(self.build_list))
+        score_column = self.score_build(compiled_build)
+
+        previous_column = self.score_columns[build_position] if build_position < len(self.build_list) else dict()
+        edited_build_list = self.build_list[:build_position] + [compiled_build] + self.build_list[build_position + 1:]
+
+        flipped_artifact_list = []
+        best_scores = dict()
+        for position in sorted(set(previous_column) | set(score_column)):
+            best_scores[position] = self.get_best_score(position, build_position, score_column)
+            previous = self.format_best_score(self.best_scores[position], self.build_list)
+            current = self.format_best_score(best_scores[position], edited_build_list)
+            if previous != current:
+                g2c_artifact = self.artifact_list[position].to_g2c_artifact()
+                flipped_artifact_list.append({
+                    **{key: g2c_artifact[key] for key in flipped_artifact_keys if key not in current},
+                    **{f'previous_{key}': value for key, value in previous.items()},
+                    **current
+                })
+
+        if commit:
+            self.commit_build(compiled_build, score_column)
+            for position, best_score in best_scores.items():
+                self.best_scores[position] = best_score
+
+        return {'build': f'{build_key[0]} - {build_key[1]}', 'matched': len(score_column), 'flipped': flipped_artifact_list}
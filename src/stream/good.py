@@ -0,0 +1,186 @@
+import json
+
+json_decoder = json.JSONDecoder()
+json_whitespace = ' \t\n\r'
+
+
+class GoodStreamReader:
+    """Incremental reader for GOOD (Genshin Open Object Description) files
+
+    Only the current chunk and the artifact being decoded are held in memory.
+    """
+
+    def __init__(self, good_file, chunk_size=65536):
+        self.good_file = good_file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def read_chunk(self):
+        """Append next chunk to the buffer, discarding what was already consumed
+
+        :return: False when the end of file was reached
+        """
+        chunk = self.good_file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self, allow_eof=False):
+        """Return next character without consuming it
+
+        :param allow_eof: return empty string instead of failing at the end of file
+        :return: next character
+        """
+        while self.position >= len(self.buffer):
+            if not self.read_chunk():
+                if allow_eof:
+                    return ''
+                raise ValueError('Unexpected end of GOOD file')
+        return self.buffer[self.position]
+
+    def take(self, expected_characters):
+        """Consume next character, failing when it isn't one of the expected characters
+
+        :param expected_characters: allowed characters
+        :return: consumed character
+        """
+        character = self.peek()
+        if character not in expected_characters:
+            raise ValueError(f'Invalid GOOD file: expected {expected_characters!r}, found {character!r}')
+        self.position += 1
+        return character
+
+    def take_whitespace(self, allow_eof=False):
+        """Consume whitespace
+
+        :param allow_eof: allow the end of file
+        :return: consumed whitespace
+        """
+        whitespace = ''
+        while self.peek(allow_eof) and self.peek() in json_whitespace:
+            whitespace += self.buffer[self.position]
+            self.position += 1
+        return whitespace
+
+    def take_value(self):
+        """Decode next JSON value (reading more chunks while it is incomplete)
+
+        :return: tuple (value, raw text)
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = json_decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self.read_chunk():
+                    raise
+                continue
+
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                if self.read_chunk():  # a number or literal may continue in the next chunk
+                    continue
+
+            raw_text = self.buffer[self.position:end]
+            self.position = end
+            return value, raw_text
+
+    def take_raw_value(self):
+        """Consume next JSON value without decoding it
+
+        :return: iterator of raw text pieces
+        """
+        depth = 0
+        in_string = False
+        escape = False
+        start = self.position
+        while True:
+            if self.position >= len(self.buffer):
+                if start < self.position:
+                    yield self.buffer[start:self.position]
+                if not self.read_chunk():
+                    return
+                start = 0
+
+            character = self.buffer[self.position]
+            if in_string:
+                if escape:
+                    escape = False
+                elif character == '\\':
+                    escape = True
+                elif character == '"':
+                    in_string = False
+                    if depth == 0:
+                        self.position += 1
+                        yield self.buffer[start:self.position]
+                        return
+            elif character == '"':
+                in_string = True
+            elif character in '{[':
+                depth += 1
+            elif character in '}]' and depth:
+                depth -= 1
+                if depth == 0:
+                    self.position += 1
+                    yield self.buffer[start:self.position]
+                    return
+            elif depth == 0 and (character in ',}]' or character in json_whitespace):
+                yield self.buffer[start:self.position]
+                return
+
+            self.position += 1
+
+
+def iterate_good(good_file, chunk_size=65536):
+    """Iterate over GOOD file yielding artifacts one by one and other sections as raw text
+
+    Events:
+    - ('raw', text): raw text outside the artifact list (can be written as is)
+    - ('artifacts_start', None): start of the artifact list (after the "artifacts" key)
+    - ('artifact', good_artifact): decoded GOOD artifact
+    - ('artifacts_end', None): end of the artifact list
+
+    :param good_file: file object opened in text mode
+    :param chunk_size: amount of characters read at once
+    :return: iterator of events
+    """
+    reader = GoodStreamReader(good_file, chunk_size)
+
+    yield 'raw', reader.take_whitespace() + reader.take('{')
+    while True:
+        yield 'raw', reader.take_whitespace()
+        if reader.peek() == '}':
+            break
+
+        key, raw_key = reader.take_value()
+        yield 'raw', raw_key + reader.take_whitespace() + reader.take(':') + reader.take_whitespace()
+
+        if key == 'artifacts':
+            yield 'artifacts_start', None
+            reader.take('[')
+            reader.take_whitespace()
+            if reader.peek() == ']':
+                reader.take(']')
+            else:
+                while True:
+                    reader.take_whitespace()
+                    good_artifact, _ = reader.take_value()
+                    yield 'artifact', good_artifact
+                    reader.take_whitespace()
+                    if reader.take(',]') == ']':
+                        break
+            yield 'artifacts_end', None
+        else:
+            for raw_text in reader.take_raw_value():
+                yield 'raw', raw_text
+
+        yield 'raw', reader.take_whitespace()
+        if reader.peek() == ',':
+            yield 'raw', reader.take(',')
+
+    yield 'raw', reader.take('}') + reader.take_whitespace(allow_eof=True)
@@ -0,0 +1,44 @@
+import json
+import os
+
+import pytest
+
+import benchmarks.generator as generator
+import main as g2c
+import src.scoring.build_index as build_index
+
+repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def repository_directory():
+    """Run tests from the repository root (builds/ and artifact-max-stats.json are read from the current directory)"""
+    current_directory = os.getcwd()
+    os.chdir(repository_root)
+    yield repository_root
+    os.chdir(current_directory)
+
+
+@pytest.fixture(scope='session')
+def build_list(repository_directory):
+    return build_index.load_build_list(g2c.find_files_by_extension('builds/', '.json'))
+
+
+@pytest.fixture(scope='session')
+def good(repository_directory):
+    return generator.generate_good(600, g2c.load_artifact_stats_constants(), seed=7)
+
+
+@pytest.fixture(scope='session')
+def g2c_artifact_list(good):
+    """Hydrated artifacts in maximum rarity"""
+    artifact_list = g2c.generate_g2c_artifact_list_from_good(good['artifacts'])
+    artifact_list = g2c.hydrate_sub_stats_efficiency(artifact_list)
+    return g2c.remove_artifacts_in_non_maximum_rarity(artifact_list)
+
+
+@pytest.fixture
+def good_file(tmp_path, good):
+    good_file_name = tmp_path / 'good.json'
+    good_file_name.write_text(json.dumps(good))
+    return str(good_file_name)
@@ -0,0 +1,44 @@
+import json
+import os
+
+import pytest
+
+from click.testing import CliRunner
+
+import batch
+import main as g2c
+
+
+@pytest.fixture
+def input_dir(tmp_path, good):
+    input_dir = tmp_path / 'input'
+    input_dir.mkdir()
+    (input_dir / 'valid.json').write_text(json.dumps(good))
+
+    invalid_artifact = {**good['artifacts'][0], 'setKey': 'UnknownSet'}
+    (input_dir / 'invalid.json').write_text(json.dumps({**good, 'artifacts': [invalid_artifact, *good['artifacts'][1:]]}))
+    return input_dir
+
+
+def run_batch(input_dir, output_dir, *args):
+    return CliRunner().invoke(batch.main, ['-i', str(input_dir), '-O', str(output_dir), '-c', '', '-j', '2', *args])
+
+
+def test_same_output_as_main(input_dir, tmp_path, good, build_list):
+    output_dir = tmp_path / 'output'
+    result = run_batch(input_dir, output_dir, '-o', 'count', '-a')
+
+    assert result.exit_code == 0, result.output
+    with open(output_dir / 'valid.count.json') as output_file:
+        assert output_file.read().strip() == str(g2c.process_good(good, build_list, 'count', 'all')[0])
+
+
+def test_strict_fails_only_invalid_files(input_dir, tmp_path):
+    output_dir = tmp_path / 'output'
+    result = run_batch(input_dir, output_dir, '--strict')
+
+    assert result.exit_code == 1
+    assert 'InvalidArtifactError' in result.output
+    assert 'BrokenProcessPool' not in result.output
+    assert '1 of 2 GOOD files failed' in result.output
+    assert os.listdir(output_dir) == ['valid.g2c.json']
@@ -0,0 +1,95 @@
+import importlib
+import json
+
+from click.testing import CliRunner
+
+import benchmarks.generator as generator
+import main as g2c
+import src.scoring.build_index as build_index
+
+build_checker = importlib.import_module('build-checker')
+
+
+def test_inverted_index_matches_build_filters(g2c_artifact_list, build_list):
+    build_list = build_list + [build_index.compile_build(build) for build in generator.generate_build_list(40, seed=3)]
+    inverted_build_index = build_index.create_inverted_build_index(build_list)
+    g2c_artifact_set_slot_format = g2c.convert_g2c_list_to_g2c_set_slot_format(g2c_artifact_list)
+
+    build_artifact_ids = [
+        {g2c_artifact['id'] for g2c_artifact in g2c.get_artifacts_that_match_build(g2c_artifact_set_slot_format, build)}
+        for build in build_list
+    ]
+
+    for g2c_artifact in g2c_artifact_list:
+        assert build_index.get_builds_for_artifact(inverted_build_index, g2c_artifact) == [
+            index for index, artifact_ids in enumerate(build_artifact_ids) if g2c_artifact['id'] in artifact_ids
+        ]
+
+
+def test_cache_written_during_another_write(tmp_path, monkeypatch):
+    cache_file_name = str(tmp_path / 'build-index.json')
+    json_dump = json.dump
+
+    def dump_during_another_write(value, cache_file):
+        # another run writes the cache while this one is writing
+        monkeypatch.setattr(json, 'dump', json_dump)
+        build_index.write_build_index(cache_file_name, {'other.json': {}, 'another.json': {}})
+        json_dump(value, cache_file)
+
+    monkeypatch.setattr(json, 'dump', dump_during_another_write)
+    build_index.write_build_index(cache_file_name, {'build.json': {}})
+
+    assert build_index.read_build_index(cache_file_name)['builds'] == {'build.json': {}}
+    assert [path.name for path in tmp_path.iterdir()] == ['build-index.json']
+
+
+def compile_test_build(character, name, sub_stats, build_filter=None):
+    return build_index.compile_build(
+        {'character': character, 'name': name, 'filter': build_filter or {}, 'sub_stats': sub_stats}
+    )
+
+
+def test_find_equivalent_builds():
+    build_list = [
+        compile_test_build('Amber', 'DPS', {'atk_': 1, 'critRate_': 1, 'hp': 0}, {'set': ['A', 'B']}),
+        compile_test_build('Amber', 'Sub DPS', {'critRate_': 1, 'atk_': 1}, {'set': ['B', 'A']}),
+        compile_test_build('Bennett', 'DPS', {'atk_': 1, 'critRate_': 1}, {'set': ['A']}),
+        compile_test_build('Bennett', 'Support', {'atk_': 1, 'critRate_': 0.5}),
+        # same non-zero weights, but the zero weight is part of the normalization factor with negative weights
+        compile_test_build('Collei', 'DPS', {'atk_': 1, 'critRate_': 1, 'critDMG_': 1, 'def': -1}),
+        compile_test_build('Collei', 'Sub DPS', {'atk_': 1, 'critRate_': 1, 'critDMG_': 1, 'def': -1, 'hp': 0}),
+    ]
+
+    assert build_index.find_equivalent_builds(build_list) == [{
+        'builds': ['Amber - DPS', 'Amber - Sub DPS', 'Bennett - DPS'],
+        'redundant': [['Amber - DPS', 'Amber - Sub DPS']],
+    }]
+
+
+def test_shared_scores_same_as_scoring_every_build(g2c_artifact_list):
+    build_list = [
+        compile_test_build('Amber', 'DPS', {'atk_': 1, 'critRate_': 1, 'critDMG_': 1}),
+        compile_test_build('Amber', 'Sub DPS', {'critDMG_': 1, 'atk_': 1, 'critRate_': 1, 'hp': 0}, {'sands': ['atk_']}),
+        compile_test_build('Bennett', 'Support', {'hp_': 1, 'enerRech_': 1}),
+    ]
+
+    for g2c_artifact in g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list):
+        build_scores = {(build_score['character'], build_score['name']): build_score['score']
+                        for build_score in g2c_artifact['build_score']}
+        for build in build_list:
+            if (build['character'], build['name']) in build_scores:
+                assert build_scores[(build['character'], build['name'])] == g2c.score_artifact(g2c_artifact, build)
+
+
+def test_build_checker_output():
+    equivalent_builds = build_index.find_equivalent_builds(
+        build_index.load_build_list(g2c.find_files_by_extension('builds/', '.json'))
+    )
+
+    result = CliRunner(mix_stderr=False).invoke(build_checker.main, ['-o', 'json', '-c', ''])
+    redundant_result = CliRunner(mix_stderr=False).invoke(build_checker.main, ['-r', '-c', ''])
+
+    assert result.exit_code == 0, result.stderr
+    assert json.loads(result.stdout) == equivalent_builds
+    assert redundant_result.exit_code == 0, redundant_result.stderr
+    assert len(redundant_result.stdout.splitlines()) == sum(len(group['redundant']) for group in equivalent_builds)
@@ -0,0 +1,72 @@
+import json
+
+from collections import Counter
+
+import pytest
+
+import main as g2c
+import src.output.columnar as columnar
+
+
+@pytest.fixture
+def g2c_output(good, build_list):
+    return json.loads(g2c.process_good(good, build_list, 'g2c', 'all')[0])
+
+
+def write_columnar_file(tmp_path, g2c_artifact_list, build_list):
+    columnar_file_name = tmp_path / 'output.bin'
+    columnar_file_name.write_bytes(columnar.encode_artifacts(g2c_artifact_list, build_list))
+    return str(columnar_file_name)
+
+
+def assert_same_artifacts(reader, g2c_artifact_list):
+    assert len(reader) == len(g2c_artifact_list)
+    for index, g2c_artifact in enumerate(g2c_artifact_list):
+        row = reader.row(index)
+        for key in ('refer_id', 'set_key', 'slot_key', 'main_stat_key', 'rarity', 'level', 'rank', 'lock', 'best_score'):
+            assert row[key] == g2c_artifact[key]
+        assert row['best_build'] == (g2c_artifact['best_build'] or None)
+        assert row['build_score'] == {
+            f"{build_score['character']} - {build_score['name']}": build_score['score']
+            for build_score in g2c_artifact['build_score']
+        }
+
+
+def test_round_trip(tmp_path, g2c_output, build_list):
+    with columnar.ColumnarReader(write_columnar_file(tmp_path, g2c_output, build_list)) as reader:
+        assert_same_artifacts(reader, g2c_output)
+
+
+def test_same_content_as_pipeline(tmp_path, good, build_list):
+    columnar_file_name = tmp_path / 'pipeline.bin'
+    columnar_file_name.write_bytes(g2c.process_good(good, build_list, 'columnar', 'keep')[0])
+
+    with columnar.ColumnarReader(str(columnar_file_name)) as reader:
+        assert_same_artifacts(reader, json.loads(g2c.process_good(good, build_list, 'g2c', 'keep')[0]))
+
+
+def test_string_refer_ids(tmp_path, g2c_output, build_list):
+    g2c_artifact_list = [{**g2c_artifact, 'refer_id': f'artifact-{g2c_artifact["refer_id"]}'} for g2c_artifact in g2c_output]
+
+    with columnar.ColumnarReader(write_columnar_file(tmp_path, g2c_artifact_list, build_list)) as reader:
+        assert reader.values('refer_id') == [g2c_artifact['refer_id'] for g2c_artifact in g2c_artifact_list]
+
+
+def test_counts(tmp_path, g2c_output, build_list):
+    build_counts = Counter(
+        f"{build_score['character']} - {build_score['name']}"
+        for g2c_artifact in g2c_output for build_score in g2c_artifact['build_score']
+    )
+
+    with columnar.ColumnarReader(write_columnar_file(tmp_path, g2c_output, build_list)) as reader:
+        assert reader.count_by('set_key') == Counter(g2c_artifact['set_key'] for g2c_artifact in g2c_output)
+        assert reader.count_builds() == dict(build_counts)
+        assert list(reader.count_builds()) == list(build_counts)
+
+
+def test_invalid_file(tmp_path):
+    invalid_file_name = tmp_path / 'invalid.bin'
+    invalid_file_name.write_bytes(b'G2CX' + bytes(64))
+
+    with pytest.raises(ValueError):
+        columnar.ColumnarReader(str(invalid_file_name))
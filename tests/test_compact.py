@@ -0,0 +1,64 @@
+import json
+import threading
+
+import main as g2c
+import src.artifact.compact as compact
+import src.scoring.loadouts as loadout_optimizer
+
+
+def assert_round_trip(g2c_artifact_list):
+    unpacked_artifact_list = compact.unpack_artifact_list(compact.pack_artifact_list(g2c_artifact_list))
+
+    assert unpacked_artifact_list == g2c_artifact_list
+    assert json.dumps(unpacked_artifact_list) == json.dumps(g2c_artifact_list)
+
+
+def test_round_trip_generated_artifacts(good):
+    assert_round_trip(g2c.generate_g2c_artifact_list_from_good(good['artifacts']))
+
+
+def test_round_trip_hydrated_artifacts(g2c_artifact_list):
+    assert_round_trip(g2c_artifact_list)
+
+
+def test_round_trip_scored_artifacts(g2c_artifact_list, build_list):
+    scored_artifact_list = g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+    assert_round_trip(g2c.lock_unlock_artifacts(scored_artifact_list, True))
+
+
+def test_round_trip_extra_fields(g2c_artifact_list, build_list):
+    marked_artifact_list = g2c.mark_dominated_artifacts(g2c_artifact_list, build_list)
+    scored_artifact_list = g2c.get_artifacts_with_build_scores(marked_artifact_list, build_list)
+    assert_round_trip(marked_artifact_list)
+    assert_round_trip(loadout_optimizer.keep_loadout_artifacts(scored_artifact_list, build_list, 2))
+
+
+def test_unknown_keys_are_interned(g2c_artifact_list):
+    g2c_artifact = {**g2c_artifact_list[0], 'set_key': 'UnreleasedSet'}
+
+    compact_artifact = compact.CompactArtifact.from_g2c_artifact(g2c_artifact)
+
+    assert compact_artifact.set_key == 'UnreleasedSet'
+    assert compact_artifact.to_g2c_artifact() == g2c_artifact
+
+
+def test_concurrent_interning():
+    key_table = []
+    key_codes = dict()
+    keys = [f'UnreleasedSet{index}' for index in range(500)]
+    barrier = threading.Barrier(8)
+    thread_codes = []
+
+    def intern_keys():
+        barrier.wait()
+        thread_codes.append([compact.intern_key(key_table, key_codes, key) for key in keys])
+
+    threads = [threading.Thread(target=intern_keys) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(key_table) == sorted(keys)
+    assert all(key_table[code] == key for codes in thread_codes for key, code in zip(keys, codes))
+    assert all(codes == thread_codes[0] for codes in thread_codes)
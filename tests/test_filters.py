@@ -0,0 +1,67 @@
+import pytest
+
+import main as g2c
+
+
+def filter_artifacts_rule_by_rule(g2c_artifact_list, filter_rule_list):
+    """Apply each rule with a full pass and a full sort (the filters before the compiled plan)"""
+    remaining_artifact_list = list(g2c_artifact_list)
+    for filter_rule in filter_rule_list:
+        selected_artifact_list = [
+            artifact for artifact in remaining_artifact_list
+            if all(selector['key'] == '*' or str(artifact[selector['key']]) in selector['value']
+                   for selector in filter_rule['selectors'])
+        ]
+
+        action_key, action_value = filter_rule['action'].values()
+        if action_key == 't':
+            excluded_artifact_list = [artifact for artifact in selected_artifact_list
+                                      if artifact['best_score'] < float(action_value)]
+        else:
+            excluded_artifact_list = sorted(
+                selected_artifact_list, key=lambda artifact: artifact['best_score'], reverse=True
+            )[int(action_value):]
+
+        excluded_ids = {artifact['id'] for artifact in excluded_artifact_list}
+        remaining_artifact_list = [artifact for artifact in remaining_artifact_list if artifact['id'] not in excluded_ids]
+
+    return remaining_artifact_list
+
+
+@pytest.fixture(scope='module')
+def scored_artifact_list(g2c_artifact_list, build_list):
+    return g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+
+
+@pytest.mark.parametrize('filters', [
+    ['*:*=t:0.3'],
+    ['rank:[0;1;2]=t:0.4', 'rank:[3;4]=t:0.5'],
+    ['set_key:[GladiatorsFinale;WanderersTroupe],slot_key:flower=b:2'],
+    ['slot_key:[sands;goblet;circlet]=b:-3'],
+    ['main_stat_key:hp_=b:0', '*:*=b:100'],
+    ['rarity:5,level:[20;16]=t:0.6', 'initial_sub_stats:[3]=b:5', 'initial_sub_stats:4=t:0.5'],
+    ['rank:[05;5;x]=t:0.7'],
+    ['unknown_key:1=t:1', 'set_key:EmblemOfSeveredFate=b:1'],
+])
+def test_same_result_as_rule_by_rule_filters(scored_artifact_list, filters):
+    filter_rule_list = g2c.parse_cli_filter_string(filters)
+
+    assert g2c.filter_artifacts(scored_artifact_list, filter_rule_list) == \
+        filter_artifacts_rule_by_rule(scored_artifact_list, filter_rule_list)
+
+
+def test_compile_filter_rules():
+    filter_rule_list = g2c.parse_cli_filter_string(['*:*,rank:[0;1;01],slot_key:[flower;plume]=t:0.2', 'rarity:5=b:-2'])
+
+    assert g2c.compile_filter_rules(filter_rule_list) == [
+        {'selectors': [('rank', {0, 1}), ('slot_key', {'flower', 'plume'})], 'action': ('t', 0.2)},
+        {'selectors': [('rarity', {5})], 'action': ('b', -2)},
+    ]
+
+
+def test_best_amount_keeps_first_artifacts_on_ties(scored_artifact_list):
+    tied_artifact_list = [{**g2c_artifact, 'best_score': 0.5} for g2c_artifact in scored_artifact_list[:10]]
+
+    filtered_artifact_list = g2c.filter_artifacts(tied_artifact_list, g2c.parse_cli_filter_string(['*:*=b:3']))
+
+    assert filtered_artifact_list == tied_artifact_list[:3]
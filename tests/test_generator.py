@@ -0,0 +1,28 @@
+import benchmarks.generator as generator
+import main as g2c
+import src.artifact.validation as validation
+import src.scoring.build_index as build_index
+
+
+def test_same_seed_same_inventory():
+    artifact_stats_constants = g2c.load_artifact_stats_constants()
+
+    inventory = generator.generate_good(50, artifact_stats_constants, seed=3)
+
+    assert generator.generate_good(50, artifact_stats_constants, seed=3) == inventory
+    assert generator.generate_good(50, artifact_stats_constants, seed=4) != inventory
+    assert generator.generate_build_list(20, seed=3) == generator.generate_build_list(20, seed=3)
+
+
+def test_generated_artifacts_are_valid(good):
+    artifact_stats_constants = g2c.load_artifact_stats_constants()
+
+    for good_artifact in good['artifacts']:
+        assert validation.validate_good_artifact(good_artifact, artifact_stats_constants) == []
+
+
+def test_generated_builds_compile():
+    build_list = [build_index.compile_build(build) for build in generator.generate_build_list(30, seed=5)]
+
+    assert len({(build['character'], build['name']) for build in build_list}) == len(build_list)
+    assert all(build['normalization_factor'] > 0 for build in build_list)
@@ -0,0 +1,70 @@
+from collections import defaultdict
+
+import pytest
+
+import main as g2c
+
+
+def group_artifacts_by_sorting(g2c_artifact_list, group_rule_list):
+    """Sort each whole group and keep its first artifacts (ties keep the first artifacts)"""
+    for group_rule in group_rule_list:
+        groups = defaultdict(list)
+        for index, g2c_artifact in enumerate(g2c_artifact_list):
+            for group, score in g2c.get_artifact_groups(g2c_artifact, group_rule['keys']):
+                groups[group].append((-score, index))
+
+        selected_indexes = {
+            index for group_items in groups.values() for _, index in sorted(group_items)[:group_rule['amount']]
+        }
+        g2c_artifact_list = [g2c_artifact for index, g2c_artifact in enumerate(g2c_artifact_list) if index in selected_indexes]
+
+    return g2c_artifact_list
+
+
+@pytest.fixture(scope='module')
+def scored_artifact_list(g2c_artifact_list, build_list):
+    return g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+
+
+@pytest.mark.parametrize('groups', [
+    ['set_key=1'],
+    ['set_key,slot_key=2'],
+    ['slot_key,main_stat_key,rank=3'],
+    ['build=1'],
+    ['slot_key,build=2', 'set_key=4'],
+    ['rarity=0'],
+    ['unknown=1', 'level,slot_key=5'],
+])
+def test_same_result_as_sorting_each_group(scored_artifact_list, groups):
+    group_rule_list = g2c.parse_cli_group_string(groups)
+
+    assert g2c.group_artifacts(scored_artifact_list, group_rule_list) == \
+        group_artifacts_by_sorting(scored_artifact_list, group_rule_list)
+
+
+def test_ties_keep_first_artifacts(scored_artifact_list):
+    tied_artifact_list = [{**g2c_artifact, 'best_score': 0.5} for g2c_artifact in scored_artifact_list[:10]]
+
+    assert g2c.group_artifacts(tied_artifact_list, [{'keys': ['rarity'], 'amount': 3}]) == tied_artifact_list[:3]
+
+
+def test_artifacts_consumed_one_by_one(scored_artifact_list):
+    group_rule = {'keys': ['set_key', 'slot_key'], 'amount': 2}
+
+    selected_indexes = g2c.select_best_artifacts_per_group(
+        ((index, g2c_artifact) for index, g2c_artifact in enumerate(scored_artifact_list)), group_rule
+    )
+
+    assert [scored_artifact_list[index] for index in sorted(selected_indexes)] == \
+        g2c.group_artifacts(scored_artifact_list, [group_rule])
+
+
+def test_build_groups():
+    g2c_artifact = {'set_key': 'A', 'best_score': 0.7, 'build_score': [
+        {'character': 'Amber', 'name': 'DPS', 'score': 0.7}, {'character': 'Bennett', 'name': 'Support', 'score': 0.4}
+    ]}
+
+    assert g2c.get_artifact_groups(g2c_artifact, ['set_key']) == [(('A',), 0.7)]
+    assert g2c.get_artifact_groups(g2c_artifact, ['build', 'set_key']) == [
+        (('A', 'Amber - DPS'), 0.7), (('A', 'Bennett - Support'), 0.4)
+    ]
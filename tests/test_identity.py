@@ -0,0 +1,27 @@
+import main as g2c
+import src.artifact.identity as artifact_identity
+
+
+def test_same_ids_on_every_run(good):
+    first_artifact_list = g2c.generate_g2c_artifact_list_from_good(good['artifacts'])
+    second_artifact_list = g2c.generate_g2c_artifact_list_from_good(good['artifacts'])
+
+    assert [g2c_artifact['id'] for g2c_artifact in first_artifact_list] == \
+        [g2c_artifact['id'] for g2c_artifact in second_artifact_list]
+    assert len({g2c_artifact['id'] for g2c_artifact in first_artifact_list}) == len(first_artifact_list)
+
+
+def test_id_ignores_lock_and_location(good):
+    good_artifact = good['artifacts'][0]
+    moved_artifact = {**good_artifact, 'lock': not good_artifact['lock'], 'location': 'Amber'}
+
+    assert artifact_identity.generate_artifact_id(moved_artifact, 0) == \
+        artifact_identity.generate_artifact_id(good_artifact, 0)
+
+
+def test_copies_get_different_ids(good):
+    good_artifact = good['artifacts'][0]
+
+    assert artifact_identity.generate_artifact_id(good_artifact, 0) != artifact_identity.generate_artifact_id(good_artifact, 1)
+    assert artifact_identity.calculate_artifact_hash({**good_artifact, 'level': good_artifact['level'] + 1}) != \
+        artifact_identity.calculate_artifact_hash(good_artifact)
@@ -0,0 +1,92 @@
+import json
+
+from click.testing import CliRunner
+
+import main as g2c
+import src.scoring.incremental as incremental
+
+
+def run_incremental(good, build_list, result_cache_file, filters=()):
+    output, flipped_artifact_list = g2c.process_good(
+        good, build_list, 'g2c', 'keep', filters=filters, result_cache=result_cache_file
+    )
+    return json.loads(output), flipped_artifact_list
+
+
+def test_same_output_as_full_run(tmp_path, good, build_list):
+    result_cache_file = str(tmp_path / 'result-cache.json')
+
+    first_output, _ = run_incremental(good, build_list, result_cache_file)
+    second_output, flipped_artifact_list = run_incremental(good, build_list, result_cache_file)
+
+    assert first_output == second_output == json.loads(g2c.process_good(good, build_list, 'g2c', 'keep')[0])
+    assert flipped_artifact_list == []
+
+
+def test_flipped_artifacts(tmp_path, good, build_list):
+    result_cache_file = str(tmp_path / 'result-cache.json')
+
+    low_threshold_output, _ = run_incremental(good, build_list, result_cache_file, ['*:*=t:0.2'])
+    high_threshold_output, flipped_artifact_list = run_incremental(good, build_list, result_cache_file, ['*:*=t:0.4'])
+
+    flipped_refer_ids = {g2c_artifact['refer_id'] for g2c_artifact in flipped_artifact_list}
+    assert flipped_refer_ids
+    assert flipped_refer_ids == {g2c_artifact['refer_id'] for g2c_artifact in low_threshold_output} - \
+        {g2c_artifact['refer_id'] for g2c_artifact in high_threshold_output}
+    assert all(g2c_artifact['previous_lock'] and not g2c_artifact['lock'] for g2c_artifact in flipped_artifact_list)
+
+
+def test_copies_with_same_content(tmp_path, good, build_list):
+    # the best artifact and a copy with another id: one is kept and the other discarded on every run
+    best_artifact = max(json.loads(g2c.process_good(good, build_list)[0]), key=lambda g2c_artifact: g2c_artifact['best_score'])
+    copied_artifact = {**best_artifact['artifact_data'], 'id': len(good['artifacts'])}
+    good_with_copy = {**good, 'artifacts': [*good['artifacts'], copied_artifact]}
+    result_cache_file = str(tmp_path / 'result-cache.json')
+
+    for _ in range(3):
+        output, flipped_artifact_list = run_incremental(good_with_copy, build_list, result_cache_file, ['*:*=b:1'])
+        assert len(output) == 1
+        assert flipped_artifact_list == []
+
+
+def test_outdated_cache(tmp_path):
+    result_cache_file = tmp_path / 'result-cache.json'
+    result_cache_file.write_text(json.dumps({'version': 0, 'artifacts': {'hash': {'scores': {}, 'lock': True}}}))
+
+    result_cache = incremental.read_result_cache(str(result_cache_file), 'artifact-max-stats.json')
+
+    assert result_cache['version'] == incremental.result_cache_version
+    assert result_cache['artifacts'] == {}
+    assert result_cache['locks'] == {}
+
+
+def test_flipped_artifacts_written_by_main(tmp_path, good, good_file, build_list, capsys):
+    result_cache_file = str(tmp_path / 'result-cache.json')
+
+    assert g2c.process_good(good, build_list)[1] is None
+    low_threshold_output, _ = run_incremental(good, build_list, result_cache_file, ['*:*=t:0.2'])
+    assert capsys.readouterr().err == ''
+
+    result = CliRunner(mix_stderr=False).invoke(g2c.main, ['-i', good_file, '-r', result_cache_file, '-f', '*:*=t:0.4'])
+
+    assert result.exit_code == 0, result.stderr
+    assert {g2c_artifact['refer_id'] for g2c_artifact in json.loads(result.stderr)} == \
+        {g2c_artifact['refer_id'] for g2c_artifact in low_threshold_output} - \
+        {g2c_artifact['refer_id'] for g2c_artifact in json.loads(result.stdout)}
+
+
+def test_cache_written_during_another_write(tmp_path, monkeypatch):
+    cache_file_name = str(tmp_path / 'result-cache.json')
+    json_dump = json.dump
+
+    def dump_during_another_write(value, cache_file):
+        # another run writes the cache while this one is writing
+        monkeypatch.setattr(json, 'dump', json_dump)
+        incremental.write_result_cache(cache_file_name, {'version': 0, 'artifacts': {'other': {}, 'another': {}}})
+        json_dump(value, cache_file)
+
+    monkeypatch.setattr(json, 'dump', dump_during_another_write)
+    incremental.write_result_cache(cache_file_name, {'version': 0, 'artifacts': {'hash': {}}})
+
+    assert json.loads((tmp_path / 'result-cache.json').read_text()) == {'version': 0, 'artifacts': {'hash': {}}}
+    assert [path.name for path in tmp_path.iterdir()] == ['result-cache.json']
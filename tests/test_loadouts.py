@@ -0,0 +1,71 @@
+import itertools
+import random
+import time
+
+from collections import Counter
+
+import pytest
+
+import main as g2c
+import src.scoring.loadouts as loadout_optimizer
+
+
+def find_top_loadouts_by_brute_force(slot_candidates, top_k, set_pieces):
+    loadout_scores = [
+        round(sum(score for score, _, _ in loadout), 2)
+        for loadout in itertools.product(*slot_candidates)
+        if not set_pieces or max(Counter(set_key for _, _, set_key in loadout).values()) >= set_pieces
+    ]
+    return sorted(loadout_scores, reverse=True)[:top_k]
+
+
+def generate_slot_candidates(generator_random, candidate_amount, set_keys):
+    slot_candidates = []
+    for slot_index in range(5):
+        candidates = [
+            (round(generator_random.uniform(0, 1), 2), slot_index * candidate_amount + index,
+             generator_random.choice(set_keys))
+            for index in range(candidate_amount)
+        ]
+        slot_candidates.append(sorted(candidates, key=lambda candidate: (-candidate[0], candidate[1])))
+    return slot_candidates
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_same_scores_as_brute_force(seed):
+    generator_random = random.Random(seed)
+    slot_candidates = generate_slot_candidates(
+        generator_random, generator_random.randint(1, 5), generator_random.sample('ABCDE', generator_random.randint(1, 4))
+    )
+    top_k = generator_random.choice([1, 3, 10])
+
+    for set_pieces in (0, loadout_optimizer.loadout_set_pieces):
+        top_loadouts = loadout_optimizer.find_top_loadouts(slot_candidates, top_k, set_pieces)
+        assert [score for score, _ in top_loadouts] == find_top_loadouts_by_brute_force(slot_candidates, top_k, set_pieces)
+
+
+def test_missing_slot():
+    assert loadout_optimizer.find_top_loadouts([[(1.0, 0, 'A')], [], [], [], []], 1) == []
+
+
+def test_no_set_reaching_required_pieces():
+    generator_random = random.Random(0)
+    # 3 slots with artifacts of one set and 2 slots of another one: no set reaches 4 pieces
+    slot_candidates = generate_slot_candidates(generator_random, 20, 'A')
+    for slot_index in (3, 4):
+        slot_candidates[slot_index] = [(score, position, 'B') for score, position, _ in slot_candidates[slot_index]]
+
+    started_at = time.perf_counter()
+    assert loadout_optimizer.find_top_loadouts(slot_candidates, 3, loadout_optimizer.loadout_set_pieces) == []
+    assert time.perf_counter() - started_at < 0.1
+
+
+def test_keep_loadout_artifacts(g2c_artifact_list, build_list):
+    scored_artifact_list = g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+
+    kept_artifact_list = loadout_optimizer.keep_loadout_artifacts(scored_artifact_list, build_list, 2)
+
+    assert kept_artifact_list
+    for g2c_artifact in kept_artifact_list:
+        assert g2c_artifact['loadouts']
+        assert all(loadout['rank'] in (1, 2) for loadout in g2c_artifact['loadouts'])
@@ -0,0 +1,107 @@
+import itertools
+import json
+import math
+
+from collections import defaultdict
+
+import pytest
+
+import main as g2c
+import src.scoring.build_index as build_index
+
+numpy = pytest.importorskip('numpy')
+upgrade_potential = pytest.importorskip('src.scoring.potential')
+
+sub_stat_keys = ('critRate_', 'critDMG_', 'atk_', 'hp_')
+candidate_keys = ('def', 'def_', 'eleMas', 'enerRech_')
+weight_sets = [
+    {'hp_': -1, 'def_': -0.5, 'critRate_': 1},
+    {'critRate_': 1, 'critDMG_': 1, 'atk_': 0.5},
+    {'critRate_': -1, 'critDMG_': 0, 'atk_': 0, 'hp_': 1, 'eleMas': 0.4},
+    {'def': 1, 'def_': -1},
+    {},
+]
+
+
+def enumerate_gains(sub_stat_amount, remaining_rolls, weights, gain_factor):
+    """Return {gain: probability} of every order of added sub stats and every roll (no shared distributions)"""
+    new_sub_stat_amount = min(upgrade_potential.max_sub_stats - sub_stat_amount, remaining_rolls)
+    new_sub_stat_orders = list(itertools.permutations(candidate_keys, new_sub_stat_amount))
+
+    gains = defaultdict(float)
+    for new_sub_stat_keys in new_sub_stat_orders:
+        slot_keys = sub_stat_keys[:sub_stat_amount] + new_sub_stat_keys
+        roll_choices = [
+            [(slot, tier) for tier in upgrade_potential.roll_tiers]
+            for slot in range(sub_stat_amount, len(slot_keys))
+        ] + [
+            [(slot, tier) for slot in range(len(slot_keys)) for tier in upgrade_potential.roll_tiers]
+        ] * (remaining_rolls - new_sub_stat_amount)
+
+        probability = 1 / len(new_sub_stat_orders) / math.prod(len(choices) for choices in roll_choices)
+        for rolls in itertools.product(*roll_choices):
+            gain = sum(weights.get(slot_keys[slot], 0) * tier for slot, tier in rolls) * gain_factor
+            gains[round(gain, 9)] += probability
+
+    return gains
+
+
+def get_percentile(gains, percentile):
+    cumulative_probability = 0
+    for gain, probability in sorted(gains.items()):
+        cumulative_probability += probability
+        if cumulative_probability >= percentile / 100 - 1e-9:
+            return gain
+
+
+@pytest.mark.parametrize('sub_stat_amount, remaining_rolls', [(4, 3), (3, 3), (2, 3), (3, 1), (4, 0)])
+@pytest.mark.parametrize('first_weights', range(len(weight_sets)))
+def test_same_gains_as_enumerating_rolls(sub_stat_amount, remaining_rolls, first_weights):
+    # every weight set is evaluated in the same histogram, starting with a different one
+    ordered_weight_sets = weight_sets[first_weights:] + weight_sets[:first_weights]
+    gain_factor = 0.01
+    weight_rows = [
+        (upgrade_potential.get_upgrade_weights(
+            sub_stat_keys[:sub_stat_amount], candidate_keys, remaining_rolls, weights
+        ), gain_factor)
+        for weights in ordered_weight_sets
+    ]
+    tier_sums, probabilities = upgrade_potential.get_roll_distribution(sub_stat_amount, remaining_rolls)
+
+    estimates = upgrade_potential.estimate_gains(weight_rows, tier_sums, probabilities).tolist()
+
+    for weights, (expected_gain, *percentile_gains) in zip(ordered_weight_sets, estimates):
+        gains = enumerate_gains(sub_stat_amount, remaining_rolls, weights, gain_factor)
+        assert expected_gain == pytest.approx(sum(gain * probability for gain, probability in gains.items()), abs=1e-9)
+        for percentile, percentile_gain in zip(upgrade_potential.potential_percentiles, percentile_gains):
+            assert percentile_gain == pytest.approx(
+                get_percentile(gains, percentile), abs=1 / upgrade_potential.gain_bins_per_score
+            )
+
+
+def test_builds_with_negative_weights(good):
+    build_list = [
+        build_index.compile_build({'character': 'Amber', 'name': 'DPS', 'filter': {},
+                                   'sub_stats': {'hp': -0.5, 'atk_': 1, 'critRate_': 1, 'critDMG_': 1}}),
+        build_index.compile_build({'character': 'Bennett', 'name': 'Support', 'filter': {},
+                                   'sub_stats': {'hp_': 1, 'enerRech_': 1, 'critRate_': -1}}),
+    ]
+
+    g2c_artifact_list = json.loads(g2c.process_good(good, build_list, potential=True)[0])
+
+    assert g2c_artifact_list
+    for g2c_artifact in g2c_artifact_list:
+        for build_score in g2c_artifact['build_score']:
+            assert build_score['p10_score'] <= build_score['p50_score'] <= build_score['p90_score']
+            if g2c_artifact['rank'] == g2c_artifact['rarity']:
+                assert build_score['expected_score'] == build_score['p10_score'] == build_score['score']
+
+
+def test_artifacts_at_maximum_level_keep_their_scores(g2c_artifact_list, build_list):
+    scored_artifact_list = g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+
+    for g2c_artifact in upgrade_potential.hydrate_upgrade_potential(scored_artifact_list, build_list):
+        assert g2c_artifact['expected_score'] >= 0
+        if g2c_artifact['rank'] == g2c_artifact['rarity']:
+            assert g2c_artifact['expected_score'] == g2c_artifact['best_score']
+            assert all(build_score['p90_score'] == build_score['score'] for build_score in g2c_artifact['build_score'])
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import main as g2c
+import src.instrumentation.profiler as profiling
+
+
+def count_scored_artifacts(monkeypatch, good, build_list, profiler):
+    scored_artifacts = []
+    score_artifact = g2c.score_artifact
+    monkeypatch.setattr(g2c, 'score_artifact', lambda *args: scored_artifacts.append(args) or score_artifact(*args))
+    output, _ = g2c.process_good(good, build_list, profiler=profiler)
+    monkeypatch.setattr(g2c, 'score_artifact', score_artifact)
+    return output, len(scored_artifacts)
+
+
+def test_build_costs_measured_while_scoring(monkeypatch, good, build_list):
+    profiler = profiling.StageProfiler()
+
+    output, scored_artifacts = count_scored_artifacts(monkeypatch, good, build_list, profiler)
+
+    # artifacts are scored once, not again for the build costs
+    assert (output, scored_artifacts) == count_scored_artifacts(monkeypatch, good, build_list, profiling.null_profiler)
+    assert sum(build_cost['artifacts'] for build_cost in profiler.build_costs) == scored_artifacts
+    score_stage = next(stage for stage in profiler.stages if stage['name'] == 'score_python')
+    assert sum(build_cost['wall_seconds'] for build_cost in profiler.build_costs) <= score_stage['wall_seconds']
+
+    build_names = [name for build_cost in profiler.build_costs for name in build_cost['builds']]
+    assert len(build_names) == len(set(build_names))
+    assert set(build_names) <= {f"{build['character']} - {build['name']}" for build in build_list}
+
+
+def test_numpy_engine_has_no_build_costs(good, build_list):
+    pytest.importorskip('numpy')
+    profiler = profiling.StageProfiler()
+
+    g2c.process_good(good, build_list, engine='numpy', profiler=profiler)
+
+    assert 'score_numpy' in [stage['name'] for stage in profiler.stages]
+    assert profiler.build_costs == []
+    assert json.loads(profiler.to_json())['builds'] == []
+
+
+def test_reports(good, build_list):
+    profiler = profiling.StageProfiler(memory=True)
+
+    g2c.process_good(good, build_list, profiler=profiler)
+
+    stage_names = [stage['name'] for stage in profiler.stages]
+    assert stage_names[:2] == ['generate_g2c', 'hydrate_efficiency']
+    assert all(stage['peak_bytes'] >= 0 for stage in profiler.stages)
+    assert all(stage_name in profiler.report('table') for stage_name in stage_names)
+    assert json.loads(profiler.report('json'))['stages'] == profiler.stages
+    assert [trace_event['name'] for trace_event in json.loads(profiler.report('chrome'))['traceEvents']] == stage_names
+
+
+def test_profile_file(good_file, tmp_path):
+    profile_file = tmp_path / 'profile.json'
+
+    result = CliRunner(mix_stderr=False).invoke(
+        g2c.main,
+        ['-i', good_file, '-o', 'count', '--profile', '--profile-format', 'json', '--profile-file', str(profile_file)]
+    )
+
+    assert result.exit_code == 0, result.stderr
+    profile = json.loads(profile_file.read_text())
+    assert 'score_python' in [stage['name'] for stage in profile['stages']]
+    assert profile['builds']
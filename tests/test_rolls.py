@@ -0,0 +1,104 @@
+import itertools
+import math
+import random
+
+from collections import defaultdict
+
+import pytest
+
+import main as g2c
+import src.artifact.rolls as rolls
+import src.database.stats as stat_database
+
+
+@pytest.mark.parametrize('roll_amount', range(rolls.max_sub_stat_rolls + 1))
+def test_tier_combinations(roll_amount):
+    tier_combinations = defaultdict(list)
+    for combination in itertools.combinations_with_replacement(rolls.roll_tiers, roll_amount):
+        tier_combinations[sum(combination)].append(combination)
+
+    assert {tier_sum: sorted(combinations) for tier_sum, combinations in rolls.get_tier_combinations(roll_amount).items()} == \
+        {tier_sum: sorted(combinations) for tier_sum, combinations in tier_combinations.items()}
+
+
+@pytest.mark.parametrize('sub_stat_key', ['critRate_', 'critDMG_', 'hp', 'eleMas'])
+@pytest.mark.parametrize('rarity', ['4', '5'])
+def test_roll_table_contains_every_rolled_value(sub_stat_key, rarity):
+    max_roll_value = g2c.load_artifact_stats_constants()[sub_stat_key][rarity]
+    roll_table = rolls.get_roll_table(sub_stat_key, max_roll_value)
+
+    for roll_amount in range(1, rolls.max_sub_stat_rolls + 1):
+        for combination in itertools.combinations_with_replacement(rolls.roll_tiers, roll_amount):
+            roll_amounts, decomposition = roll_table[round(max_roll_value * sum(combination) / 10, 1)]
+            assert roll_amount in roll_amounts
+            assert combination in decomposition[roll_amount]
+
+
+def test_unreachable_value():
+    max_roll_value = g2c.load_artifact_stats_constants()['critRate_']['5']
+
+    assert 1.0 not in rolls.get_roll_table('critRate_', max_roll_value)
+
+
+@pytest.mark.parametrize('candidate_rolls, rarity, rank, resolved', [
+    (((1,), (1, 2), (1,), (1,)), 5, 0, ((1, 1, 1, 1), 4)),
+    (((1,), (1, 2), (1,), (1,)), 5, 1, ((1, None, 1, 1), None)),
+    (((1,), (1,), (1,)), 5, 0, ((1, 1, 1), 3)),
+    (((2, 3), (3, 4), (1,), (1,)), 5, 5, ((None, None, 1, 1), None)),
+    (((2,), (4,), (1,), (1,)), 5, 5, ((2, 4, 1, 1), 3)),
+    (((1,), (1,), (1,)), 5, 4, ((None, None, None), None)),
+    (((), (1,), (1,), (1,)), 5, 0, ((None, None, None, None), None)),
+    (((1,), (1,)), 4, 0, ((1, 1), 2)),
+])
+def test_resolve_roll_amounts(candidate_rolls, rarity, rank, resolved):
+    assert rolls.resolve_roll_amounts(candidate_rolls, rarity, rank) == resolved
+
+
+def generate_rolled_good_artifact(generator_random, artifact_stats_constants, rarity):
+    """Return GOOD artifact with its amount of rolls per sub stat and initial amount of sub stats"""
+    initial_sub_stats = generator_random.choice([rarity - 2, rarity - 1])
+    rank = generator_random.randint(0, rarity)
+    sub_stat_keys = generator_random.sample([key for key in stat_database.sub_stats if key != 'hp'], 4)
+    sub_stat_keys = sub_stat_keys[:min(initial_sub_stats + rank, 4)]
+
+    tiers = {sub_stat_key: [generator_random.choice(rolls.roll_tiers)] for sub_stat_key in sub_stat_keys}
+    for roll in range(initial_sub_stats + rank - len(sub_stat_keys)):
+        tiers[generator_random.choice(sub_stat_keys)].append(generator_random.choice(rolls.roll_tiers))
+
+    sub_stats = [
+        {'key': key, 'value': round(artifact_stats_constants[key][str(rarity)] * sum(key_tiers) / 10, 1)}
+        for key, key_tiers in tiers.items()
+    ]
+    sub_stats += [{'key': None, 'value': 0}] * (4 - len(sub_stats))
+    good_artifact = {
+        'setKey': 'GladiatorsFinale', 'slotKey': 'flower', 'mainStatKey': 'hp', 'rarity': rarity,
+        'level': rank * 4 + generator_random.randint(0, 3) if rank < rarity else rarity * 4,
+        'substats': sub_stats, 'location': '', 'lock': False,
+    }
+    return good_artifact, [len(key_tiers) for key_tiers in tiers.values()], initial_sub_stats
+
+
+def test_hydrated_rolls_match_generated_rolls():
+    generator_random = random.Random(0)
+    artifact_stats_constants = g2c.load_artifact_stats_constants()
+
+    resolved = 0
+    for index in range(2000):
+        good_artifact, roll_amounts, initial_sub_stats = generate_rolled_good_artifact(
+            generator_random, artifact_stats_constants, generator_random.choice([4, 5])
+        )
+        g2c_artifact = g2c.hydrate_sub_stats_efficiency(g2c.generate_g2c_artifact_list_from_good([good_artifact], index))[0]
+
+        rolled_sub_stats = [sub_stat for sub_stat in g2c_artifact['sub_stats'] if sub_stat['key'] is not None]
+        for sub_stat, roll_amount in zip(rolled_sub_stats, roll_amounts):
+            assert sub_stat['rolls'] in (roll_amount, None)
+            if sub_stat['rolls'] is not None:
+                assert sub_stat['roll_tiers']
+                assert all(len(roll_tiers) == roll_amount for roll_tiers in sub_stat['roll_tiers'])
+                max_roll_value = artifact_stats_constants[sub_stat['key']][str(g2c_artifact['rarity'])]
+                assert math.isclose(sum(sub_stat['roll_tiers'][0]) * max_roll_value / 10, sub_stat['value'], abs_tol=0.051)
+        assert g2c_artifact['initial_sub_stats'] in (initial_sub_stats, None)
+        resolved += all(sub_stat['rolls'] is not None for sub_stat in rolled_sub_stats)
+
+    # most artifacts have a single decomposition consistent with their amount of rolls
+    assert resolved > 1000
@@ -0,0 +1,181 @@
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from click.testing import CliRunner
+
+import server
+
+
+@pytest.fixture(scope='module')
+def scoring_server(repository_directory):
+    scoring_server = server.ScoringServer(('127.0.0.1', 0), server.ScoringRequestHandler)
+    scoring_server.build_library = server.BuildLibrary('builds/', None, reload_interval=60)
+    scoring_server.metrics = server.LatencyMetrics()
+    scoring_server.what_if_sessions = server.WhatIfSessions()
+    scoring_server.verbose = False
+
+    thread = threading.Thread(target=scoring_server.serve_forever, daemon=True)
+    thread.start()
+    yield scoring_server
+    scoring_server.shutdown()
+    scoring_server.server_close()
+
+
+def request(scoring_server, method, path, body=None):
+    connection = http.client.HTTPConnection(*scoring_server.server_address, timeout=30)
+    connection.request(method, path, body=None if body is None else json.dumps(body))
+    response = connection.getresponse()
+    content = response.read()
+    connection.close()
+    return response.status, json.loads(content)
+
+
+def get_endpoint_errors(scoring_server, endpoint):
+    return scoring_server.metrics.summary().get(endpoint, {'errors': 0})['errors']
+
+
+def wait_for_endpoint_errors(scoring_server, endpoint, errors, timeout=5):
+    """Return errors of the endpoint once it reaches the expected amount (metrics are recorded after the response)"""
+    deadline = time.monotonic() + timeout
+    while get_endpoint_errors(scoring_server, endpoint) < errors and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return get_endpoint_errors(scoring_server, endpoint)
+
+
+def test_score_artifact(scoring_server, good):
+    status, body = request(scoring_server, 'POST', '/artifact', good['artifacts'][0])
+
+    assert status == 200
+    assert {'keep', 'best_score', 'best_build', 'build_score'} <= body.keys()
+
+
+def test_good_output(scoring_server, good, build_list):
+    import main as g2c
+
+    status, body = request(scoring_server, 'POST', '/good?output=count&mode=all', good)
+
+    assert status == 200
+    assert body == {'count': g2c.process_good(good, build_list, 'count', 'all')[0]}
+
+
+@pytest.mark.parametrize('path, body', [
+    ('/artifact', [1]),
+    ('/artifacts', {'setKey': 'GladiatorsFinale'}),
+    ('/artifacts', [1]),
+    ('/good', []),
+    ('/what-if', 'GOOD'),
+])
+def test_malformed_body(scoring_server, path, body):
+    errors = get_endpoint_errors(scoring_server, f'POST {path}')
+
+    status, response_body = request(scoring_server, 'POST', path, body)
+
+    assert status == 400
+    assert 'error' in response_body
+    assert wait_for_endpoint_errors(scoring_server, f'POST {path}', errors + 1) == errors + 1
+
+
+@pytest.mark.parametrize('query', ['output=xyz', 'mode=kept', 'engine=rust', 'limit=-1', 'loadouts=0', 'limit=ten'])
+def test_invalid_good_query(scoring_server, good, query):
+    status, body = request(scoring_server, 'POST', f'/good?{query}', good)
+
+    assert status == 400
+    assert query.split('=')[0] in body['error'] or 'int()' in body['error']
+
+
+def test_unexpected_error(scoring_server, monkeypatch, good, capsys):
+    def fail(*args, **kwargs):
+        raise RuntimeError('unexpected')
+
+    monkeypatch.setattr(server, 'score_good_artifact', fail)
+    errors = get_endpoint_errors(scoring_server, 'POST /artifact')
+
+    status, body = request(scoring_server, 'POST', '/artifact', good['artifacts'][0])
+
+    assert status == 500
+    assert 'unexpected' in body['error']
+    assert wait_for_endpoint_errors(scoring_server, 'POST /artifact', errors + 1) == errors + 1
+
+
+def test_build_library_reload(tmp_path, build_list):
+    build_dir = tmp_path / 'builds'
+    build_dir.mkdir()
+    builds = [{key: build[key] for key in ('character', 'name', 'filter', 'sub_stats')} for build in build_list[:3]]
+    (build_dir / 'first.json').write_text(json.dumps(builds[0]))
+    build_library = server.BuildLibrary(str(build_dir), None, reload_interval=0)
+    first_builds = build_library.get()
+
+    (build_dir / 'second.json').write_text(json.dumps(builds[1]))
+    (build_dir / 'third.json').write_text(json.dumps(builds[2]))
+    reloaded_build_list, reloaded_inverted_build_index = build_library.get()
+
+    assert len(first_builds[0]) == 1 and len(reloaded_build_list) == 3
+    assert build_library.reloads == 2
+    # the build list and its index always come from the same reload
+    assert reloaded_inverted_build_index == server.build_index.create_inverted_build_index(reloaded_build_list)
+    assert max(max(indexes) for indexes in first_builds[1].values()) == 0
+
+
+def test_build_library_get_during_reloads(tmp_path, build_list):
+    build_dir = tmp_path / 'builds'
+    build_dir.mkdir()
+    build = {key: build_list[0][key] for key in ('character', 'name', 'filter', 'sub_stats')}
+    (build_dir / 'first.json').write_text(json.dumps(build))
+    build_library = server.BuildLibrary(str(build_dir), None, reload_interval=60)
+    finished = threading.Event()
+
+    def reload_builds():
+        for reload_index in range(50):
+            if reload_index % 2:
+                (build_dir / 'second.json').unlink()
+            else:
+                (build_dir / 'second.json').write_text(json.dumps(build))
+            build_library.reload()
+        finished.set()
+
+    thread = threading.Thread(target=reload_builds)
+    thread.start()
+    while not finished.is_set():
+        reloaded_build_list, reloaded_inverted_build_index = build_library.get()
+        assert all(index < len(reloaded_build_list) for indexes in reloaded_inverted_build_index.values() for index in indexes)
+    thread.join()
+
+
+def test_get_query_choice():
+    assert server.get_query_choice({}, 'output', server.output_formats) == 'g2c'
+    assert server.get_query_choice({'output': ['g2c', 'COUNT']}, 'output', server.output_formats) == 'count'
+    with pytest.raises(ValueError):
+        server.get_query_choice({'output': ['xyz']}, 'output', server.output_formats)
+
+
+def test_get_query_int():
+    assert server.get_query_int({}, 'limit', 0) is None
+    assert server.get_query_int({'limit': ['0']}, 'limit', 0) == 0
+    with pytest.raises(ValueError):
+        server.get_query_int({'loadouts': ['0']}, 'loadouts', 1)
+
+
+def test_unix_socket_path_with_regular_file(tmp_path):
+    regular_file = tmp_path / 'g2c.sock'
+    regular_file.write_text('not a socket')
+
+    result = CliRunner().invoke(server.main, ['-u', str(regular_file), '-c', ''])
+
+    assert result.exit_code != 0
+    assert 'is not a socket' in result.output
+    assert regular_file.read_text() == 'not a socket'
+
+
+def test_remove_socket(tmp_path):
+    socket_file_name = str(tmp_path / 'g2c.sock')
+    with socket.socket(socket.AF_UNIX) as unix_socket:
+        unix_socket.bind(socket_file_name)
+
+    server.remove_socket(socket_file_name)
+
+    assert not (tmp_path / 'g2c.sock').exists()
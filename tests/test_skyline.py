@@ -0,0 +1,73 @@
+import json
+import random
+
+import pytest
+
+import benchmarks.generator as generator
+import main as g2c
+import src.scoring.skyline as skyline
+
+
+@pytest.fixture(scope='module')
+def large_artifact_list():
+    # dominated artifacts need others with the same set, slot and main stat
+    good = generator.generate_good(3000, g2c.load_artifact_stats_constants(), seed=11)
+    artifact_list = g2c.generate_g2c_artifact_list_from_good(good['artifacts'])
+    return g2c.remove_artifacts_in_non_maximum_rarity(g2c.hydrate_sub_stats_efficiency(artifact_list))
+
+
+def test_dominates():
+    assert skyline.dominates((2, 1), (1, 1))
+    assert not skyline.dominates((1, 1), (1, 1))
+    assert not skyline.dominates((2, 0), (1, 1))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_find_dominators_like_brute_force(seed):
+    generator_random = random.Random(seed)
+    vector_list = [tuple(generator_random.randint(0, 4) for _ in range(3)) for _ in range(200)]
+
+    dominators = skyline.find_dominators(vector_list)
+
+    for vector, dominator in zip(vector_list, dominators):
+        if dominator is None:
+            assert not any(skyline.dominates(other_vector, vector) for other_vector in vector_list)
+        else:
+            assert skyline.dominates(vector_list[dominator], vector)
+            assert dominators[dominator] is None
+
+
+def test_get_sub_stat_directions():
+    build_list = [{'sub_stats': {'atk_': 1, 'def': -0.5, 'hp': 0.5}}, {'sub_stats': {'atk_': 0.5, 'def': 0, 'hp': -1}}]
+
+    assert skyline.get_sub_stat_directions(build_list) == {'atk_': 1, 'def': -1, 'hp': 0}
+
+
+def test_dominated_artifacts_never_score_higher(large_artifact_list, build_list):
+    marked_artifact_list = g2c.mark_dominated_artifacts(large_artifact_list, build_list)
+    artifacts_by_refer_id = {g2c_artifact['refer_id']: g2c_artifact for g2c_artifact in marked_artifact_list}
+    dominated_artifact_list = [g2c_artifact for g2c_artifact in marked_artifact_list if 'dominated_by' in g2c_artifact]
+    assert dominated_artifact_list
+
+    for g2c_artifact in dominated_artifact_list:
+        dominator = artifacts_by_refer_id[g2c_artifact['dominated_by']]
+        assert 'dominated_by' not in dominator
+        assert (dominator['set_key'], dominator['slot_key'], dominator['main_stat_key']) == \
+            (g2c_artifact['set_key'], g2c_artifact['slot_key'], g2c_artifact['main_stat_key'])
+        for build in build_list:
+            assert g2c.score_artifact(g2c_artifact, build) <= g2c.score_artifact(dominator, build)
+
+
+def test_prune_dominated_only_discards_dominated_artifacts(large_artifact_list, build_list):
+    good = {'format': 'GOOD', 'artifacts': [g2c_artifact['artifact_data'] for g2c_artifact in large_artifact_list]}
+
+    kept_artifact_list = json.loads(g2c.process_good(good, build_list)[0])
+    pruned_artifact_list = json.loads(g2c.process_good(good, build_list, list_mode='all', prune_dominated=True)[0])
+
+    dominated_refer_ids = {
+        g2c_artifact['refer_id'] for g2c_artifact in pruned_artifact_list if 'dominated_by' in g2c_artifact
+    }
+    assert dominated_refer_ids
+    assert all(not g2c_artifact['lock'] for g2c_artifact in pruned_artifact_list if 'dominated_by' in g2c_artifact)
+    assert {g2c_artifact['refer_id'] for g2c_artifact in pruned_artifact_list if g2c_artifact['lock']} == \
+        {g2c_artifact['refer_id'] for g2c_artifact in kept_artifact_list} - dominated_refer_ids
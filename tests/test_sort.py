@@ -0,0 +1,64 @@
+import pytest
+
+import main as g2c
+
+
+def sort_artifacts_rule_by_rule(g2c_artifact_list, sort_rule_list):
+    """Apply one stable sort per rule (the sort before the planned passes)"""
+    for sort_rule in sort_rule_list:
+        if sort_rule['key'] == 'set_key':
+            g2c_artifact_list = g2c.sort_artifacts_by_set_key(g2c_artifact_list, sort_rule['reverse'])
+        elif sort_rule['key'] == 'slot_key':
+            g2c_artifact_list = g2c.sort_artifacts_by_slot_key(g2c_artifact_list, sort_rule['reverse'])
+        else:
+            g2c_artifact_list = sorted(
+                g2c_artifact_list, key=lambda item: item[sort_rule['key']], reverse=sort_rule['reverse']
+            )
+    return g2c_artifact_list
+
+
+@pytest.fixture(scope='module')
+def output_list(g2c_artifact_list, build_list):
+    scored_artifact_list = g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+    return scored_artifact_list + g2c.get_complementary_artifacts(g2c_artifact_list, scored_artifact_list)
+
+
+sort_strings = [
+    'best_score:desc',
+    'rank:desc,best_score:desc',
+    'rarity:desc,level:desc,best_score',
+    'set_key,slot_key,rank:desc,best_score:desc',
+    'slot_key:desc,main_stat_key,level,refer_id:desc',
+    'rank,set_key:desc,best_score:desc,level:desc',
+    'unknown,refer_id',
+]
+
+
+@pytest.mark.parametrize('sort_string', sort_strings)
+def test_same_order_as_rule_by_rule_sorts(output_list, sort_string):
+    sort_rule_list = g2c.parse_cli_sort_string(sort_string)
+
+    assert g2c.sort_artifacts(output_list, sort_rule_list) == sort_artifacts_rule_by_rule(output_list, sort_rule_list)
+
+
+@pytest.mark.parametrize('sort_string', sort_strings)
+@pytest.mark.parametrize('limit', [0, 1, 25, 10000])
+def test_limit_returns_first_sorted_artifacts(output_list, sort_string, limit):
+    sort_rule_list = g2c.parse_cli_sort_string(sort_string)
+
+    assert g2c.sort_artifacts(output_list, sort_rule_list, limit) == \
+        sort_artifacts_rule_by_rule(output_list, sort_rule_list)[:limit]
+
+
+def test_plan_sort_passes():
+    sort_rule_list = g2c.parse_cli_sort_string('set_key,rank:desc,level:desc,best_score,refer_id')
+
+    assert g2c.plan_sort_passes(sort_rule_list) == [
+        {'keys': ['best_score', 'refer_id'], 'reverse': False},
+        {'keys': ['rank', 'level'], 'reverse': True},
+        {'keys': ['set_key'], 'reverse': False},
+    ]
+
+
+def test_limit_without_sort(good, build_list):
+    assert g2c.process_good(good, build_list, 'count', 'all', limit=7)[0] == 7
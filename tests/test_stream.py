@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from click.testing import CliRunner
+
+import main as g2c
+
+
+def run_main(good_file, *args):
+    result = CliRunner().invoke(g2c.main, ['-i', good_file, '-c', '', *args], catch_exceptions=False)
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def sort_by_id(artifact_list, key='refer_id'):
+    return sorted(artifact_list, key=lambda artifact: artifact[key])
+
+
+@pytest.mark.parametrize('list_mode', ['-k', '-d', '-a'])
+@pytest.mark.parametrize('batch_size', ['7', '1000'])
+def test_g2c_output(good_file, list_mode, batch_size):
+    artifact_list = json.loads(run_main(good_file, '-o', 'g2c', list_mode))
+    streamed_artifact_list = json.loads(run_main(good_file, '-o', 'g2c', list_mode, '--stream', '--batch-size', batch_size))
+
+    assert sort_by_id(streamed_artifact_list) == sort_by_id(artifact_list)
+
+
+@pytest.mark.parametrize('list_mode', ['-k', '-d', '-a'])
+def test_good_output(good_file, list_mode):
+    good = json.loads(run_main(good_file, '-o', 'good', list_mode))
+    streamed_good = json.loads(run_main(good_file, '-o', 'good', list_mode, '--stream', '--batch-size', '7'))
+
+    assert streamed_good.keys() == good.keys()
+    assert {key: value for key, value in streamed_good.items() if key != 'artifacts'} == \
+        {key: value for key, value in good.items() if key != 'artifacts'}
+    assert sort_by_id(streamed_good['artifacts'], 'id') == sort_by_id(good['artifacts'], 'id')
+
+
+@pytest.mark.parametrize('output_format', ['count', 'summary'])
+@pytest.mark.parametrize('list_mode', ['-k', '-d', '-a'])
+def test_aggregated_output(good_file, output_format, list_mode):
+    output = json.loads(run_main(good_file, '-o', output_format, list_mode))
+    streamed_output = json.loads(run_main(good_file, '-o', output_format, list_mode, '--stream', '--batch-size', '7'))
+
+    assert streamed_output == output
+
+
+def test_weak_flag(good_file):
+    assert run_main(good_file, '-o', 'count', '-a', '-w', '--stream') == run_main(good_file, '-o', 'count', '-a', '-w')
+
+
+def test_unsupported_options(good_file):
+    result = CliRunner().invoke(g2c.main, ['-i', good_file, '-c', '', '--stream', '-f', '*:*=b:10'])
+
+    assert result.exit_code != 0
+    assert 'stream mode does not support' in result.output
@@ -0,0 +1,89 @@
+import importlib
+import json
+import statistics
+
+from collections import Counter
+
+import pytest
+
+from click.testing import CliRunner
+
+import main as g2c
+import src.output.summary as summary
+
+build_counter = importlib.import_module('build-counter')
+
+
+@pytest.fixture(scope='module')
+def output_list(good, build_list):
+    return json.loads(g2c.process_good(good, build_list, 'g2c', 'all')[0])
+
+
+def summarize_by_sorting(scores, kept):
+    """Summarize a group from its whole sorted score list"""
+    scores = sorted(scores)
+    group_summary = {
+        'count': len(scores),
+        'kept': kept,
+        'min': scores[0],
+        'max': scores[-1],
+        'mean': round(statistics.fmean(scores), 4),
+    }
+    for percentile in summary.summary_percentiles:
+        group_summary[f'p{percentile}'] = scores[min(len(scores) * percentile // 100, len(scores) - 1)]
+    histogram = Counter(round(score * 100) // summary.histogram_bin_width * summary.histogram_bin_width / 100
+                        for score in scores)
+    group_summary['histogram'] = {str(lower_bound): amount for lower_bound, amount in sorted(histogram.items())}
+    return group_summary
+
+
+def test_same_values_as_sorting_each_group(output_list):
+    artifact_summary = summary.summarize_artifacts(output_list)
+
+    assert artifact_summary['artifacts'] == len(output_list)
+    assert artifact_summary['kept'] == sum(g2c_artifact['lock'] for g2c_artifact in output_list)
+    for group_key in summary.summary_keys:
+        group_values = {g2c_artifact[group_key] for g2c_artifact in output_list}
+        assert set(artifact_summary[group_key]) == group_values
+        for group_value in group_values:
+            group_artifact_list = [g2c_artifact for g2c_artifact in output_list if g2c_artifact[group_key] == group_value]
+            assert artifact_summary[group_key][group_value] == summarize_by_sorting(
+                [g2c_artifact['best_score'] for g2c_artifact in group_artifact_list],
+                sum(g2c_artifact['lock'] for g2c_artifact in group_artifact_list)
+            )
+
+
+def test_build_groups(output_list):
+    artifact_summary = summary.summarize_artifacts(output_list)
+
+    build_scores = {}
+    for g2c_artifact in output_list:
+        for build_score in g2c_artifact['build_score']:
+            build_scores.setdefault(f"{build_score['character']} - {build_score['name']}", []).append(build_score['score'])
+
+    assert {build_name: build_summary['count'] for build_name, build_summary in artifact_summary['build'].items()} == \
+        {build_name: len(scores) for build_name, scores in build_scores.items()}
+    for build_name, scores in build_scores.items():
+        assert artifact_summary['build'][build_name]['p50'] == summarize_by_sorting(scores, 0)['p50']
+    counts = [build_summary['count'] for build_summary in artifact_summary['build'].values()]
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_percentiles_of_small_groups():
+    group_summary = summary.summarize_scores({'kept': 1, 'scores': Counter({42: 1})})
+
+    assert (group_summary['p50'], group_summary['p90'], group_summary['p99']) == (0.42, 0.42, 0.42)
+    assert group_summary['histogram'] == {'0.4': 1}
+
+
+def test_build_counter_reads_summary(tmp_path, good, build_list, output_list):
+    summary_file = tmp_path / 'summary.json'
+    summary_file.write_text(g2c.process_good(good, build_list, 'summary', 'all')[0])
+    g2c_file = tmp_path / 'all.json'
+    g2c_file.write_text(json.dumps(output_list))
+
+    summary_result = CliRunner().invoke(build_counter.main, ['-i', str(summary_file)])
+    g2c_result = CliRunner().invoke(build_counter.main, ['-i', str(g2c_file)])
+
+    assert summary_result.exit_code == 0, summary_result.output
+    assert sorted(summary_result.output.splitlines()) == sorted(g2c_result.output.splitlines())
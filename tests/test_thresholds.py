@@ -0,0 +1,85 @@
+import json
+import random
+
+import pytest
+
+from click.testing import CliRunner
+
+import main as g2c
+import src.scoring.thresholds as thresholds
+import tuner
+
+
+@pytest.fixture(scope='module')
+def tuning_artifact_list(g2c_artifact_list, build_list):
+    scored_artifact_list = g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+    return scored_artifact_list + g2c.get_complementary_artifacts(g2c_artifact_list, scored_artifact_list)
+
+
+def count_discarded_by_brute_force(group_artifact_list, rank_thresholds):
+    return sum(
+        g2c_artifact['best_score'] == 0 or g2c_artifact['best_score'] < rank_thresholds[g2c_artifact['rank']]
+        for g2c_artifact in group_artifact_list
+    )
+
+
+@pytest.mark.parametrize('target', [0, 1, 5, 20, 1000])
+@pytest.mark.parametrize('step', [0.05, 0.1, 0])
+def test_highest_curve_within_target(tuning_artifact_list, target, step):
+    grouped_scores = thresholds.group_scores_by_rank(tuning_artifact_list, 'slot_key')
+
+    for slot_key, group_scores in grouped_scores.items():
+        group_artifact_list = [g2c_artifact for g2c_artifact in tuning_artifact_list if g2c_artifact['slot_key'] == slot_key]
+        rank_thresholds, discard = thresholds.tune_group_thresholds(group_scores, target, step)
+
+        assert discard == count_discarded_by_brute_force(group_artifact_list, rank_thresholds)
+        assert discard <= max(target, group_scores['zero'])
+        # one hundredth more on every rank goes over the target (unless everything is already discarded)
+        higher_thresholds = thresholds.get_rank_thresholds(rank_thresholds[0] + 0.01, step)
+        if discard < len(group_artifact_list):
+            assert count_discarded_by_brute_force(group_artifact_list, higher_thresholds) > target
+
+
+def test_only_zero_scores_over_target():
+    g2c_artifact_list = [{'set_key': 'A', 'rank': 0, 'best_score': 0} for _ in range(3)]
+    g2c_artifact_list += [{'set_key': 'A', 'rank': 5, 'best_score': 0.5}]
+
+    tuned_group_list = thresholds.tune_thresholds(g2c_artifact_list, 'set_key', '1')
+
+    assert tuned_group_list[0]['discard'] == 3
+    assert thresholds.get_discarded_artifacts(g2c_artifact_list, tuned_group_list) == g2c_artifact_list[:3]
+
+
+def test_parse_target():
+    assert thresholds.parse_target('20', 143) == 20
+    assert thresholds.parse_target('10%', 143) == 14
+    assert thresholds.parse_target('0%', 143) == 0
+
+
+def test_tune_thresholds(tuning_artifact_list):
+    generator_random = random.Random(0)
+    group_values = generator_random.sample(sorted({g2c_artifact['set_key'] for g2c_artifact in tuning_artifact_list}), 3)
+
+    tuned_group_list = thresholds.tune_thresholds(tuning_artifact_list, 'set_key', '25%', group_values=group_values)
+    discarded_artifact_list = thresholds.get_discarded_artifacts(tuning_artifact_list, tuned_group_list)
+
+    assert {tuned_group['group_value'] for tuned_group in tuned_group_list} == set(group_values)
+    assert [tuned_group['total'] for tuned_group in tuned_group_list] == \
+        sorted([tuned_group['total'] for tuned_group in tuned_group_list], reverse=True)
+    assert len(discarded_artifact_list) == sum(tuned_group['discard'] for tuned_group in tuned_group_list)
+    # artifacts with best score 0 are discarded even over the target
+    grouped_scores = thresholds.group_scores_by_rank(tuning_artifact_list, 'set_key')
+    for tuned_group in tuned_group_list:
+        assert tuned_group['discard'] <= max(tuned_group['target'], grouped_scores[tuned_group['group_value']]['zero'])
+
+
+def test_tuner_output(good_file, tuning_artifact_list):
+    result = CliRunner(mix_stderr=False).invoke(tuner.main, ['-i', good_file, '-t', '10%', '-g', 'slot_key', '-c', ''])
+
+    assert result.exit_code == 0, result.stderr
+    tuned_group_list = thresholds.tune_thresholds(tuning_artifact_list, 'slot_key', '10%')
+    discarded_artifact_list = json.loads(result.stdout)
+    assert [g2c_artifact['id'] for g2c_artifact in discarded_artifact_list] == \
+        [g2c_artifact['id'] for g2c_artifact in thresholds.get_discarded_artifacts(tuning_artifact_list, tuned_group_list)]
+    assert all(g2c_artifact['lock'] is False for g2c_artifact in discarded_artifact_list)
+    assert len(result.stderr.splitlines()) == len(tuned_group_list)
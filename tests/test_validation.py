@@ -0,0 +1,107 @@
+import json
+import pickle
+
+import pytest
+
+from click.testing import CliRunner
+
+import main as g2c
+import src.artifact.validation as validation
+import validator
+
+
+def replace_sub_stat(good_artifact, index, key, value):
+    sub_stats = list(good_artifact['substats'])
+    sub_stats[index] = {'key': key, 'value': value}
+    return {**good_artifact, 'substats': sub_stats}
+
+
+valid_artifact = {
+    'setKey': 'GladiatorsFinale', 'slotKey': 'flower', 'mainStatKey': 'hp', 'rarity': 5, 'level': 20,
+    'substats': [
+        {'key': 'critRate_', 'value': 10.5}, {'key': 'critDMG_', 'value': 7.8},
+        {'key': 'atk_', 'value': 5.8}, {'key': 'def', 'value': 23},
+    ],
+    'location': '', 'lock': False, 'id': 0,
+}
+new_artifact = replace_sub_stat({**valid_artifact, 'level': 0}, 0, 'critRate_', 3.9)
+
+
+@pytest.mark.parametrize('good_artifact, rule_names', [
+    (valid_artifact, []),
+    (replace_sub_stat(new_artifact, 3, None, 0), []),
+    (replace_sub_stat(new_artifact, 1, None, 0), ['check_null_initial_sub_stats']),
+    (replace_sub_stat(valid_artifact, 3, None, 0), ['check_null_upgraded_sub_stats']),
+    ({**valid_artifact, 'setKey': 'Berserker'}, ['check_max_rarity']),
+    ({**valid_artifact, 'setKey': 'Berserker', 'rarity': 4, 'level': 16}, []),
+    ({**valid_artifact, 'setKey': 'UnknownSet'}, ['check_invalid_set']),
+    (replace_sub_stat(valid_artifact, 0, 'critRate_', 24), ['check_sub_stat_values']),
+    (replace_sub_stat({**valid_artifact, 'level': 3}, 0, 'critRate_', 7.8), ['check_sub_stat_values']),
+    (replace_sub_stat(valid_artifact, 0, 'critRate_', -1), ['check_sub_stat_values']),
+    (replace_sub_stat(valid_artifact, 0, 'unknownStat', 1), ['check_sub_stat_values']),
+    ({**valid_artifact, 'setKey': 'UnknownSet', 'substats': valid_artifact['substats'][:2]},
+     ['check_null_initial_sub_stats', 'check_null_upgraded_sub_stats', 'check_invalid_set']),
+])
+def test_validation_rules(good_artifact, rule_names):
+    assert validation.validate_good_artifact(good_artifact, g2c.load_artifact_stats_constants()) == rule_names
+
+
+def test_single_pass_same_as_each_rule(good):
+    artifact_stats_constants = g2c.load_artifact_stats_constants()
+    good_artifact_list = [
+        *good['artifacts'][:50],
+        {**valid_artifact, 'setKey': 'UnknownSet', 'id': 50},
+        replace_sub_stat({**valid_artifact, 'id': 51}, 3, None, 0),
+    ]
+
+    invalid_artifacts = validation.validate_good_artifacts(good_artifact_list, artifact_stats_constants)
+
+    assert list(invalid_artifacts) == [rule['name'] for rule in validation.validation_rules]
+    for rule in validation.validation_rules:
+        assert invalid_artifacts[rule['name']] == [
+            good_artifact for good_artifact in good_artifact_list if rule['check'](good_artifact, artifact_stats_constants)
+        ]
+    assert invalid_artifacts['check_invalid_set'] == [good_artifact_list[50]]
+
+
+def test_strict_mode_reports_every_invalid_artifact(good):
+    good_artifact_list = [
+        {**valid_artifact, 'setKey': 'UnknownSet', 'id': 'a'},
+        *good['artifacts'][:20],
+        {key: value for key, value in replace_sub_stat(valid_artifact, 3, None, 0).items() if key != 'id'},
+    ]
+
+    with pytest.raises(validation.InvalidArtifactError) as error_info:
+        g2c.generate_g2c_artifact_list_from_good(good_artifact_list, strict=True)
+
+    assert error_info.value.invalid_artifact_list == [('a', ['check_invalid_set']), (21, ['check_null_upgraded_sub_stats'])]
+    assert str(error_info.value).startswith('2 invalid artifacts: a (check_invalid_set)')
+    assert len(g2c.generate_g2c_artifact_list_from_good(good_artifact_list)) == len(good_artifact_list)
+
+
+def test_strict_mode_accepts_valid_inventory(good, build_list):
+    assert g2c.process_good(good, build_list, strict=True) == g2c.process_good(good, build_list)
+
+
+def test_invalid_artifact_error_pickling():
+    error = validation.InvalidArtifactError([(3, ['check_invalid_set']), (8, ['check_max_rarity', 'check_invalid_set'])])
+
+    unpickled_error = pickle.loads(pickle.dumps(error))
+
+    assert type(unpickled_error) is validation.InvalidArtifactError
+    assert unpickled_error.invalid_artifact_list == error.invalid_artifact_list
+    assert str(unpickled_error) == str(error)
+
+
+def test_validator_output(tmp_path):
+    good_file = tmp_path / 'good.json'
+    good_file.write_text(json.dumps({'format': 'GOOD', 'artifacts': [
+        valid_artifact, {**valid_artifact, 'setKey': 'UnknownSet', 'id': 1}, {**valid_artifact, 'rarity': 4, 'id': 2}
+    ]}))
+
+    result = CliRunner().invoke(validator.main, ['-i', str(good_file)])
+
+    assert result.exit_code == 0, result.output
+    assert 'Check invalid artifact sets' in result.output
+    assert 'Finds:  1' in result.output
+    assert 'Check max rarity for artifact sets' not in result.output
@@ -0,0 +1,53 @@
+import json
+import random
+
+import pytest
+
+import benchmarks.generator as generator
+import main as g2c
+import src.scoring.build_index as build_index
+
+numpy = pytest.importorskip('numpy')
+vectorized_scoring = pytest.importorskip('src.scoring.vectorized')
+
+
+def test_same_output_as_python_engine(g2c_artifact_list, build_list):
+    python_artifact_list = g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+    numpy_artifact_list = vectorized_scoring.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+
+    assert json.dumps(numpy_artifact_list) == json.dumps(python_artifact_list)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_same_output_with_generated_builds(g2c_artifact_list, seed):
+    build_list = [build_index.compile_build(build) for build in generator.generate_build_list(60, seed)]
+
+    python_artifact_list = g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+    numpy_artifact_list = vectorized_scoring.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+
+    assert json.dumps(numpy_artifact_list) == json.dumps(python_artifact_list)
+
+
+@pytest.mark.parametrize('output_format', ['g2c', 'good', 'count', 'summary'])
+@pytest.mark.parametrize('list_mode', ['keep', 'discard', 'all'])
+def test_same_pipeline_output(good, build_list, output_format, list_mode):
+    python_output, _ = g2c.process_good(good, build_list, output_format, list_mode, engine='python')
+    numpy_output, _ = g2c.process_good(good, build_list, output_format, list_mode, engine='numpy')
+
+    assert numpy_output == python_output
+
+
+def test_empty_input(build_list):
+    assert vectorized_scoring.get_artifacts_with_build_scores([], build_list) == []
+
+
+def test_round_scores_like_python_round():
+    generator_random = random.Random(0)
+    scores = [generator_random.uniform(0, 12) for _ in range(20000)]
+    # halfway points (and their closest floats), where rounding the scaled score differs from Python round
+    scores += [(hundredths + 0.5) / 100 for hundredths in range(1200)]
+    scores += [thousandths / 1000 + error for thousandths in range(0, 12000, 5) for error in (1e-15, -1e-15)]
+
+    rounded_scores = vectorized_scoring.round_scores(numpy.array([scores]))[0].tolist()
+
+    assert rounded_scores == [round(score, 2) for score in scores]
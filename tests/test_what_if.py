@@ -0,0 +1,67 @@
+import copy
+import random
+
+import main as g2c
+import src.scoring.build_index as build_index
+
+from src.scoring.what_if import WhatIfSession
+
+
+def get_full_results(g2c_artifact_list, build_list):
+    """Return (lock, best_score, best_build) of every artifact scored by the main pipeline"""
+    scored_artifacts = {
+        g2c_artifact['refer_id']: (True, g2c_artifact['best_score'], g2c_artifact['best_build'])
+        for g2c_artifact in g2c.get_artifacts_with_build_scores(g2c_artifact_list, build_list)
+    }
+    return {
+        g2c_artifact['refer_id']: scored_artifacts.get(g2c_artifact['refer_id'], (False, 0, ''))
+        for g2c_artifact in g2c_artifact_list
+    }
+
+
+def test_same_scores_as_score_artifact(g2c_artifact_list, build_list):
+    session = WhatIfSession(g2c_artifact_list, build_list)
+
+    for build, score_column in zip(session.build_list, session.score_columns):
+        for position, score in score_column.items():
+            assert score == g2c.score_artifact(g2c_artifact_list[position], build)
+
+
+def test_flipped_artifacts_like_full_rescoring(g2c_artifact_list, build_list):
+    session = WhatIfSession(g2c_artifact_list, build_list)
+    generator_random = random.Random(1)
+    current_build_list = list(build_list)
+
+    for edit in range(12):
+        build_position = generator_random.randrange(len(current_build_list))
+        build = copy.deepcopy({
+            key: current_build_list[build_position][key] for key in ('character', 'name', 'filter', 'sub_stats')
+        })
+        build['sub_stats'] = {sub_stat_key: generator_random.choice([0, 0.5, 1]) for sub_stat_key in build['sub_stats']}
+        if edit % 4 == 0:
+            build['filter'].pop('sands', None)
+        if edit % 5 == 0:
+            build['name'] = f'Edit {edit}'
+        commit = edit % 2 == 0
+
+        edited_build_list = list(current_build_list)
+        if build['name'].startswith('Edit'):
+            edited_build_list.append(build_index.compile_build(build))
+        else:
+            edited_build_list[build_position] = build_index.compile_build(build)
+
+        previous_results = get_full_results(g2c_artifact_list, current_build_list)
+        results = get_full_results(g2c_artifact_list, edited_build_list)
+        flipped_artifact_list = session.rescore_build(build, commit)['flipped']
+
+        assert {g2c_artifact['refer_id'] for g2c_artifact in flipped_artifact_list} == {
+            refer_id for refer_id in results if results[refer_id] != previous_results[refer_id]
+        }
+        for g2c_artifact in flipped_artifact_list:
+            refer_id = g2c_artifact['refer_id']
+            assert (g2c_artifact['lock'], g2c_artifact['best_score'], g2c_artifact['best_build']) == results[refer_id]
+            assert (g2c_artifact['previous_lock'], g2c_artifact['previous_best_score'],
+                    g2c_artifact['previous_best_build']) == previous_results[refer_id]
+
+        if commit:
+            current_build_list = edited_build_list
@@ -0,0 +1,63 @@
+import click
+import json
+
+import main as g2c
+import src.scoring.build_index as build_index
+import src.scoring.thresholds as thresholds
+
+
+@click.command()
+@click.option('-i', '--input-file', required=True, type=str, help='Specify input file in GOOD format.')
+@click.option('-g', '--group-keys', multiple=True, default=['set_key'], show_default=True,
+              type=click.Choice(['set_key', 'slot_key', 'main_stat_key', 'best_build']),
+              help='Specify key used to group artifacts.')
+@click.option('-v', '--group-values', multiple=True, type=str, help='Tune only these groups (e.g. WanderersTroupe).')
+@click.option('-t', '--target', required=True, type=str,
+              help='Specify maximum amount (e.g. 20) or percentage (e.g. 10%) of artifacts to discard per group.')
+@click.option('--step', default=0.05, show_default=True, type=float, help='Specify threshold increase per rank.')
+@click.option('-w', '--weak', is_flag=True, help='Keep artifact in non maximum rarity.')
+@click.option('-e', '--engine', default='python', show_default=True,
+              type=click.Choice(['python', 'numpy'], case_sensitive=False),
+              help='Specify scoring engine.')
+@click.option('-c', '--build-cache', default='.cache/build-index.json', show_default=True, type=str,
+              help='Specify compiled build index cache file (empty to disable).')
+def main(input_file, group_keys, group_values, target, step, weak, engine, build_cache):
+    if engine == 'numpy' and g2c.vectorized_scoring is None:
+        raise click.UsageError('The numpy engine requires NumPy (pip install numpy).')
+
+    build_file_name_list = g2c.find_files_by_extension('builds/', '.json')
+    build_list = build_index.load_build_list(build_file_name_list, build_cache or None)
+
+    with open(input_file) as good_file:
+        good = json.load(good_file)
+
+    artifact_list = g2c.generate_g2c_artifact_list_from_good(good['artifacts'])
+    artifact_list = g2c.hydrate_sub_stats_efficiency(artifact_list)
+
+    if not weak:
+        artifact_list = g2c.remove_artifacts_in_non_maximum_rarity(artifact_list)
+
+    if engine == 'numpy':
+        scored_artifact_list = g2c.vectorized_scoring.get_artifacts_with_build_scores(artifact_list, build_list)
+    else:
+        scored_artifact_list = g2c.get_artifacts_with_build_scores(artifact_list, build_list)
+    artifact_list = scored_artifact_list + g2c.get_complementary_artifacts(artifact_list, scored_artifact_list)
+
+    tuned_group_list = []
+    for group_key in group_keys:
+        tuned_group_list.extend(thresholds.tune_thresholds(artifact_list, group_key, target, step, group_values))
+
+    for tuned_group in tuned_group_list:
+        rank_thresholds = ', '.join(f'{rank}: {threshold}' for rank, threshold in tuned_group['thresholds'].items())
+        click.echo(
+            f"{tuned_group['group_value']}: {tuned_group['discard']}/{tuned_group['total']} "
+            f"(target {tuned_group['target']}) rank thresholds {{{rank_thresholds}}}",
+            err=True
+        )
+
+    discarded_artifact_list = thresholds.get_discarded_artifacts(artifact_list, tuned_group_list)
+    print(json.dumps(g2c.lock_unlock_artifacts(discarded_artifact_list, False)))
+
+
+if __name__ == '__main__':
+    main()
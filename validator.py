@@ -2,22 +2,26 @@ import click
 import json
 import math
 
-import src.database.artifacts as artifact_database
+import main as g2c
+import src.artifact.validation as validation
 
 
 @click.command()
 @click.option('-i', '--input-file', required=True, type=str, help='Specify input file in GOOD format.')
+@click.option('-r', '--rarities', multiple=True, default=[5], show_default=True, type=click.IntRange(1, 5),
+              help='Specify rarity of the checked artifacts.')
 @click.option('-v', '--verbose', count=True, help='Make the operation more talkative.')
-def main(input_file, verbose):
+def main(input_file, rarities, verbose):
     with open(input_file) as good_file:
         good = json.load(good_file)
 
-    good_artifact_list = [artifact for artifact in good['artifacts'] if artifact['rarity'] == 5]
+    rarities = set(rarities)
+    good_artifact_list = [artifact for artifact in good['artifacts'] if artifact['rarity'] in rarities]
 
-    check_for_null_on_the_first_three_sub_stats(good_artifact_list, verbose)
-    check_for_null_on_forth_sub_stat_for_upgraded_artifact(good_artifact_list, verbose)
-    check_max_rarity_for_artifact_sets(good_artifact_list, verbose)
-    check_invalid_artifact_sets(good_artifact_list, verbose)
+    artifact_stats_constants = g2c.load_artifact_stats_constants()
+    invalid_artifacts = validation.validate_good_artifacts(good_artifact_list, artifact_stats_constants)
+    for rule in validation.validation_rules:
+        print_header(rule['message'], invalid_artifacts[rule['name']], verbose)
 
 
 def print_header(message, good_artifact_list, verbose=1):
@@ -47,61 +51,5 @@ def print_header(message, good_artifact_list, verbose=1):
     print(*formatted_artifact_list, sep='\n')
 
 
-def check_for_null_on_the_first_three_sub_stats(good_artifact_list, verbose):
-    artifacts_with_problem = []
-    for good_artifact in good_artifact_list:
-        sub_stat_keys = [sub_stat['key'] for sub_stat in good_artifact['substats'][0:3]]
-        if None in sub_stat_keys:
-            artifacts_with_problem.append(good_artifact)
-
-    print_header(
-        'Check for null on the first three sub stats',
-        artifacts_with_problem,
-        verbose
-    )
-
-
-def check_for_null_on_forth_sub_stat_for_upgraded_artifact(good_artifact_list, verbose):
-    artifacts_with_problem = []
-    for good_artifact in good_artifact_list:
-        rank = math.floor(good_artifact['level'] / 4)
-        if rank > 1 and good_artifact['substats'][3]['key'] is None:
-            artifacts_with_problem.append(good_artifact)
-
-    print_header(
-        'Check for null on forth sub stat for upgraded artifact',
-        artifacts_with_problem,
-        verbose
-    )
-
-
-def check_max_rarity_for_artifact_sets(good_artifact_list, verbose):
-    artifacts_with_problem = []
-    for good_artifact in good_artifact_list:
-        if good_artifact['setKey'] in artifact_database.rarity_four and good_artifact['rarity'] > 4:
-            artifacts_with_problem.append(good_artifact)
-        if good_artifact['setKey'] in artifact_database.rarity_three and good_artifact['rarity'] > 3:
-            artifacts_with_problem.append(good_artifact)
-
-    print_header(
-        'Check max rarity for artifact sets',
-        artifacts_with_problem,
-        verbose
-    )
-
-
-def check_invalid_artifact_sets(good_artifact_list, verbose):
-    artifacts_with_problem = []
-    for good_artifact in good_artifact_list:
-        if good_artifact['setKey'] not in artifact_database.set_key_order:
-            artifacts_with_problem.append(good_artifact)
-
-    print_header(
-        'Check invalid artifact sets',
-        artifacts_with_problem,
-        verbose
-    )
-
-
 if __name__ == '__main__':
     main()